@@ -0,0 +1,84 @@
+import os
+import asyncio
+from fastapi import APIRouter, Header, Query, Request, HTTPException
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from app.core.database import get_ledger
+from app.core.events import format_sse
+
+router = APIRouter(prefix="/api/v1", tags=["events"])
+
+EVENT_TYPES = {"submitted", "approved", "rejected", "imported"}
+# submitted/rejected describe unreviewed submissions: admin feed only (/admin/{secret}/events)
+PUBLIC_EVENT_TYPES = {"approved", "imported"}
+HEARTBEAT_SECONDS = float(os.getenv("EVENT_HEARTBEAT_SECONDS", "15"))
+
+@router.get("/events")
+async def event_feed(
+    request: Request,
+    types: Optional[str] = Query(None, description="Comma-separated subset of approved,imported"),
+    last_event_id: Optional[int] = Query(None, description="Resume point for clients that cannot send Last-Event-ID"),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID")
+):
+    """
+    Server-Sent Events feed of approvals and imports made through any
+    worker. Event ids are change_seq values. Reconnect with Last-Event-ID to
+    replay what was missed; if the buffer no longer reaches back that far,
+    a `resync` event carries the current version and change_seq (use
+    /api/v1/export.ndjson?since= to catch up).
+    """
+    return event_stream(request, PUBLIC_EVENT_TYPES, types, last_event_id, last_event_id_header)
+
+def event_stream(request: Request, allowed: set, types: Optional[str], last_event_id: Optional[int],
+                 last_event_id_header: Optional[str]) -> StreamingResponse:
+    """The feed restricted to `allowed` event types, narrowed further by `types`."""
+    ledger = get_ledger()
+    if ledger is None:
+        raise HTTPException(status_code=503, detail="Ledger not initialized")
+    wanted = allowed
+    if types:
+        wanted = {t.strip() for t in types.split(",") if t.strip()}
+        if not wanted <= allowed:
+            raise HTTPException(status_code=400, detail=f"Unknown event type. Must be among: {', '.join(sorted(allowed))}")
+    resume = last_event_id
+    if last_event_id_header and last_event_id_header.strip().isdigit():
+        resume = int(last_event_id_header)
+
+    bus = ledger.events
+
+    async def stream():
+        # Subscribe before replaying so nothing published in between is lost
+        with bus.subscribe() as sub:
+            yield b"retry: 3000\n\n"
+            sent = resume or 0
+            if resume is not None:
+                head = ledger.change_head()
+                # An id past the head was issued by some other (e.g. rebuilt) ledger
+                missed = bus.replay(resume) if resume <= head else None
+                if missed is None:
+                    yield format_sse({"id": head, "event": "resync", "data": {
+                        "version": ledger.current_version(),
+                        "change_seq": head
+                    }})
+                    missed, sent = [], head
+                for record in missed:
+                    if record["event"] in wanted:
+                        yield format_sse(record)
+                    sent = record["id"]
+            while True:
+                try:
+                    record = await asyncio.wait_for(sub.queue.get(), timeout=HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield b": ping\n\n"
+                    continue
+                if record is None:
+                    return
+                if record["id"] > sent and record["event"] in wanted:
+                    yield format_sse(record)
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"
+    })
@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Query, Request, HTTPException
+from fastapi.responses import Response, StreamingResponse
+from app.core.database import get_ledger
+from app.core.export import ExportLengths, byte_slice, export_etag, gzip_chunks, ndjson_chunks, parse_range
+
+router = APIRouter(prefix="/api/v1", tags=["export"])
+
+_lengths = ExportLengths()
+
+@router.get("/export.ndjson")
+async def export_ndjson(request: Request, since: int = Query(0, ge=0)):
+    """
+    Every approved entry as newline-delimited JSON, oldest change first.
+    Each line carries its change_seq; pull again with since=<X-Next-Since>
+    (or the last change_seq received) to get only what changed. Honours
+    Accept-Encoding: gzip, If-None-Match, and Range/If-Range for resuming.
+    """
+    ledger = get_ledger()
+    if ledger is None:
+        raise HTTPException(status_code=503, detail="Ledger not initialized")
+
+    until = ledger.change_head()
+    gzip = "gzip" in request.headers.get("accept-encoding", "")
+    etag = export_etag(since, until, gzip)
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Vary": "Accept-Encoding",
+        "Cache-Control": "no-cache",
+        "X-Next-Since": str(until)
+    }
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    def body():
+        chunks = ndjson_chunks(ledger, since, until)
+        return gzip_chunks(chunks) if gzip else chunks
+
+    byte_range = parse_range(request.headers.get("range"))
+    if_range = request.headers.get("if-range")
+    if byte_range is None or (if_range is not None and if_range != etag):
+        return StreamingResponse(body(), media_type="application/x-ndjson", headers=headers)
+
+    total = await _lengths.get(etag, body())
+    start, end = byte_range
+    if start >= total:
+        return Response(status_code=416, headers=dict(headers, **{"Content-Range": f"bytes */{total}"}))
+    end = total - 1 if end is None else min(end, total - 1)
+    headers.update({"Content-Range": f"bytes {start}-{end}/{total}", "Content-Length": str(end - start + 1)})
+    return StreamingResponse(byte_slice(body(), start, end), status_code=206,
+                             media_type="application/x-ndjson", headers=headers)
@@ -5,6 +5,17 @@ from app.core import database
 
 router = APIRouter()
 
+@router.get("/ready")
+async def readiness():
+    """Per-backend startup state; 200 once the required backends (SQLite) are up."""
+    ledger = database.get_ledger()
+    if ledger is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Ledger not initialized")
+    report = ledger.readiness.snapshot()
+    if not report["ready"]:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=report)
+    return report
+
 @router.get("/health")
 async def health_check():
     try:
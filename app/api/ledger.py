@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Query, HTTPException
+from fastapi.responses import FileResponse
+from typing import Optional
+from app.core.database import get_ledger
+
+router = APIRouter(prefix="/api/v1/ledger", tags=["ledger"])
+
+def _ledger():
+    ledger = get_ledger()
+    if ledger is None:
+        raise HTTPException(status_code=503, detail="Ledger not initialized")
+    return ledger
+
+@router.get("/root")
+async def merkle_root():
+    """Current Merkle tree size and root (hex, RFC 6962)."""
+    return await _ledger().merkle_root()
+
+@router.get("/proof/{entry_id}")
+async def inclusion_proof(entry_id: str, tree_size: Optional[int] = Query(None, ge=1)):
+    """
+    O(log n) audit path proving `entry_id` is in the tree of `tree_size` leaves.
+    Leaf hash is sha256(0x00 || jsonl line), interior nodes sha256(0x01 || left || right).
+    """
+    try:
+        proof = await _ledger().inclusion_proof(entry_id, tree_size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if proof is None:
+        raise HTTPException(status_code=404, detail="Entry not in Merkle tree")
+    return proof
+
+@router.get("/snapshot.npz")
+async def snapshot():
+    """
+    Columnar snapshot of approved submissions (and legacy Data/ entries) for
+    analytics. Members are `table/column.npy`; dictionary-encoded strings in `column.dict.npy`.
+    """
+    path = await _ledger().snapshot_npz()
+    return FileResponse(path, media_type="application/octet-stream", filename="ledger.npz")
+
+@router.get("/hash-chain")
+async def hash_chain(limit: int = Query(100, ge=1, le=1000)):
+    """Daily sealed Merkle roots, newest first."""
+    return {"days": await _ledger().hash_chain(limit)}
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Query, HTTPException
+from typing import Optional
+from app.core.database import get_ledger
+
+router = APIRouter(prefix="/api/v1", tags=["search"])
+
+@router.get("/search")
+async def search_submissions(
+    q: str = Query(..., min_length=1, max_length=200),
+    entity_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100)
+):
+    """
+    Full-text search over approved testimonies (title, description and
+    entity name), best match first. Snippets are HTML-escaped with hits in
+    <mark>; pass next_cursor back for the next page. Pending and rejected
+    submissions are searchable only through /admin/{secret}/search.
+    """
+    ledger = get_ledger()
+    if ledger is None:
+        raise HTTPException(status_code=503, detail="Ledger not initialized")
+    try:
+        return await ledger.search_submissions(q, status="APPROVED", entity_id=entity_id,
+                                               cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
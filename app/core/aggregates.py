@@ -0,0 +1,171 @@
+# app/core/aggregates.py - Per-entity totals maintained by SQLite triggers
+import logging
+from typing import Dict, List
+
+logger = logging.getLogger("vow")
+
+# Bump when the aggregate definition changes; stale rows are rebuilt on startup
+CALCULATION_VERSION = 1
+
+_AGGREGATE_SQL = """
+    SELECT entity_id,
+           (SELECT s2.entity_name FROM submissions s2
+            WHERE s2.entity_id = s.entity_id AND s2.status = 'APPROVED'
+            ORDER BY s2.created_at DESC, s2.submission_id DESC LIMIT 1) AS entity_name,
+           COUNT(*) AS total_entries,
+           SUM(ABS(life_loss)) AS total_harm_ly,
+           SUM(ABS(financial_loss)) AS total_harm_ecy,
+           MAX(created_at) AS last_entry
+    FROM submissions s
+    WHERE status = 'APPROVED'
+    GROUP BY entity_id
+"""
+
+# Approved rows add to their entity, rows leaving APPROVED subtract.
+# last_entry / entity_name are re-read through idx_entity_status_created
+# when a row is removed, since a MAX cannot be decremented.
+_ADD = """
+    INSERT INTO entity_aggregates (entity_id, entity_name, total_entries, total_harm_ly,
+                                   total_harm_ecy, last_entry, last_calculated, calculation_version)
+    SELECT NEW.entity_id, NEW.entity_name, 1, ABS(NEW.life_loss), ABS(NEW.financial_loss),
+           NEW.created_at, CURRENT_TIMESTAMP, {version}
+    WHERE NEW.status = 'APPROVED'
+    ON CONFLICT(entity_id) DO UPDATE SET
+        total_entries = total_entries + 1,
+        total_harm_ly = total_harm_ly + excluded.total_harm_ly,
+        total_harm_ecy = total_harm_ecy + excluded.total_harm_ecy,
+        entity_name = CASE WHEN last_entry IS NULL OR excluded.last_entry >= last_entry
+                           THEN excluded.entity_name ELSE entity_name END,
+        last_entry = CASE WHEN last_entry IS NULL OR excluded.last_entry >= last_entry
+                          THEN excluded.last_entry ELSE last_entry END,
+        last_calculated = CURRENT_TIMESTAMP;
+""".format(version=CALCULATION_VERSION)
+
+_REMOVE = """
+    UPDATE entity_aggregates SET
+        total_entries = total_entries - 1,
+        total_harm_ly = total_harm_ly - ABS(OLD.life_loss),
+        total_harm_ecy = total_harm_ecy - ABS(OLD.financial_loss),
+        last_calculated = CURRENT_TIMESTAMP
+    WHERE entity_id = OLD.entity_id AND OLD.status = 'APPROVED';
+    DELETE FROM entity_aggregates WHERE entity_id = OLD.entity_id AND total_entries <= 0;
+    UPDATE entity_aggregates SET
+        (entity_name, last_entry) = (
+            SELECT entity_name, created_at FROM submissions
+            WHERE entity_id = OLD.entity_id AND status = 'APPROVED'
+            ORDER BY created_at DESC, submission_id DESC LIMIT 1
+        )
+    WHERE entity_id = OLD.entity_id AND OLD.status = 'APPROVED';
+"""
+
+_TRIGGERS = {
+    "trg_aggregates_insert": f"""
+        CREATE TRIGGER trg_aggregates_insert AFTER INSERT ON submissions
+        WHEN NEW.status = 'APPROVED'
+        BEGIN {_ADD} END
+    """,
+    # One trigger so the remove-then-add order is fixed
+    "trg_aggregates_update": f"""
+        CREATE TRIGGER trg_aggregates_update
+        AFTER UPDATE OF status, life_loss, financial_loss, created_at, entity_id, entity_name ON submissions
+        WHEN OLD.status = 'APPROVED' OR NEW.status = 'APPROVED'
+        BEGIN {_REMOVE} {_ADD} END
+    """,
+    "trg_aggregates_delete": f"""
+        CREATE TRIGGER trg_aggregates_delete AFTER DELETE ON submissions
+        WHEN OLD.status = 'APPROVED'
+        BEGIN {_REMOVE} END
+    """,
+}
+
+
+def init_aggregates(conn):
+    """Create entity_aggregates and its triggers; rebuild if missing or outdated."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS entity_aggregates (
+            entity_id TEXT PRIMARY KEY,
+            entity_name TEXT,
+            total_entries INTEGER DEFAULT 0,
+            total_harm_ly REAL DEFAULT 0,
+            total_harm_ecy REAL DEFAULT 0,
+            last_entry TIMESTAMP,
+            last_calculated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            calculation_version INTEGER DEFAULT 1
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_aggregates_harm ON entity_aggregates(total_harm_ly)")
+
+    stale, missing = _trigger_state(conn)
+    for name in _TRIGGERS if stale else missing:
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+        conn.execute(_TRIGGERS[name])
+
+    if stale or missing:
+        # Totals may have drifted while triggers were absent or defined differently
+        rebuild_aggregates(conn)
+
+
+def _trigger_state(conn):
+    """(rows from an older CALCULATION_VERSION exist, names of missing triggers)."""
+    stale = conn.execute(
+        "SELECT 1 FROM entity_aggregates WHERE calculation_version != ? LIMIT 1", (CALCULATION_VERSION,)
+    ).fetchone() is not None
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+    return stale, [name for name in _TRIGGERS if name not in existing]
+
+
+def aggregate_schema_problems(conn) -> List[str]:
+    """
+    What init_aggregates would repair, reported without touching anything:
+    a missing table, missing triggers or rows from an older calculation.
+    """
+    if conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'entity_aggregates'"
+    ).fetchone() is None:
+        return ["entity_aggregates table missing"]
+    stale, missing = _trigger_state(conn)
+    problems = [f"trigger {name} missing" for name in missing]
+    if stale:
+        problems.append(f"rows from an older calculation_version (current is {CALCULATION_VERSION})")
+    return problems
+
+
+def rebuild_aggregates(conn) -> int:
+    """Recompute every row from submissions. Returns the number of entities."""
+    conn.execute("DELETE FROM entity_aggregates")
+    conn.execute(f"""
+        INSERT INTO entity_aggregates (entity_id, entity_name, total_entries, total_harm_ly,
+                                       total_harm_ecy, last_entry, last_calculated, calculation_version)
+        SELECT entity_id, entity_name, total_entries, total_harm_ly, total_harm_ecy, last_entry,
+               CURRENT_TIMESTAMP, {CALCULATION_VERSION}
+        FROM ({_AGGREGATE_SQL})
+    """)
+    count = conn.execute("SELECT COUNT(*) FROM entity_aggregates").fetchone()[0]
+    logger.info(f"✅ Rebuilt entity aggregates for {count} entities")
+    return count
+
+
+def verify_aggregates(conn) -> List[Dict]:
+    """Compare entity_aggregates with a from-scratch recomputation; one dict per drifted entity."""
+    fields = ("entity_name", "total_entries", "total_harm_ly", "total_harm_ecy", "last_entry")
+    expected = {row["entity_id"]: row for row in conn.execute(_AGGREGATE_SQL)}
+    stored = {row["entity_id"]: row for row in conn.execute("SELECT * FROM entity_aggregates")}
+
+    drift = []
+    for entity_id in sorted(expected.keys() | stored.keys()):
+        want, have = expected.get(entity_id), stored.get(entity_id)
+        if want is None or have is None:
+            drift.append({"entity_id": entity_id, "problem": "missing" if have is None else "unexpected"})
+            continue
+        diffs = {}
+        for f in fields:
+            a, b = want[f], have[f]
+            if isinstance(a, float) or isinstance(b, float):
+                same = abs((a or 0) - (b or 0)) <= 1e-6 * max(1.0, abs(a or 0))
+            else:
+                same = a == b
+            if not same:
+                diffs[f] = {"expected": a, "stored": b}
+        if diffs:
+            drift.append({"entity_id": entity_id, "problem": "mismatch", "fields": diffs})
+    return drift
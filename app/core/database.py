@@ -1,25 +1,225 @@
 # app/core/database.py - The full distributed ledger
 import os
 import json
-import sqlite3
+import time
+import asyncio
+import base64
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional
-import git
+from typing import Any, Dict, List, Optional
 import hashlib
 import logging
 from contextlib import asynccontextmanager
+from datetime import datetime, timezone
 from fastapi import FastAPI
 
+from app.core.entity_index import EntityIndexStore
+from app.core.events import EventBus
+from app.core.aggregates import init_aggregates
+from app.core.executor import LedgerExecutor
+from app.core.git_writer import GroupCommitWriter
+from app.core.merkle import MerkleLog
+from app.core.pin_queue import PinQueue, probe_ipfs
+from app.core.readiness import Readiness, READY, STARTING, UNAVAILABLE, FAILED
+from app.core.search import init_search, search
+from app.core.sqlite_db import LedgerDB
+
 logger = logging.getLogger("vow")
 
+# Public sort keys for query_submissions -> (column, direction)
+SORT_KEYS = {
+    "recent": ("created_at", "DESC"),
+    "oldest": ("created_at", "ASC"),
+    "year": ("incident_year", "DESC"),
+    "harm": ("life_loss", "DESC"),
+}
+MAX_PAGE_SIZE = 500
+
+# Stay well under SQLite's bound-parameter limit for IN (...) probes
+_IN_CHUNK = 500
+
+_INSERT_SUBMISSION = """
+    INSERT INTO submissions (
+        submission_id, submission_hash, entity_id, entity_name,
+        title, description, incident_country, incident_year,
+        life_loss, financial_loss, submitter_pubkey_hash, status,
+        intent_type, created_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+def _now() -> str:
+    """UTC timestamp in SQLite's CURRENT_TIMESTAMP format."""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+def _submission_row(entry: Dict, status: str = 'PENDING_JURY',
+                    intent_type: str = 'NEGLIGENCE') -> tuple:
+    return (
+        entry['submission_id'],
+        entry['submission_hash'],
+        entry['entity_id'],
+        entry['entity_name'],
+        entry['title'],
+        entry['description'],
+        entry['incident_country'],
+        entry['incident_year'],
+        entry.get('life_loss', 0),
+        entry.get('financial_loss', 0.0),
+        entry['submitter_pubkey_hash'],
+        status,
+        intent_type,
+        entry.get('recorded_at') or _now()
+    )
+
+def create_submissions_table(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS submissions (
+            submission_id TEXT PRIMARY KEY,
+            submission_hash TEXT UNIQUE NOT NULL,
+            entity_id TEXT NOT NULL,
+            entity_name TEXT NOT NULL,
+            title TEXT NOT NULL,
+            description TEXT NOT NULL,
+            incident_country TEXT NOT NULL,
+            incident_year INTEGER NOT NULL,
+            life_loss INTEGER DEFAULT 0,
+            financial_loss REAL DEFAULT 0,
+            submitter_pubkey_hash TEXT NOT NULL,
+            status TEXT DEFAULT 'PENDING_JURY',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    # Older databases predate the reviewer-assigned intent
+    columns = {row["name"] for row in conn.execute("PRAGMA table_info(submissions)")}
+    if "intent_type" not in columns:
+        conn.execute("ALTER TABLE submissions ADD COLUMN intent_type TEXT DEFAULT 'NEGLIGENCE'")
+
+def create_version_counter(conn):
+    """
+    ledger_meta.version goes up on every change to submissions (triggers),
+    whichever process or tool made it. Seeded from the clock so a rebuilt
+    database never reuses a version an older one handed out.
+    """
+    conn.execute("CREATE TABLE IF NOT EXISTS ledger_meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+    conn.execute("INSERT OR IGNORE INTO ledger_meta (key, value) VALUES ('version', ?)",
+                 (int(time.time() * 1000),))
+    for event in ("INSERT", "UPDATE", "DELETE"):
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_version_{event.lower()} AFTER {event} ON submissions BEGIN
+                UPDATE ledger_meta SET value = value + 1 WHERE key = 'version';
+            END
+        """)
+
+# Every column a mirror sees; never the submitter's key hash, which would link entries by submitter
+_EXPORT_COLUMNS = (
+    "submission_hash, entity_id, entity_name, title, description, incident_country, "
+    "incident_year, life_loss, financial_loss, status, intent_type, created_at"
+)
+
+# change_seq moves when any of these does (the trigger list existing databases were created with)
+_CHANGE_COLUMNS = _EXPORT_COLUMNS + ", submitter_pubkey_hash"
+
+def create_change_log(conn):
+    """
+    submissions.change_seq: stamped from ledger_meta.change_seq whenever a
+    row is inserted or one of its columns changes, so exports can resume
+    from "everything after N". Deletes only move the counter. Seeded from
+    the clock like the version, so a rebuilt database re-sends everything
+    rather than skipping rows.
+    """
+    columns = {row["name"] for row in conn.execute("PRAGMA table_info(submissions)")}
+    if "change_seq" not in columns:
+        conn.execute("ALTER TABLE submissions ADD COLUMN change_seq INTEGER")
+    conn.execute("INSERT OR IGNORE INTO ledger_meta (key, value) VALUES ('change_seq', ?)",
+                 (int(time.time() * 1000),))
+    
+    # Rows loaded before the triggers existed (older databases, rebuilds)
+    conn.execute("""
+        UPDATE submissions
+        SET change_seq = (SELECT value FROM ledger_meta WHERE key = 'change_seq') + rowid
+        WHERE change_seq IS NULL
+    """)
+    conn.execute("""
+        UPDATE ledger_meta SET value = MAX(value, (SELECT IFNULL(MAX(change_seq), 0) FROM submissions))
+        WHERE key = 'change_seq'
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_status_change_seq ON submissions(status, change_seq)")
+    
+    stamp = """
+        UPDATE ledger_meta SET value = value + 1 WHERE key = 'change_seq';
+        UPDATE submissions SET change_seq = (SELECT value FROM ledger_meta WHERE key = 'change_seq')
+        WHERE rowid = NEW.rowid;
+    """
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS trg_change_seq_insert AFTER INSERT ON submissions BEGIN {stamp} END")
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_change_seq_update
+        AFTER UPDATE OF {_CHANGE_COLUMNS} ON submissions BEGIN {stamp} END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_change_seq_delete AFTER DELETE ON submissions BEGIN
+            UPDATE ledger_meta SET value = value + 1 WHERE key = 'change_seq';
+        END
+    """)
+
+def create_event_log(conn):
+    """
+    ledger_events: the live-feed events, written in the same transaction as
+    the change they announce. Every worker process tails it into its own
+    EventBus, so a feed sees changes made through any worker. Ids are
+    change_seq values.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS ledger_events (
+            id INTEGER PRIMARY KEY,
+            event TEXT NOT NULL,
+            data TEXT NOT NULL
+        )
+    """)
+
+def create_submission_indexes(conn):
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_entity_id ON submissions(entity_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_status ON submissions(status)")
+    
+    # Keyset pagination indexes: filter columns first, then sort key + tiebreaker
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_status_created ON submissions(status, created_at, submission_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_entity_status_created ON submissions(entity_id, status, created_at, submission_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_status_year ON submissions(status, incident_year, submission_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_entity_status_year ON submissions(entity_id, status, incident_year, submission_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_status_harm ON submissions(status, life_loss, submission_id)")
+
+def encode_cursor(value: Any, submission_id: str) -> str:
+    raw = json.dumps([value, submission_id], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> List[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        value, submission_id = json.loads(raw)
+        return [value, submission_id]
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+def default_data_dir() -> Path:
+    # Use persistent disk on Render, local directory elsewhere
+    if os.getenv("RENDER"):
+        return Path("/opt/render/project/src/ledger")
+    return Path("./ledger")
+
 class DistributedLedger:
-    def __init__(self, data_dir: Path = None):
-        # Use persistent disk on Render, local directory elsewhere
+    """
+    Startup is staged: SQLite is opened synchronously, so reads are served as
+    soon as the constructor returns. Git, the Merkle backfill and IPFS come
+    up on a background thread (`background=False` runs git and the Merkle
+    backfill inline; the IPFS probe always gets its own thread).
+    Submissions wait for git and the Merkle tree; IPFS is optional and keeps
+    being retried. `readiness` reports each backend.
+    """
+    
+    def __init__(self, data_dir: Path = None, background: bool = True):
         if data_dir is None:
-            if os.getenv("RENDER"):
-                data_dir = Path("/opt/render/project/src/ledger")
-            else:
-                data_dir = Path("./ledger")
+            data_dir = default_data_dir()
+        
+        self.readiness = Readiness(required=("sqlite",))
+        self._closing = threading.Event()
         
         self.data_dir = data_dir
         self.entities_dir = data_dir / "entities"
@@ -30,95 +230,422 @@ class DistributedLedger:
         for d in [self.entities_dir, self.submissions_dir]:
             d.mkdir(parents=True, exist_ok=True)
         
-        # Initialize Git repo if it doesn't exist
-        if not (data_dir / ".git").exists():
-            self.repo = git.Repo.init(data_dir)
-        else:
-            self.repo = git.Repo(data_dir)
-        
-        # IPFS is optional - skip if not available
-        try:
-            import ipfshttpclient
-            self.ipfs = ipfshttpclient.connect('/dns/ipfs-daemon/tcp/5001/http')
-            logger.info("✅ Connected to IPFS")
-        except:
-            self.ipfs = None
-            logger.info("ℹ️ Running without IPFS (file storage only)")
+        # submission_id -> byte offset sidecars for the entity files
+        self.entity_index = EntityIndexStore(self.entities_dir, data_dir / "index")
         
+        # Stage 1 (required): one writer + pooled readers over ledger.db (WAL, mmap)
+        self.readiness.set("sqlite", STARTING)
+        self.db = LedgerDB(
+            self.db_path,
+            readers=int(os.getenv("LEDGER_DB_READERS", "4")),
+            mmap_mb=int(os.getenv("LEDGER_DB_MMAP_MB", "256")),
+            cache_mb=int(os.getenv("LEDGER_DB_CACHE_MB", "64"))
+        )
         self._init_sqlite()
+        
+        # Append-only Merkle tree over entry lines, daily roots sealed into hash_chain
+        self.merkle = MerkleLog(self.db)
+        self._version_conn = self.db.dedicated_reader()
+        self.readiness.set("sqlite", READY)
+        
+        # Columnar exports for offline analytics
+        self.snapshot_dir = data_dir / "snapshots"
+        self.legacy_dir = Path(os.getenv("LEGACY_DATA_DIR", "Data"))
+        self.snapshot_max_age = int(os.getenv("LEDGER_SNAPSHOT_MAX_AGE", "300"))
+        
+        # Live feed of submissions and jury decisions (/api/v1/events, /admin/{secret}/events)
+        self.events = EventBus(
+            buffer_size=int(os.getenv("EVENT_BUFFER_SIZE", "1024")),
+            queue_size=int(os.getenv("EVENT_QUEUE_SIZE", "256"))
+        )
+        self.event_log_size = int(os.getenv("EVENT_LOG_SIZE", "10000"))
+        self._event_follower = None
+        
+        # Blocking work runs here: one writer thread, bounded reader pool
+        self.executor = LedgerExecutor(readers=int(os.getenv("LEDGER_DB_READERS", "4")))
+        
+        # Stage 2: git, Merkle backfill, then IPFS - off the startup path
+        self.repo = None
+        self.git_writer = None
+        self.pins = None
+        self.ipfs_url = os.getenv("IPFS_API_URL") or os.getenv("IPFS_GATEWAY", "http://ipfs-daemon:5001")
+        for name in ("git", "merkle", "ipfs"):
+            self.readiness.set(name, STARTING)
+        if background:
+            self._startup = threading.Thread(target=self._start_backends, name="ledger-startup", daemon=True)
+            self._startup.start()
+        else:
+            self._startup = None
+            if self._start_local_backends():
+                self._startup = threading.Thread(target=self._connect_ipfs, name="ledger-ipfs", daemon=True)
+                self._startup.start()
         logger.info("✅ DistributedLedger initialized")
     
-    def _init_sqlite(self):
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS submissions (
-                    submission_id TEXT PRIMARY KEY,
-                    submission_hash TEXT UNIQUE NOT NULL,
-                    entity_id TEXT NOT NULL,
-                    entity_name TEXT NOT NULL,
-                    title TEXT NOT NULL,
-                    description TEXT NOT NULL,
-                    incident_country TEXT NOT NULL,
-                    incident_year INTEGER NOT NULL,
-                    life_loss INTEGER DEFAULT 0,
-                    financial_loss REAL DEFAULT 0,
-                    submitter_pubkey_hash TEXT NOT NULL,
-                    status TEXT DEFAULT 'PENDING_JURY',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    def _start_backends(self):
+        if self._start_local_backends():
+            self._connect_ipfs()
+    
+    def _start_local_backends(self) -> bool:
+        """Git, then the Merkle backfill; False (and FAILED readiness) if either fails."""
+        try:
+            self._start_git()
+        except Exception as e:
+            self.readiness.set("git", FAILED, str(e))
+            return False
+        try:
+            self._backfill_merkle()
+            self.readiness.set("merkle", READY)
+        except Exception as e:
+            self.readiness.set("merkle", FAILED, str(e))
+            return False
+        return True
+    
+    def _start_git(self):
+        import git     # GitPython is slow to import; keep it off the import path
+        
+        # Initialize Git repo if it doesn't exist
+        if not (self.data_dir / ".git").exists():
+            self.repo = git.Repo.init(self.data_dir)
+        else:
+            self.repo = git.Repo(self.data_dir)
+        
+        # Group commits: one git commit per batching window instead of per entry
+        self.git_writer = GroupCommitWriter(
+            self.repo,
+            interval_ms=int(os.getenv("LEDGER_GIT_BATCH_MS", "200")),
+            max_entries=int(os.getenv("LEDGER_GIT_BATCH_SIZE", "500"))
+        )
+        self.readiness.set("git", READY)
+    
+    def _connect_ipfs(self):
+        """Probe IPFS until it answers (with backoff); it is optional, so never give up loudly."""
+        delay, max_delay = 1.0, float(os.getenv("IPFS_RETRY_MAX_SECONDS", "300"))
+        while not self._closing.is_set():
+            if probe_ipfs(self.ipfs_url):
+                self.pins = PinQueue(
+                    self.ipfs_url,
+                    self.db,
+                    concurrency=int(os.getenv("IPFS_PIN_WORKERS", "2")),
+                    retries=int(os.getenv("IPFS_PIN_RETRIES", "5")),
+                    backoff_ms=int(os.getenv("IPFS_PIN_BACKOFF_MS", "500"))
                 )
-            """)
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_entity_id ON submissions(entity_id)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_status ON submissions(status)")
+                self.pins.enqueue_all(self.entities_dir)
+                self.readiness.set("ipfs", READY, self.ipfs_url)
+                return
+            if self.readiness.state("ipfs") != UNAVAILABLE:
+                self.readiness.set("ipfs", UNAVAILABLE, "running without IPFS (file storage only); retrying")
+            self._closing.wait(delay)
+            delay = min(delay * 2, max_delay)
+    
+    def current_version(self) -> int:
+        """
+        Ledger version for cache validation. A single-row primary-key read on
+        a dedicated connection, cheap enough to run on the event loop.
+        """
+        return self._version_conn.execute(
+            "SELECT value FROM ledger_meta WHERE key = 'version'"
+        ).fetchone()[0]
+    
+    async def _wait_writable(self):
+        """Submissions need git and the Merkle tree; wait for the background startup."""
+        for name in ("git", "merkle"):
+            if self.readiness.state(name) == READY:
+                continue
+            timeout = float(os.getenv("LEDGER_WRITE_READY_TIMEOUT", "30"))
+            ready = await asyncio.get_running_loop().run_in_executor(
+                None, self.readiness.wait, name, timeout
+            )
+            if not ready:
+                raise RuntimeError(f"Ledger not writable yet: {name} is {self.readiness.state(name)}")
+    
+    def close(self):
+        self._closing.set()
+        if self._event_follower is not None:
+            self._event_follower.cancel()
+        self.events.close()
+        if self._startup is not None:
+            self._startup.join(timeout=10)
+        self.executor.shutdown()
+        if self.git_writer:
+            self.git_writer.close()
+        if self.pins:
+            self.pins.close()
+        self.db.close()
+        self.entity_index.close()
+    
+    def _init_sqlite(self):
+        with self.db.writer() as conn:
+            create_submissions_table(conn)
+            create_submission_indexes(conn)
+            create_version_counter(conn)
+            create_change_log(conn)
+            create_event_log(conn)
+            
+            # Approved per-entity totals, kept current by triggers in the same transaction
+            init_aggregates(conn)
+            
+            # Full-text index over title / description / entity_name
+            init_search(conn)
     
     async def submit_entry(self, entry: Dict) -> Dict:
-        entity_file = self.entities_dir / f"{entry['entity_id']}.json"
+        await self._wait_writable()
+        entity_file, pending_commit = await self.executor.write(self._append_entry, entry)
         
-        with open(entity_file, 'a') as f:
-            f.write(json.dumps(entry) + '\n')
-        
-        self.repo.index.add([str(entity_file)])
-        commit = self.repo.index.commit(f"Entry {entry['submission_id']}")
-        
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                INSERT INTO submissions (
-                    submission_id, submission_hash, entity_id, entity_name,
-                    title, description, incident_country, incident_year,
-                    life_loss, financial_loss, submitter_pubkey_hash, status
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                entry['submission_id'],
-                entry['submission_hash'],
-                entry['entity_id'],
-                entry['entity_name'],
-                entry['title'],
-                entry['description'],
-                entry['incident_country'],
-                entry['incident_year'],
-                entry.get('life_loss', 0),
-                entry.get('financial_loss', 0.0),
-                entry['submitter_pubkey_hash'],
-                'PENDING_JURY'
-            ))
+        # Resolves once the batch holding this entry is committed
+        commit = await asyncio.wrap_future(pending_commit)
         
-        cid = None
-        if self.ipfs:
-            try:
-                with open(entity_file, 'rb') as f:
-                    cid = self.ipfs.add(f, pin=True)['Hash']
-            except:
-                pass
+        if self.pins:
+            self.pins.enqueue(entry['entity_id'], entity_file)
         
         return {
             "submission_id": entry['submission_id'],
             "git_commit": str(commit),
-            "ipfs_cid": cid,
+            "ipfs_cid": None,
+            "ipfs_pin": "QUEUED" if self.pins else None,
             "status": "PENDING_JURY"
         }
     
+    def _append_entry(self, entry: Dict):
+        entity_file = self.entities_dir / f"{entry['entity_id']}.json"
+        entry = dict(entry, recorded_at=_now())
+        
+        line = (json.dumps(entry) + '\n').encode()
+        self.entity_index.append(entry['entity_id'], [(entry['submission_id'], line)])
+        
+        pending_commit = self.git_writer.submit([str(entity_file)], [entry['submission_id']])
+        
+        with self.db.writer() as conn:
+            conn.execute(_INSERT_SUBMISSION, _submission_row(entry))
+            self.merkle.append(conn, [(entry['submission_id'], line)])
+            self._log_event(conn, "submitted", {
+                "submission_id": entry['submission_id'],
+                "entity_id": entry['entity_id'],
+                "entity_name": entry['entity_name'],
+                "incident_year": entry['incident_year']
+            }, submission_id=entry['submission_id'])
+        
+        return entity_file, pending_commit
+    
+    async def submit_entries(self, batch: List[Dict]) -> List[Dict]:
+        """
+        Bulk submit_entry: one append per entity file, one SQLite transaction,
+        one git commit and at most one queued IPFS pin per touched entity file.
+        Returns a receipt per input entry, in order; entries whose
+        submission_id or submission_hash already exist come back as DUPLICATE.
+        """
+        if not batch:
+            return []
+        await self._wait_writable()
+        entity_files, pending_commit, accepted = await self.executor.write(self._append_entries, batch)
+        
+        receipts = [
+            {"submission_id": entry['submission_id'], "status": "DUPLICATE"}
+            for entry in batch
+        ]
+        if not accepted:
+            return receipts
+        
+        commit = await asyncio.wrap_future(pending_commit)
+        
+        if self.pins:
+            for entity_id, path in entity_files.items():
+                self.pins.enqueue(entity_id, path)
+        
+        for i in accepted:
+            entry = batch[i]
+            receipts[i] = {
+                "submission_id": entry['submission_id'],
+                "git_commit": str(commit),
+                "ipfs_cid": None,
+                "ipfs_pin": "QUEUED" if self.pins else None,
+                "status": "PENDING_JURY"
+            }
+        return receipts
+    
+    def _append_entries(self, batch: List[Dict]):
+        # Drop entries already in the index (or repeated within the batch)
+        ids = [e['submission_id'] for e in batch]
+        hashes = [e['submission_hash'] for e in batch]
+        seen_ids, seen_hashes = set(), set()
+        with self.db.reader() as conn:
+            for column, values, seen in (("submission_id", ids, seen_ids),
+                                         ("submission_hash", hashes, seen_hashes)):
+                for start in range(0, len(values), _IN_CHUNK):
+                    chunk = values[start:start + _IN_CHUNK]
+                    marks = ",".join("?" * len(chunk))
+                    for row in conn.execute(
+                        f"SELECT {column} FROM submissions WHERE {column} IN ({marks})", chunk
+                    ):
+                        seen.add(row[0])
+        
+        accepted = []
+        for i, entry in enumerate(batch):
+            if entry['submission_id'] in seen_ids or entry['submission_hash'] in seen_hashes:
+                continue
+            seen_ids.add(entry['submission_id'])
+            seen_hashes.add(entry['submission_hash'])
+            accepted.append(i)
+        if not accepted:
+            return {}, None, []
+        
+        # One write per entity file
+        recorded_at = _now()
+        records = {i: dict(batch[i], recorded_at=recorded_at) for i in accepted}
+        per_entity: Dict[str, List] = {}
+        for i in accepted:
+            entry = records[i]
+            line = (json.dumps(entry) + '\n').encode()
+            per_entity.setdefault(entry['entity_id'], []).append((entry['submission_id'], line))
+        entity_files = {}
+        leaves = []
+        for entity_id, lines in per_entity.items():
+            leaves.extend(lines)
+            self.entity_index.append(entity_id, lines)
+            entity_files[entity_id] = self.entities_dir / f"{entity_id}.json"
+        
+        pending_commit = self.git_writer.submit(
+            [str(p) for p in entity_files.values()],
+            [batch[i]['submission_id'] for i in accepted]
+        )
+        
+        with self.db.writer() as conn:
+            conn.executemany(_INSERT_SUBMISSION, [_submission_row(records[i]) for i in accepted])
+            self.merkle.append(conn, leaves)
+        
+        return entity_files, pending_commit, accepted
+    
+    def _backfill_merkle(self):
+        """
+        Add leaves for entries written before the Merkle tree existed. Every
+        worker runs this at startup, so the missing set is read and filled in
+        one write transaction: a worker that gets the lock second finds
+        nothing left to add.
+        """
+        with self.db.writer() as conn:
+            missing = conn.execute("""
+                SELECT submission_id, entity_id FROM submissions
+                WHERE submission_id NOT IN (SELECT submission_id FROM merkle_leaves)
+                ORDER BY rowid
+            """).fetchall()
+            if not missing:
+                return
+            records, no_line = [], 0
+            for row in missing:
+                line = None
+                if self.entity_index.entity_file(row["entity_id"]).exists():
+                    line = self.entity_index.get(row["entity_id"]).read_raw(row["submission_id"])
+                if line is None:
+                    no_line += 1    # SQLite-only rows (e.g. import_to_sqlite.py) have no ledger line
+                    continue
+                records.append((row["submission_id"], bytes(line)))
+            self.merkle.append(conn, records)
+        logger.info(f"🌳 Added {len(records)} existing entries to the Merkle tree ({no_line} without a ledger line)")
+    
+    async def merkle_root(self) -> Dict:
+        return await self.executor.read(self.merkle.root)
+    
+    async def inclusion_proof(self, submission_id: str, tree_size: Optional[int] = None) -> Optional[Dict]:
+        return await self.executor.read(self.merkle.inclusion_proof, submission_id, tree_size)
+    
+    async def hash_chain(self, limit: int = 100) -> List[Dict]:
+        """Daily sealed roots, newest first. Seals the last finished day if still open."""
+        await self.executor.write(self._seal_merkle)
+        return await self.executor.read(self.merkle.hash_chain, limit)
+    
+    def _seal_merkle(self) -> int:
+        with self.db.writer() as conn:
+            return self.merkle.seal_through(conn)
+    
+    async def pinned_cid(self, entity_id: str) -> Optional[str]:
+        """CID of the most recently pinned version of an entity file."""
+        if not self.pins:
+            return None
+        return await self.executor.read(self.pins.latest_cid, entity_id)
+    
+    async def read_entry(self, entity_id: str, submission_id: str) -> Optional[Dict]:
+        """Read one record back from its entity file (the source of truth)."""
+        return await self.executor.read(self.entity_index.read, entity_id, submission_id)
+    
+    async def submission_fingerprints(self):
+        """
+        SubmissionFingerprints over every (submission_id, submission_hash,
+        content key), streamed from one read transaction in chunks: 24 bytes
+        per row.
+        """
+        return await self.executor.read(self._submission_fingerprints)
+    
+    def _submission_fingerprints(self):
+        from app.core.fingerprints import SubmissionFingerprints     # NumPy only when previews are used
+        from app.core.legacy import stored_content_key
+        
+        with self.db.reader() as conn:
+            conn.execute("BEGIN")
+            try:
+                total = conn.execute("SELECT COUNT(*) FROM submissions").fetchone()[0]
+                builder = SubmissionFingerprints.builder(total)
+                cursor = conn.execute(
+                    "SELECT submission_id, submission_hash, entity_id, title, description, incident_year, "
+                    "life_loss, financial_loss FROM submissions"
+                )
+                while True:
+                    chunk = cursor.fetchmany(10000)
+                    if not chunk:
+                        break
+                    builder.add([row[0] for row in chunk], [row[1] for row in chunk],
+                                [stored_content_key(row) for row in chunk])
+            finally:
+                conn.execute("ROLLBACK")
+        return builder.build()
+    
+    async def spot_check(self, sample: int = 20) -> Dict:
+        """Compare a random sample of SQLite rows against their entity file records."""
+        return await self.executor.read(self._spot_check, sample)
+    
+    def _spot_check(self, sample: int) -> Dict:
+        with self.db.reader() as conn:
+            rows = conn.execute(
+                "SELECT submission_id, submission_hash, entity_id FROM submissions ORDER BY RANDOM() LIMIT ?",
+                (sample,)
+            ).fetchall()
+        mismatches = []
+        for row in rows:
+            record = self.entity_index.read(row["entity_id"], row["submission_id"])
+            if record is None:
+                mismatches.append({"submission_id": row["submission_id"], "reason": "missing from entity file"})
+            elif record.get("submission_hash") != row["submission_hash"]:
+                mismatches.append({"submission_id": row["submission_id"], "reason": "submission_hash differs"})
+        return {"checked": len(rows), "mismatches": mismatches}
+    
+    async def snapshot_npz(self, full: bool = False) -> Path:
+        """
+        Path to a columnar .npz snapshot, re-exported once it is older than
+        snapshot_max_age. Approved submissions only, unless `full` (admin).
+        """
+        return await self.executor.read(self._snapshot_npz, full)
+    
+    def _snapshot_npz(self, full: bool) -> Path:
+        from app.core.snapshot import export_snapshot, pack_npz, snapshot_lock     # numpy only when exporting
+        
+        # Not the old "latest"/ledger.npz names: those held every status
+        name = "full" if full else "approved"
+        npz = self.snapshot_dir / f"ledger-{name}.npz"
+        # Every worker process serves this; one rebuilds while the rest wait, then reuse it
+        with snapshot_lock(self.snapshot_dir):
+            if npz.exists() and time.time() - npz.stat().st_mtime < self.snapshot_max_age:
+                return npz
+            with self.db.reader() as conn:
+                export_snapshot(conn, self.snapshot_dir / name, self.legacy_dir,
+                                statuses=None if full else ("APPROVED",))
+            return pack_npz(self.snapshot_dir / name, npz)
+    
+    async def rebuild_entity_index(self, entity_id: Optional[str] = None) -> int:
+        return await self.executor.write(self.entity_index.rebuild, entity_id)
+    
     async def get_submissions(self, entity_id: Optional[str] = None) -> List[Dict]:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        return await self.executor.read(self._get_submissions, entity_id)
+    
+    def _get_submissions(self, entity_id: Optional[str] = None) -> List[Dict]:
+        with self.db.reader() as conn:
             if entity_id:
                 cursor = conn.execute(
                     "SELECT * FROM submissions WHERE entity_id = ? ORDER BY created_at DESC",
@@ -132,31 +659,368 @@ class DistributedLedger:
             return [dict(row) for row in rows]
     
     async def get_submission(self, submission_id: str) -> Optional[Dict]:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        return await self.executor.read(self._get_submission, submission_id)
+    
+    def _get_submission(self, submission_id: str) -> Optional[Dict]:
+        with self.db.reader() as conn:
             cursor = conn.execute(
                 "SELECT * FROM submissions WHERE submission_id = ?",
                 (submission_id,)
             )
             row = cursor.fetchone()
             return dict(row) if row else None
+    
+    async def query_submissions(self, status: Optional[str] = None, entity_id: Optional[str] = None,
+                                year_from: Optional[int] = None, year_to: Optional[int] = None,
+                                sort: str = "recent", cursor: Optional[str] = None,
+                                limit: int = 50) -> Dict:
+        """
+        Filtered, keyset-paginated listing. Returns {"items": [...], "next_cursor": str|None};
+        pass next_cursor back to get the following page.
+        """
+        return await self.executor.read(
+            self._query_submissions, status, entity_id, year_from, year_to, sort, cursor, limit
+        )
+    
+    def _query_submissions(self, status, entity_id, year_from, year_to, sort, cursor, limit) -> Dict:
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Invalid sort. Must be one of: {', '.join(SORT_KEYS)}")
+        column, direction = SORT_KEYS[sort]
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        
+        where, params = [], []
+        if status:
+            where.append("status = ?")
+            params.append(status)
+        if entity_id:
+            where.append("entity_id = ?")
+            params.append(entity_id)
+        if year_from is not None:
+            where.append("incident_year >= ?")
+            params.append(year_from)
+        if year_to is not None:
+            where.append("incident_year <= ?")
+            params.append(year_to)
+        if cursor:
+            op = "<" if direction == "DESC" else ">"
+            where.append(f"({column}, submission_id) {op} (?, ?)")
+            params.extend(decode_cursor(cursor))
+        
+        sql = "SELECT * FROM submissions"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {column} {direction}, submission_id {direction} LIMIT ?"
+        params.append(limit + 1)
+        
+        with self.db.reader() as conn:
+            rows = [dict(row) for row in conn.execute(sql, params)]
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(last[column], last['submission_id'])
+        return {"items": rows, "next_cursor": next_cursor}
+    
+    async def search_submissions(self, q: str, status: Optional[str] = "APPROVED",
+                                 entity_id: Optional[str] = None, cursor: Optional[str] = None,
+                                 limit: int = 20) -> Dict:
+        """BM25-ranked full-text search. Same {"items", "next_cursor"} shape as query_submissions."""
+        return await self.executor.read(self._search_submissions, q, status, entity_id, cursor, limit)
+    
+    def _search_submissions(self, q, status, entity_id, cursor, limit) -> Dict:
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        after = decode_cursor(cursor) if cursor else None
+        with self.db.reader() as conn:
+            rows = search(conn, q, status=status, entity_id=entity_id, after=after, limit=limit)
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]['score'], rows[-1]['rid'])
+        for row in rows:
+            del row['rid']
+        return {"items": rows, "next_cursor": next_cursor}
+    
+    async def count_submissions(self, status: Optional[str] = None,
+                                entity_id: Optional[str] = None) -> Dict[str, int]:
+        """Row and distinct-entity counts, optionally filtered."""
+        return await self.executor.read(self._count_submissions, status, entity_id)
+    
+    def _count_submissions(self, status, entity_id) -> Dict[str, int]:
+        where, params = [], []
+        if status:
+            where.append("status = ?")
+            params.append(status)
+        if entity_id:
+            where.append("entity_id = ?")
+            params.append(entity_id)
+        sql = "SELECT COUNT(*) AS total, COUNT(DISTINCT entity_id) AS entities FROM submissions"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        with self.db.reader() as conn:
+            row = conn.execute(sql, params).fetchone()
+            return {"total": row["total"], "entities": row["entities"]}
+    
+    async def list_entity_ids(self, limit: int = 10) -> List[str]:
+        return await self.executor.read(self._list_entity_ids, limit)
+    
+    def _list_entity_ids(self, limit: int) -> List[str]:
+        with self.db.reader() as conn:
+            rows = conn.execute(
+                "SELECT DISTINCT entity_id FROM submissions ORDER BY entity_id LIMIT ?", (limit,)
+            )
+            return [row["entity_id"] for row in rows]
+    
+    async def entity_summaries(self, status: str = "APPROVED") -> List[Dict]:
+        """Per-entity totals, most harmful first. APPROVED reads entity_aggregates."""
+        return await self.executor.read(self._entity_summaries, status)
+    
+    def _entity_summaries(self, status: str) -> List[Dict]:
+        with self.db.reader() as conn:
+            if status == "APPROVED":
+                rows = conn.execute("""
+                    SELECT entity_id, entity_name, total_entries, total_harm_ly,
+                           total_harm_ecy, last_entry
+                    FROM entity_aggregates
+                    ORDER BY total_harm_ly DESC
+                """)
+                return [dict(row) for row in rows]
+            
+            # entity_name comes from the row holding MAX(created_at), i.e. the latest
+            rows = conn.execute("""
+                SELECT entity_id, entity_name,
+                       COUNT(*) AS total_entries,
+                       SUM(ABS(life_loss)) AS total_harm_ly,
+                       SUM(ABS(financial_loss)) AS total_harm_ecy,
+                       MAX(created_at) AS last_entry
+                FROM submissions
+                WHERE status = ?
+                GROUP BY entity_id
+                ORDER BY total_harm_ly DESC
+            """, (status,))
+            return [dict(row) for row in rows]
+    
+    async def entity_summary(self, entity_id: str) -> Optional[Dict]:
+        """Approved totals for one entity from entity_aggregates, or None."""
+        return await self.executor.read(self._entity_summary, entity_id)
+    
+    def _entity_summary(self, entity_id: str) -> Optional[Dict]:
+        with self.db.reader() as conn:
+            row = conn.execute("""
+                SELECT entity_id, entity_name, total_entries, total_harm_ly,
+                       total_harm_ecy, last_entry
+                FROM entity_aggregates
+                WHERE entity_id = ?
+            """, (entity_id,)).fetchone()
+            return dict(row) if row else None
+    
+    def change_head(self) -> int:
+        """Latest change_seq handed out; same cheap read as current_version()."""
+        return self._version_conn.execute(
+            "SELECT value FROM ledger_meta WHERE key = 'change_seq'"
+        ).fetchone()[0]
+    
+    async def export_batch(self, since: int, until: int, limit: int) -> List[Dict]:
+        """Approved rows with since < change_seq <= until, oldest change first."""
+        return await self.executor.read(self._export_batch, since, until, limit)
+    
+    def _export_batch(self, since: int, until: int, limit: int) -> List[Dict]:
+        with self.db.reader() as conn:
+            rows = conn.execute(f"""
+                SELECT change_seq, submission_id, {_EXPORT_COLUMNS}
+                FROM submissions
+                WHERE status = 'APPROVED' AND change_seq > ? AND change_seq <= ?
+                ORDER BY change_seq
+                LIMIT ?
+            """, (since, until, limit))
+            return [dict(row) for row in rows]
+    
+    async def entity_fingerprints(self) -> Dict[str, str]:
+        """
+        {entity_id: sha256 over its approved rows as the public pages show
+        them}. Changes exactly when an entity's pages would render differently.
+        """
+        return await self.executor.read(self._entity_fingerprints)
+    
+    def _entity_fingerprints(self) -> Dict[str, str]:
+        fingerprints, current, h = {}, None, None
+        with self.db.reader() as conn:
+            rows = conn.execute("""
+                SELECT entity_id, submission_id, submission_hash, entity_name, description,
+                       incident_year, life_loss, financial_loss, intent_type, created_at
+                FROM submissions WHERE status = 'APPROVED'
+                ORDER BY entity_id, submission_id
+            """)
+            for row in rows:
+                if row[0] != current:
+                    if current is not None:
+                        fingerprints[current] = h.hexdigest()
+                    current, h = row[0], hashlib.sha256()
+                h.update(json.dumps(tuple(row), default=str).encode())
+        if current is not None:
+            fingerprints[current] = h.hexdigest()
+        return fingerprints
+    
+    async def approve_submission(self, submission_id: str, life_loss: int,
+                                 financial_loss: float, intent_type: str) -> bool:
+        """Record the reviewed harm values and approve. False if not pending."""
+        await self._wait_writable()
+        entity_id = await self.executor.write(
+            self._approve_submission, submission_id, life_loss, financial_loss, intent_type
+        )
+        return entity_id is not None
+    
+    def _approve_submission(self, submission_id: str, life_loss: int,
+                            financial_loss: float, intent_type: str) -> Optional[str]:
+        with self.db.writer() as conn:
+            cursor = conn.execute("""
+                UPDATE submissions 
+                SET life_loss = ?,
+                    financial_loss = ?,
+                    intent_type = ?,
+                    status = 'APPROVED'
+                WHERE submission_id = ? AND status = 'PENDING_JURY'
+            """, (life_loss, financial_loss, intent_type, submission_id))
+            if cursor.rowcount == 0:
+                return None
+            entity_id = self._record_event(conn, submission_id, {
+                "event": "APPROVED",
+                "life_loss": life_loss,
+                "financial_loss": financial_loss,
+                "intent_type": intent_type
+            })
+            self._log_event(conn, "approved", {
+                "submission_id": submission_id,
+                "entity_id": entity_id,
+                "life_loss": life_loss,
+                "financial_loss": financial_loss,
+                "intent_type": intent_type
+            }, submission_id=submission_id)
+            return entity_id
+    
+    async def reject_submission(self, submission_id: str) -> bool:
+        """Reject a pending submission. False if not pending."""
+        await self._wait_writable()
+        entity_id = await self.executor.write(self._reject_submission, submission_id)
+        return entity_id is not None
+    
+    def _reject_submission(self, submission_id: str) -> Optional[str]:
+        with self.db.writer() as conn:
+            cursor = conn.execute("""
+                UPDATE submissions 
+                SET status = 'REJECTED'
+                WHERE submission_id = ? AND status = 'PENDING_JURY'
+            """, (submission_id,))
+            if cursor.rowcount == 0:
+                return None
+            entity_id = self._record_event(conn, submission_id, {"event": "REJECTED"})
+            self._log_event(conn, "rejected", {
+                "submission_id": submission_id,
+                "entity_id": entity_id
+            }, submission_id=submission_id)
+            return entity_id
+    
+    def _record_event(self, conn, submission_id: str, event: Dict) -> str:
+        """
+        Append a jury decision to the entity file so the file alone can rebuild
+        ledger.db. Runs inside the caller's transaction: a failed append rolls
+        the status change back. Returns the entity_id.
+        """
+        entity_id = conn.execute(
+            "SELECT entity_id FROM submissions WHERE submission_id = ?", (submission_id,)
+        ).fetchone()[0]
+        event = dict(event, submission_id=submission_id, recorded_at=_now())
+        self.entity_index.append_event(entity_id, (json.dumps(event) + '\n').encode())
+        self.git_writer.submit([str(self.entity_index.entity_file(entity_id))],
+                               [f"{submission_id} ({event['event']})"])
+        return entity_id
+
+    # ---------- live feed ----------
+    
+    def _log_event(self, conn, event: str, data: Dict, submission_id: Optional[str] = None) -> int:
+        """
+        Write a feed event inside the caller's transaction. Its id is the
+        change_seq the trigger just stamped on `submission_id`'s row, or a
+        freshly drawn one for events not tied to a row. The log keeps the
+        last EVENT_LOG_SIZE events.
+        """
+        if submission_id is not None:
+            event_id = conn.execute(
+                "SELECT change_seq FROM submissions WHERE submission_id = ?", (submission_id,)
+            ).fetchone()[0]
+        else:
+            conn.execute("UPDATE ledger_meta SET value = value + 1 WHERE key = 'change_seq'")
+            event_id = conn.execute("SELECT value FROM ledger_meta WHERE key = 'change_seq'").fetchone()[0]
+        version = conn.execute("SELECT value FROM ledger_meta WHERE key = 'version'").fetchone()[0]
+        conn.execute("INSERT INTO ledger_events (id, event, data) VALUES (?, ?, ?)",
+                     (event_id, event, json.dumps(dict(data, version=version), default=str)))
+        conn.execute("""
+            DELETE FROM ledger_events WHERE id < (
+                SELECT id FROM ledger_events ORDER BY id DESC LIMIT 1 OFFSET ?
+            )
+        """, (self.event_log_size - 1,))
+        return event_id
+    
+    async def publish_event(self, event: str, data: Dict) -> int:
+        """Log an event not tied to one submission (e.g. an import run) for every worker's feed."""
+        return await self.executor.write(self._publish_event, event, data)
+    
+    def _publish_event(self, event: str, data: Dict) -> int:
+        with self.db.writer() as conn:
+            return self._log_event(conn, event, data)
+    
+    def _events_after(self, after: int, limit: int) -> List[Dict]:
+        with self.db.reader() as conn:
+            rows = conn.execute(
+                "SELECT id, event, data FROM ledger_events WHERE id > ? ORDER BY id LIMIT ?",
+                (after, limit)
+            )
+            return [{"id": r["id"], "event": r["event"], "data": json.loads(r["data"])} for r in rows]
+    
+    def follow_events(self):
+        """
+        Start tailing ledger_events into self.events (call from the event
+        loop). Polls the cheap change_seq head every EVENT_POLL_SECONDS and
+        reads the log only when it moved.
+        """
+        if self._event_follower is None:
+            self._event_follower = asyncio.get_running_loop().create_task(self._follow_events(
+                float(os.getenv("EVENT_POLL_SECONDS", "0.5"))
+            ))
+    
+    async def _follow_events(self, poll_seconds: float, batch: int = 500):
+        seen = self.change_head()
+        self.events.reset(seen)
+        while not self._closing.is_set():
+            await asyncio.sleep(poll_seconds)
+            try:
+                head = self.change_head()
+                if head == seen:
+                    continue
+                records = await self.executor.read(self._events_after, self.events.last_id, batch)
+                for record in records:
+                    self.events.publish(record["id"], record["event"], record["data"])
+                if len(records) < batch:
+                    seen = head
+            except Exception as e:
+                logger.warning(f"⚠️ Event feed poll failed: {e}")
 
 # Global instance
 _ledger = None
 
 async def init_db():
     global _ledger
-    _ledger = DistributedLedger()
+    # Only SQLite is opened here; git and IPFS finish in the background
+    _ledger = await asyncio.to_thread(DistributedLedger)
+    _ledger.follow_events()
     logger.info("🚀 Distributed Ledger initialized")
     return _ledger
 
 async def close_db():
     global _ledger
-    if _ledger and _ledger.ipfs:
-        try:
-            _ledger.ipfs.close()
-        except:
-            pass
+    if _ledger:
+        _ledger.close()
     logger.info("🛑 Distributed Ledger shut down")
 
 def get_ledger():
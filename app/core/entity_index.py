@@ -0,0 +1,247 @@
+# app/core/entity_index.py - Byte-offset index over the per-entity JSONL files
+import os
+import json
+import mmap
+import threading
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger("vow")
+
+
+def _append_bytes(path: Path, data: bytes) -> int:
+    """
+    Append `data` in a single O_APPEND write and return the file offset just
+    past it - ours even if other processes append concurrently.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+        return os.lseek(fd, 0, os.SEEK_CUR)
+    finally:
+        os.close(fd)
+
+
+class EntityFileIndex:
+    """
+    Sidecar index for one `entities/<entity_id>.json` file.
+
+    Maps submission_id -> (byte offset, length) of its JSON line, stored
+    as `submission_id<TAB>offset<TAB>length` lines next to the ledger.
+    The sidecar is appended on every write and can always be rebuilt from
+    the entity file, which stays the source of truth. Reads slice the
+    record straight out of an mmap of the entity file.
+
+    Several worker processes append to the same files, each with its own
+    index: every append first indexes whatever others wrote since, and a
+    lookup miss rescans the unindexed tail before giving up.
+    """
+
+    def __init__(self, data_path: Path, index_path: Path):
+        self.data_path = data_path
+        self.index_path = index_path
+        self.offsets: Dict[str, Tuple[int, int]] = {}
+        self.indexed_bytes = 0
+        self._lock = threading.RLock()
+        self._mmap: Optional[mmap.mmap] = None
+        self._load()
+
+    # ---------- building ----------
+
+    def _load(self):
+        if self.index_path.exists():
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    parts = line.rstrip("\n").split("\t")
+                    if len(parts) != 3 or not (parts[1].isdigit() and parts[2].isdigit()):
+                        continue
+                    sid, offset, length = parts[0], int(parts[1]), int(parts[2])
+                    self.offsets.setdefault(sid, (offset, length))
+                    self.indexed_bytes = max(self.indexed_bytes, offset + length)
+
+        size = self.data_path.stat().st_size if self.data_path.exists() else 0
+        if size < self.indexed_bytes:
+            # Entity file was replaced or truncated - the sidecar is stale
+            self.rebuild()
+        elif size > self.indexed_bytes:
+            # Lines appended by something that bypassed the index
+            self._catch_up()
+
+    def _scan(self, start: int, stop: Optional[int] = None) -> Tuple[List[Tuple[str, int, int]], int]:
+        """
+        (submission_id, offset, length) for every complete record from `start`
+        (up to `stop`), plus the offset just past the last complete line.
+        """
+        found = []
+        with open(self.data_path, "rb") as f:
+            f.seek(start)
+            offset = end = start
+            for raw in f:
+                if stop is not None and offset >= stop:
+                    break
+                length = len(raw)
+                if not raw.endswith(b"\n"):
+                    break       # torn final line - picked up once it is completed
+                try:
+                    record = json.loads(raw)
+                except ValueError:
+                    record = None
+                if isinstance(record, dict) and record.get("submission_id") and "event" not in record:
+                    found.append((record["submission_id"], offset, length))
+                offset += length
+                end = offset
+        return found, end
+
+    def _catch_up(self, stop: Optional[int] = None, persist: bool = True) -> bool:
+        """
+        Index lines appended behind our back; True if everything up to `stop`
+        is indexed. Lines another live worker wrote are already in the
+        sidecar (it records its own), so those are only indexed in memory.
+        """
+        with self._lock:
+            if not self.data_path.exists():
+                return stop is None or stop <= self.indexed_bytes
+            found, end = self._scan(self.indexed_bytes, stop)
+            if persist:
+                self._write_sidecar(found, append=True)
+            else:
+                for sid, offset, length in found:
+                    self.offsets.setdefault(sid, (offset, length))
+            self.indexed_bytes = max(self.indexed_bytes, end)
+            return stop is None or end >= stop
+
+    def rebuild(self):
+        """Recreate the sidecar from the entity file."""
+        with self._lock:
+            self.offsets = {}
+            self.indexed_bytes = 0
+            self._close_mmap()
+            if self.index_path.exists():
+                self.index_path.unlink()
+            if self.data_path.exists():
+                found, end = self._scan(0)
+                self._write_sidecar(found, append=False)
+                self.indexed_bytes = end
+
+    def _write_sidecar(self, records: List[Tuple[str, int, int]], append: bool):
+        for sid, offset, length in records:
+            self.offsets.setdefault(sid, (offset, length))
+        text = "".join(f"{sid}\t{offset}\t{length}\n" for sid, offset, length in records).encode("utf-8")
+        if append:
+            if text:
+                # One O_APPEND write, so lines from other processes never interleave with ours
+                _append_bytes(self.index_path, text)
+            return
+        tmp = self.index_path.with_suffix(".idx.tmp")
+        with open(tmp, "wb") as f:
+            f.write(text)
+        os.replace(tmp, self.index_path)
+
+    # ---------- writing ----------
+
+    def append(self, records: List[Tuple[str, bytes]]) -> List[Tuple[int, int]]:
+        """Append encoded JSON lines in one write and index them."""
+        with self._lock:
+            blob = b"".join(line for _, line in records)
+            end = _append_bytes(self.data_path, blob)
+            offset = start = end - len(blob)
+            placed = []
+            for sid, line in records:
+                placed.append((offset, len(line)))
+                offset += len(line)
+            complete = self._catch_up(stop=start, persist=False)
+            self._write_sidecar([(sid, o, n) for (sid, _), (o, n) in zip(records, placed)], append=True)
+            if complete:
+                self.indexed_bytes = max(self.indexed_bytes, end)
+            return placed
+
+    def append_unindexed(self, lines: List[bytes]):
+        """Append lines that are not submissions (e.g. jury events) without indexing them."""
+        with self._lock:
+            blob = b"".join(lines)
+            end = _append_bytes(self.data_path, blob)
+            if self._catch_up(stop=end - len(blob), persist=False):
+                self.indexed_bytes = max(self.indexed_bytes, end)
+
+    # ---------- reading ----------
+
+    def _close_mmap(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def read_raw(self, submission_id: str) -> Optional[bytes]:
+        with self._lock:
+            loc = self.offsets.get(submission_id)
+            if loc is None:
+                # Possibly appended by another process since we last looked
+                self._catch_up(persist=False)
+                loc = self.offsets.get(submission_id)
+            if loc is None:
+                return None
+            offset, length = loc
+            if self._mmap is None or offset + length > len(self._mmap):
+                # File grew since we mapped it
+                self._close_mmap()
+                with open(self.data_path, "rb") as f:
+                    self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            return self._mmap[offset:offset + length]
+
+    def read(self, submission_id: str) -> Optional[Dict]:
+        raw = self.read_raw(submission_id)
+        return json.loads(raw) if raw is not None else None
+
+    def close(self):
+        with self._lock:
+            self._close_mmap()
+
+
+class EntityIndexStore:
+    """Lazily opened EntityFileIndex per entity, sidecars under `index_dir`."""
+
+    def __init__(self, entities_dir: Path, index_dir: Path):
+        self.entities_dir = entities_dir
+        self.index_dir = index_dir
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self._indexes: Dict[str, EntityFileIndex] = {}
+        self._lock = threading.Lock()
+
+    def entity_file(self, entity_id: str) -> Path:
+        return self.entities_dir / f"{entity_id}.json"
+
+    def get(self, entity_id: str) -> EntityFileIndex:
+        with self._lock:
+            index = self._indexes.get(entity_id)
+            if index is None:
+                index = EntityFileIndex(self.entity_file(entity_id), self.index_dir / f"{entity_id}.idx")
+                self._indexes[entity_id] = index
+            return index
+
+    def append(self, entity_id: str, records: List[Tuple[str, bytes]]) -> List[Tuple[int, int]]:
+        return self.get(entity_id).append(records)
+
+    def append_event(self, entity_id: str, line: bytes):
+        self.get(entity_id).append_unindexed([line])
+
+    def read(self, entity_id: str, submission_id: str) -> Optional[Dict]:
+        if not self.entity_file(entity_id).exists():
+            return None
+        return self.get(entity_id).read(submission_id)
+
+    def rebuild(self, entity_id: Optional[str] = None) -> int:
+        """Rebuild one sidecar, or all of them. Returns the number of files indexed."""
+        entity_ids = [entity_id] if entity_id else [p.stem for p in self.entities_dir.glob("*.json")]
+        for eid in entity_ids:
+            self.get(eid).rebuild()
+        logger.info(f"✅ Rebuilt offset index for {len(entity_ids)} entity files")
+        return len(entity_ids)
+
+    def close(self):
+        with self._lock:
+            for index in self._indexes.values():
+                index.close()
+            self._indexes = {}
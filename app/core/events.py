@@ -0,0 +1,112 @@
+# app/core/events.py - Per-worker fan-out of the shared ledger event log, replayable by event id
+import json
+import asyncio
+import logging
+from collections import deque
+from typing import Dict, List, Optional
+
+logger = logging.getLogger("vow")
+
+
+def format_sse(record: Dict) -> bytes:
+    """One Server-Sent Events message."""
+    data = json.dumps(record["data"], separators=(",", ":"), default=str)
+    return f"id: {record['id']}\nevent: {record['event']}\ndata: {data}\n\n".encode("utf-8")
+
+
+class Subscription:
+    """One listener's bounded queue. A None in the queue ends the stream."""
+
+    def __init__(self, bus: "EventBus", queue_size: int):
+        self._bus = bus
+        self.queue: "asyncio.Queue[Optional[Dict]]" = asyncio.Queue(maxsize=queue_size)
+        self.dropped = False
+
+    def _offer(self, record: Optional[Dict]):
+        if self.dropped:
+            return
+        try:
+            self.queue.put_nowait(record)
+        except asyncio.QueueFull:
+            # Too slow to keep up: end its stream; it resumes from the buffer by Last-Event-ID
+            self.dropped = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+    def close(self):
+        self._bus._subscribers.discard(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class EventBus:
+    """
+    Fan-out of ledger events (submitted, approved, rejected, imported) to
+    every open feed of this worker, plus a ring buffer of the last
+    `buffer_size` events so a reconnecting client can resume by
+    Last-Event-ID. Events are written to the ledger's event log by
+    whichever worker handled the request; each worker tails that log into
+    its own bus, so ids are the ledger's change_seq and mean the same on
+    every worker. publish() must be called from the event loop.
+    """
+
+    def __init__(self, buffer_size: int = 1024, queue_size: int = 256):
+        self._buffer: "deque[Dict]" = deque(maxlen=max(buffer_size, 1))
+        self._subscribers = set()
+        self._queue_size = max(queue_size, 1)
+        self.last_id = 0
+        self._floor = 0     # replay covers every event after this id
+        self.published = 0
+
+    def reset(self, event_id: int):
+        """Follow the log from `event_id` on; nothing before it can be replayed."""
+        self._buffer.clear()
+        self.last_id = self._floor = event_id
+
+    def publish(self, event_id: int, event: str, data: Dict) -> Optional[Dict]:
+        if event_id <= self.last_id:
+            return None
+        if len(self._buffer) == self._buffer.maxlen:
+            self._floor = self._buffer[0]["id"]
+        record = {"id": event_id, "event": event, "data": data}
+        self._buffer.append(record)
+        self.last_id = event_id
+        self.published += 1
+        for sub in list(self._subscribers):
+            sub._offer(record)
+        return record
+
+    def subscribe(self) -> Subscription:
+        sub = Subscription(self, self._queue_size)
+        self._subscribers.add(sub)
+        return sub
+
+    def replay(self, last_id: int) -> Optional[List[Dict]]:
+        """
+        Events after `last_id`, or None when the buffer no longer reaches
+        back that far and the client must resync from the ledger itself. An
+        id this worker has not caught up to yet replays nothing; the rest
+        arrives live.
+        """
+        if last_id < self._floor:
+            return None
+        return [r for r in self._buffer if r["id"] > last_id]
+
+    def close(self):
+        """End every open feed (shutdown)."""
+        for sub in list(self._subscribers):
+            sub._offer(None)
+        self._subscribers.clear()
+
+    def stats(self) -> Dict:
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "buffered": len(self._buffer),
+            "last_id": self.last_id
+        }
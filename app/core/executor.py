@@ -0,0 +1,100 @@
+# app/core/executor.py - Keeps blocking ledger I/O off the asyncio event loop
+import asyncio
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger("vow")
+
+
+class _LaneStats:
+    """Queue depth and latency counters for one executor lane."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.total_wait = 0.0
+        self.total_run = 0.0
+        self.max_wait = 0.0
+        self.max_run = 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            done = self.completed + self.failed
+            return {
+                "queued": self.queued,
+                "running": self.running,
+                "completed": self.completed,
+                "failed": self.failed,
+                "avg_wait_ms": round(self.total_wait / done * 1000, 3) if done else 0.0,
+                "avg_run_ms": round(self.total_run / done * 1000, 3) if done else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+                "max_run_ms": round(self.max_run * 1000, 3)
+            }
+
+
+class LedgerExecutor:
+    """
+    Runs blocking ledger calls (sqlite3, GitPython, file appends, IPFS)
+    on worker threads so the event loop stays responsive.
+
+    Mutations go through a single writer thread, so they are applied in
+    submission order without further locking. Reads and other side I/O
+    share a bounded thread pool.
+    """
+
+    def __init__(self, readers: int = 4):
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ledger-writer")
+        self._readers = ThreadPoolExecutor(max_workers=max(readers, 1), thread_name_prefix="ledger-reader")
+        self._stats = {"write": _LaneStats(), "read": _LaneStats()}
+
+    async def write(self, fn: Callable, *args, **kwargs):
+        return await self._run("write", self._writer, fn, *args, **kwargs)
+
+    async def read(self, fn: Callable, *args, **kwargs):
+        return await self._run("read", self._readers, fn, *args, **kwargs)
+
+    async def _run(self, lane: str, pool: ThreadPoolExecutor, fn: Callable, *args, **kwargs):
+        stats = self._stats[lane]
+        enqueued = time.perf_counter()
+        with stats._lock:
+            stats.queued += 1
+
+        def timed():
+            started = time.perf_counter()
+            with stats._lock:
+                stats.queued -= 1
+                stats.running += 1
+            ok = False
+            try:
+                result = fn(*args, **kwargs)
+                ok = True
+                return result
+            finally:
+                finished = time.perf_counter()
+                wait, run = started - enqueued, finished - started
+                with stats._lock:
+                    stats.running -= 1
+                    if ok:
+                        stats.completed += 1
+                    else:
+                        stats.failed += 1
+                    stats.total_wait += wait
+                    stats.total_run += run
+                    stats.max_wait = max(stats.max_wait, wait)
+                    stats.max_run = max(stats.max_run, run)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(pool, timed)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {lane: s.snapshot() for lane, s in self._stats.items()}
+
+    def shutdown(self):
+        self._writer.shutdown(wait=True)
+        self._readers.shutdown(wait=True)
@@ -0,0 +1,95 @@
+# app/core/fingerprints.py - Compact, vectorised membership over submission ids and hashes
+from typing import List, Optional
+
+import numpy as np
+
+ADD = 0
+CHANGED = 1
+UNCHANGED = 2
+
+
+def fingerprint(keys: List[str]) -> np.ndarray:
+    """
+    64-bit fingerprints of strings via Python's (SipHash) str hash. That hash
+    is salted per process, so fingerprints must never be persisted or
+    compared across processes. Collisions among 10^6 keys: ~3e-8.
+    """
+    return np.fromiter(map(hash, keys), dtype=np.int64, count=len(keys)).view(np.uint64)
+
+
+def _member(sorted_keys: np.ndarray, probe: np.ndarray) -> np.ndarray:
+    if not len(sorted_keys):
+        return np.zeros(len(probe), dtype=bool)
+    pos = np.searchsorted(sorted_keys, probe)
+    pos[pos == len(sorted_keys)] = 0
+    return sorted_keys[pos] == probe
+
+
+class _Builder:
+    def __init__(self, capacity: int):
+        self.ids = np.empty(capacity, dtype=np.uint64)
+        self.hashes = np.empty(capacity, dtype=np.uint64)
+        self.contents = np.empty(capacity, dtype=np.uint64)
+        self.size = 0
+
+    def add(self, ids: List[str], hashes: List[str], contents: List[str]):
+        end = self.size + len(ids)
+        if end > len(self.ids):
+            grow = max(end, 2 * len(self.ids))
+            self.ids = np.resize(self.ids, grow)
+            self.hashes = np.resize(self.hashes, grow)
+            self.contents = np.resize(self.contents, grow)
+        self.ids[self.size:end] = fingerprint(ids)
+        self.hashes[self.size:end] = fingerprint(hashes)
+        self.contents[self.size:end] = fingerprint(contents)
+        self.size = end
+
+    def build(self) -> "SubmissionFingerprints":
+        return SubmissionFingerprints(self.ids[:self.size], self.hashes[:self.size], self.contents[:self.size])
+
+
+class SubmissionFingerprints:
+    """
+    What the ledger holds, as sorted uint64 arrays: every submission_hash,
+    and every submission_id with the hash and content key stored under it.
+    classify() sorts a whole batch of candidate entries with a few
+    searchsorted calls.
+    """
+
+    def __init__(self, ids: np.ndarray, hashes: np.ndarray, contents: np.ndarray):
+        order = np.argsort(ids, kind="stable")
+        self.ids = ids[order]
+        self.hash_by_id = hashes[order]
+        self.content_by_id = contents[order]
+        self.hashes = np.sort(hashes)
+
+    @staticmethod
+    def builder(capacity: int) -> _Builder:
+        return _Builder(capacity)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def classify(self, ids: List[Optional[str]], hashes: List[str], contents: List[str]) -> np.ndarray:
+        """
+        Per entry: UNCHANGED if its hash is stored, or its id is stored with
+        the same content key (rows whose hash is not a content hash);
+        CHANGED if its id is stored with other content, else ADD. Entries
+        without an id can only be ADD or UNCHANGED.
+        """
+        probe_hashes = fingerprint(hashes)
+        probe_contents = fingerprint(contents)
+        has_id = np.fromiter((i is not None for i in ids), dtype=bool, count=len(ids))
+        probe_ids = fingerprint([i if i is not None else "" for i in ids])
+
+        result = np.full(len(hashes), ADD, dtype=np.int8)
+        if not len(self.ids):
+            return result
+        pos = np.searchsorted(self.ids, probe_ids)
+        pos[pos == len(self.ids)] = 0
+        id_found = has_id & (self.ids[pos] == probe_ids)
+        same = (self.hash_by_id[pos] == probe_hashes) | (self.content_by_id[pos] == probe_contents)
+        unchanged = _member(self.hashes, probe_hashes) | (id_found & same)
+        result[id_found] = CHANGED
+        result[unchanged] = UNCHANGED
+        return result
@@ -0,0 +1,120 @@
+# app/core/git_writer.py - Group-commit writer for the ledger's git history
+import os
+import threading
+import time
+import logging
+from concurrent.futures import Future
+from typing import List, Tuple
+
+logger = logging.getLogger("vow")
+
+
+class GroupCommitWriter:
+    """
+    Batches git commits for the ledger.
+
+    Entries are appended to their entity files right away by the caller.
+    This writer commits everything pending every `interval_ms` milliseconds
+    or every `max_entries` entries, whichever comes first. Each caller gets
+    a Future that resolves to the SHA of the commit that made its entries
+    durable.
+    """
+
+    def __init__(self, repo, interval_ms: int = 200, max_entries: int = 500):
+        self.repo = repo
+        self.interval = max(interval_ms, 0) / 1000.0
+        self.max_entries = max(max_entries, 1)
+
+        self._cond = threading.Condition()
+        self._pending: List[Tuple[List[str], List[str], Future]] = []
+        self._pending_entries = 0
+        self._oldest = 0.0
+        self._flush_requested = False
+        self._closed = False
+
+        self.commits = 0
+        self.entries_committed = 0
+
+        self._thread = threading.Thread(target=self._run, name="ledger-git-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, paths: List[str], submission_ids: List[str]) -> Future:
+        """Queue files touched by `submission_ids`; resolves to the commit SHA."""
+        future: Future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("GroupCommitWriter is closed")
+            if not self._pending:
+                self._oldest = time.monotonic()
+            self._pending.append(([os.path.abspath(p) for p in paths], list(submission_ids), future))
+            self._pending_entries += len(submission_ids)
+            self._cond.notify_all()
+        return future
+
+    def flush(self, timeout: float = None) -> None:
+        """Commit whatever is pending now and wait for it to land."""
+        with self._cond:
+            if not self._pending:
+                return
+            waiting = [f for _, _, f in self._pending]
+            self._flush_requested = True
+            self._cond.notify_all()
+        for f in waiting:
+            try:
+                f.result(timeout)
+            except Exception:
+                pass
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending and self._closed:
+                    return
+
+                # Wait out the batching window unless the batch is already full
+                while (self._pending_entries < self.max_entries
+                       and not self._flush_requested and not self._closed):
+                    remaining = self._oldest + self.interval - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+                batch = self._pending
+                self._pending = []
+                self._pending_entries = 0
+                self._flush_requested = False
+
+            self._commit(batch)
+
+    def _commit(self, batch: List[Tuple[List[str], List[str], Future]]):
+        paths = sorted({p for p_list, _, _ in batch for p in p_list})
+        ids = [sid for _, id_list, _ in batch for sid in id_list]
+
+        if len(ids) == 1:
+            message = f"Entry {ids[0]}"
+        else:
+            message = f"Entries {ids[0]}..{ids[-1]} ({len(ids)})\n\n" + "\n".join(ids)
+
+        try:
+            # `git add` via the CLI: IndexFile.add() chdirs the whole process,
+            # which is unsafe while other threads resolve relative paths
+            self.repo.git.add("--", *paths)
+            sha = str(self.repo.index.commit(message))
+        except Exception as e:
+            logger.error(f"❌ Git group commit failed for {len(ids)} entries: {e}")
+            for _, _, future in batch:
+                future.set_exception(e)
+            return
+
+        self.commits += 1
+        self.entries_committed += len(ids)
+        for _, _, future in batch:
+            future.set_result(sha)
@@ -0,0 +1,197 @@
+# app/core/github_import.py - Concurrent, cached fetch of the legacy Data/*.json files from GitHub
+import os
+import json
+import asyncio
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import httpx
+
+logger = logging.getLogger("vow")
+
+DATA_REPO = os.getenv("GITHUB_DATA_REPO", "Carrier0001/TheFirstCandle")
+DATA_BRANCH = os.getenv("GITHUB_DATA_BRANCH", "main")
+DATA_PATH = "Data"
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")
+GITHUB_RAW_URL = os.getenv("GITHUB_RAW_URL", "https://raw.githubusercontent.com")
+
+
+def git_blob_sha(data: bytes) -> str:
+    """The SHA git (and the contents API) reports for a file with these bytes."""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def _write_atomic(path: Path, data: bytes):
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class GitHubDataSource:
+    """
+    Fetches `Data/*.json` with bounded concurrency over one AsyncClient.
+
+    Bodies are kept on disk under their git blob SHA, so a file whose SHA
+    in the directory listing is unchanged is never downloaded again. The
+    listing itself and each raw file are requested with If-None-Match
+    using the last ETag. `state.json` also records the SHA each file had
+    when it was last imported, which lets an import skip unchanged files
+    entirely.
+    """
+
+    def __init__(self, cache_dir: Path, repo: str = DATA_REPO, branch: str = DATA_BRANCH,
+                 path: str = DATA_PATH, api_url: str = GITHUB_API_URL, raw_url: str = GITHUB_RAW_URL,
+                 concurrency: int = 8, timeout: float = 30.0, token: Optional[str] = None):
+        self.cache_dir = Path(cache_dir)
+        self.blob_dir = self.cache_dir / "blobs"
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.state_path = self.cache_dir / "state.json"
+        self.listing_url = f"{api_url.rstrip('/')}/repos/{repo}/contents/{path}?ref={branch}"
+        self.raw_base = f"{raw_url.rstrip('/')}/{repo}/{branch}/{path}"
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.headers = {
+            "User-Agent": "VowLedger-App/1.0",
+            "Accept": "application/vnd.github.v3+json"
+        }
+        token = token if token is not None else os.getenv("GITHUB_TOKEN")
+        if token:
+            self.headers["Authorization"] = f"Bearer {token}"
+        self._lock = asyncio.Lock()
+        self.state = self._load_state()
+
+    def _load_state(self) -> Dict:
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+        state.setdefault("listing", None)
+        state.setdefault("files", {})
+        return state
+
+    def _save_state(self):
+        _write_atomic(self.state_path, json.dumps(self.state, indent=2).encode("utf-8"))
+
+    def _blob_path(self, sha: str) -> Path:
+        return self.blob_dir / f"{sha}.json"
+
+    async def _list(self, client: httpx.AsyncClient) -> List[Dict]:
+        headers = dict(self.headers)
+        cached = self.state["listing"]
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        response = await client.get(self.listing_url, headers=headers)
+        if response.status_code == 304 and cached:
+            return cached["items"]
+        if response.status_code != 200:
+            raise httpx.HTTPStatusError(f"GitHub API error: {response.status_code}",
+                                        request=response.request, response=response)
+        items = [
+            {"name": item["name"], "sha": item.get("sha"), "download_url": item.get("download_url")}
+            for item in response.json() if item.get("name", "").endswith(".json")
+        ]
+        self.state["listing"] = {"etag": response.headers.get("etag"), "items": items}
+        return items
+
+    async def _fetch(self, client: httpx.AsyncClient, item: Dict, semaphore: asyncio.Semaphore,
+                     stats: Dict) -> bytes:
+        """Body of one listed file: from the blob cache when the SHA is known, else downloaded."""
+        name, sha = item["name"], item.get("sha")
+        if sha and self._blob_path(sha).exists():
+            stats["cache_hits"] += 1
+            return self._blob_path(sha).read_bytes()
+
+        known = self.state["files"].get(name, {})
+        headers = {"User-Agent": self.headers["User-Agent"]}
+        if known.get("etag") and self._blob_path(known.get("sha", "")).exists():
+            headers["If-None-Match"] = known["etag"]
+        async with semaphore:
+            response = await client.get(item.get("download_url") or f"{self.raw_base}/{name}", headers=headers)
+        if response.status_code == 304:
+            stats["not_modified"] += 1
+            return self._blob_path(known["sha"]).read_bytes()
+        if response.status_code != 200:
+            raise ValueError(f"HTTP {response.status_code}")
+
+        stats["downloads"] += 1
+        data = response.content
+        actual = git_blob_sha(data)
+        if sha and actual != sha:
+            # Raw CDN can lag the API; keep what we got under its real SHA so the next run retries
+            logger.warning(f"⚠️ {name}: downloaded blob {actual[:12]} but listing says {sha[:12]}")
+        _write_atomic(self._blob_path(actual), data)
+        self.state["files"][name] = dict(known, sha=actual, etag=response.headers.get("etag"))
+        return data
+
+    async def fetch(self, changed_only: bool = False,
+                    client: Optional[httpx.AsyncClient] = None) -> Dict:
+        """
+        List and fetch the data files. With `changed_only`, files whose blob
+        SHA matches the one recorded by mark_imported() are left out.
+
+        Returns {"files": [{"name", "sha", "data"}], "unchanged": [names],
+        "errors": [{"file", "reason"}], "listed", "downloads", "cache_hits",
+        "not_modified"}.
+        """
+        async with self._lock:
+            own_client = client is None
+            if own_client:
+                client = httpx.AsyncClient(
+                    timeout=self.timeout,
+                    limits=httpx.Limits(max_connections=self.concurrency)
+                )
+            try:
+                items = await self._list(client)
+                todo, unchanged = [], []
+                for item in items:
+                    imported = self.state["files"].get(item["name"], {}).get("imported_sha")
+                    if changed_only and item.get("sha") and imported == item["sha"]:
+                        unchanged.append(item["name"])
+                    else:
+                        todo.append(item)
+
+                semaphore = asyncio.Semaphore(self.concurrency)
+                stats = {"downloads": 0, "cache_hits": 0, "not_modified": 0}
+                bodies = await asyncio.gather(
+                    *(self._fetch(client, item, semaphore, stats) for item in todo),
+                    return_exceptions=True
+                )
+            finally:
+                if own_client:
+                    await client.aclose()
+            self._save_state()
+            self._prune(items)
+
+        files, errors = [], []
+        for item, body in zip(todo, bodies):
+            if isinstance(body, Exception):
+                errors.append({"file": item["name"], "reason": str(body) or type(body).__name__})
+                continue
+            try:
+                data = json.loads(body)
+            except ValueError as e:
+                errors.append({"file": item["name"], "reason": f"invalid JSON: {e}"})
+                continue
+            files.append({"name": item["name"], "sha": git_blob_sha(body), "data": data})
+
+        logger.info(f"📥 {len(items)} data files listed: {stats['downloads']} downloaded, "
+                    f"{stats['cache_hits'] + stats['not_modified']} from cache, {len(unchanged)} unchanged")
+        return {"files": files, "unchanged": unchanged, "errors": errors, "listed": len(items), **stats}
+
+    def _prune(self, items: List[Dict]):
+        """Drop cached blobs that neither the listing nor the state refers to any more."""
+        keep = {item.get("sha") for item in items}
+        keep.update(f.get("sha") for f in self.state["files"].values())
+        for path in self.blob_dir.glob("*.json"):
+            if path.stem not in keep:
+                path.unlink(missing_ok=True)
+
+    def mark_imported(self, files: Iterable[Dict]):
+        """Record that these fetched files were imported, so unchanged ones are skipped next time."""
+        for f in files:
+            self.state["files"].setdefault(f["name"], {})["imported_sha"] = f["sha"]
+        self._save_state()
@@ -0,0 +1,67 @@
+# app/core/legacy.py - Legacy Data/*.json entries -> ledger submissions
+import hashlib
+import uuid
+from datetime import datetime
+from typing import Dict
+
+
+def is_empty_entry(entry: Dict) -> bool:
+    """Entries with no harm, no surplus and no description are not imported."""
+    return (entry.get("harm_ly", 0) == 0 and
+            entry.get("surplus_ly", 0) == 0 and
+            not entry.get("description"))
+
+
+def _content_key(submission_id, entity_id, title, description, year, life_loss, financial_loss) -> str:
+    return (f"legacy-v2\x1f{entity_id}\x1f{submission_id}\x1f{year}\x1f{title}\x1f{description}\x1f"
+            f"{float(life_loss or 0)!r}\x1f{float(financial_loss or 0)!r}")
+
+
+def legacy_content_key(entity_id: str, entity_name: str, entry: Dict) -> str:
+    """
+    The submission fields a legacy entry becomes and the ledger stores
+    unchanged, joined with the ASCII unit separator (cheaper than canonical
+    JSON on large previews). stored_content_key() rebuilds it from a row.
+    """
+    get = entry.get
+    return _content_key(get("entry_id", ""), entity_id, f"{entity_name} - {get('incident_type', 'Incident')}",
+                        get("description", ""), get("year", 2025),
+                        abs(get("harm_ly", 0)), abs(get("harm_ecy", 0)))
+
+
+def stored_content_key(row) -> str:
+    """legacy_content_key() of a submissions row, for rows whose hash predates it."""
+    return _content_key(row["submission_id"], row["entity_id"], row["title"], row["description"],
+                        row["incident_year"], row["life_loss"], row["financial_loss"])
+
+
+def content_hash(key: str) -> str:
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def legacy_submission_hash(entity_id: str, entity_name: str, entry: Dict) -> str:
+    """
+    Deterministic submission_hash for a legacy entry: the same entry always
+    hashes the same, so re-imports are recognised as duplicates.
+    """
+    return content_hash(legacy_content_key(entity_id, entity_name, entry))
+
+
+def legacy_submission(entity_id: str, entity_name: str, entry: Dict,
+                      submitter: str = "web_import") -> Dict:
+    """Build the submission dict DistributedLedger expects from one legacy entry."""
+    return {
+        "submission_id": entry.get("entry_id", str(uuid.uuid4())),
+        "submission_hash": legacy_submission_hash(entity_id, entity_name, entry),
+        "entity_id": entity_id,
+        "entity_name": entity_name,
+        "title": f"{entity_name} - {entry.get('incident_type', 'Incident')}",
+        "description": entry.get("description", ""),
+        "incident_country": "Global",
+        "incident_year": entry.get("year", 2025),
+        "life_loss": abs(entry.get("harm_ly", 0)),
+        "financial_loss": abs(entry.get("harm_ecy", 0)),
+        "submitter_pubkey_hash": submitter,
+        "status": "APPROVED",
+        "created_at": entry.get("date_logged", datetime.now().isoformat())
+    }
@@ -0,0 +1,203 @@
+# app/core/local_import.py - Incremental import of the local Data/ folder, driven by a manifest
+import os
+import json
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict
+
+from app.core.legacy import is_empty_entry, legacy_submission, legacy_submission_hash
+
+logger = logging.getLogger("vow")
+
+MANIFEST_VERSION = 1
+MANIFEST_NAME = "local_import_manifest.json"    # kept next to ledger.db
+
+
+def load_manifest(path: Path) -> Dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {"version": MANIFEST_VERSION, "files": {}}
+    if manifest.get("version") != MANIFEST_VERSION:
+        logger.warning(f"⚠️ Ignoring import manifest {path} with version {manifest.get('version')}")
+        return {"version": MANIFEST_VERSION, "files": {}}
+    return manifest
+
+
+def save_manifest(path: Path, manifest: Dict):
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _entry_key(entry: Dict, entry_hash: str) -> str:
+    # Entries without an id can only be matched by content: an edit shows up as remove + add
+    return entry.get("entry_id") or f"hash:{entry_hash}"
+
+
+def _versioned_id(key: str, entry_hash: str) -> str:
+    """Submission id for a changed entry; the ledger never reuses an id."""
+    return f"{key}~{entry_hash[:12]}"
+
+
+def diff_data_dir(data_dir: Path, manifest: Dict) -> Dict:
+    """
+    Compare `data_dir/*.json` with the manifest. A file whose size and mtime
+    match is skipped without being read; one whose sha256 matches is skipped
+    without being parsed. Only the remaining files are diffed entry by entry.
+
+    Returns {"added", "changed", "removed": [ops], "files": {name: new
+    record, or None once deleted}, "changed_files", "unchanged_files",
+    "errors"}. Each op carries the entity, entry key and hash, and (for
+    changed/removed) the submission id it replaces.
+    """
+    data_dir = Path(data_dir)
+    previous = manifest["files"]
+    result = {"added": [], "changed": [], "removed": [], "files": {},
+              "changed_files": [], "unchanged_files": 0, "errors": []}
+    present = set()
+
+    for path in sorted(data_dir.glob("*.json")):
+        name = path.name
+        present.add(name)
+        old = previous.get(name)
+        stat = path.stat()
+        if old and old.get("size") == stat.st_size and old.get("mtime_ns") == stat.st_mtime_ns:
+            result["unchanged_files"] += 1
+            continue
+
+        raw = path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        if old and old.get("sha256") == digest:
+            # Touched but not modified: just refresh size/mtime
+            result["files"][name] = dict(old, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+            result["unchanged_files"] += 1
+            continue
+
+        try:
+            data = json.loads(raw)
+        except ValueError as e:
+            result["errors"].append({"file": name, "reason": f"invalid JSON: {e}"})
+            continue
+        if not isinstance(data, dict) or "entity_id" not in data or "entries" not in data:
+            result["errors"].append({"file": name, "reason": "missing entity_id/entries"})
+            continue
+
+        entity_id = data["entity_id"]
+        entity_name = data.get("entity_name", entity_id.replace('_', ' ').title())
+        old_entries = old["entries"] if old else {}
+        entries = {}
+        for entry in data["entries"]:
+            if is_empty_entry(entry):
+                continue
+            # The submission_hash it imports under, so manifest and ledger agree on what changed
+            entry_hash = legacy_submission_hash(entity_id, entity_name, entry)
+            key = _entry_key(entry, entry_hash)
+            if key in entries:
+                continue
+            before = old_entries.get(key)
+            op = {"file": name, "entity_id": entity_id, "entity_name": entity_name,
+                  "key": key, "hash": entry_hash, "entry": entry}
+            if before is None:
+                op["submission_id"] = key
+                result["added"].append(op)
+            elif before["hash"] != entry_hash:
+                op["submission_id"] = _versioned_id(key, entry_hash)
+                op["replaces"] = before["submission_id"]
+                result["changed"].append(op)
+            else:
+                op["submission_id"] = before["submission_id"]
+            entries[key] = {"hash": entry_hash, "submission_id": op["submission_id"]}
+
+        for key, before in old_entries.items():
+            if key not in entries:
+                result["removed"].append({"file": name, "entity_id": old.get("entity_id", entity_id),
+                                          "key": key, "replaces": before["submission_id"]})
+
+        result["changed_files"].append(name)
+        result["files"][name] = {
+            "entity_id": entity_id,
+            "sha256": digest,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "entries": entries
+        }
+
+    for name, old in previous.items():
+        if name not in present:
+            for key, before in old["entries"].items():
+                result["removed"].append({"file": name, "entity_id": old.get("entity_id"),
+                                          "key": key, "replaces": before["submission_id"]})
+            result["changed_files"].append(name)
+            result["files"][name] = None
+    return result
+
+
+async def apply_diff(ledger, diff: Dict, submitter: str = "local_import") -> Dict:
+    """
+    Apply a diff_data_dir() result to the ledger, which is append-only:
+
+    - added entries are submitted,
+    - changed entries are submitted under a versioned id and the old
+      version is withdrawn (rejected) if it is still pending,
+    - removed entries are withdrawn if still pending; reviewed ones stay.
+
+    Returns counts; entries whose id or hash the ledger already holds
+    come back as duplicates.
+    """
+    batch = [
+        dict(legacy_submission(op["entity_id"], op["entity_name"], op["entry"], submitter=submitter),
+             submission_id=op["submission_id"])
+        for op in diff["added"] + diff["changed"]
+    ]
+    receipts = await ledger.submit_entries(batch)
+    duplicates = sum(1 for r in receipts if r["status"] == "DUPLICATE")
+
+    withdrawn, kept = 0, 0
+    for op in diff["changed"] + diff["removed"]:
+        if await ledger.reject_submission(op["replaces"]):
+            withdrawn += 1
+        else:
+            kept += 1
+    return {
+        "submitted": len(receipts) - duplicates,
+        "duplicates": duplicates,
+        "withdrawn": withdrawn,
+        "kept_reviewed": kept
+    }
+
+
+def update_manifest(manifest: Dict, diff: Dict) -> Dict:
+    for name, record in diff["files"].items():
+        if record is None:
+            manifest["files"].pop(name, None)
+        else:
+            manifest["files"][name] = record
+    return manifest
+
+
+async def sync_data_dir(ledger, data_dir: Path, manifest_path: Path, dry_run: bool = False) -> Dict:
+    """Diff `data_dir` against the manifest, apply it and save the manifest. Returns a report."""
+    manifest = load_manifest(manifest_path)
+    diff = diff_data_dir(data_dir, manifest)
+    report = {
+        "files_unchanged": diff["unchanged_files"],
+        "files_changed": len(diff["changed_files"]),
+        "added": len(diff["added"]),
+        "changed": len(diff["changed"]),
+        "removed": len(diff["removed"]),
+        "errors": diff["errors"],
+        "dry_run": dry_run
+    }
+    if dry_run:
+        report["preview"] = [
+            {"op": kind, "file": op["file"], "key": op["key"]}
+            for kind in ("added", "changed", "removed") for op in diff[kind]
+        ]
+        return report
+    report.update(await apply_diff(ledger, diff))
+    save_manifest(manifest_path, update_manifest(manifest, diff))
+    return report
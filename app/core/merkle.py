@@ -0,0 +1,234 @@
+# app/core/merkle.py - Append-only Merkle tree over ledger entries (RFC 6962)
+import hashlib
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger("vow")
+
+GENESIS_HASH = "0" * 64
+
+
+def leaf_hash(data: bytes) -> bytes:
+    return hashlib.sha256(b"\x00" + data).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+def _split(n: int) -> int:
+    """Largest power of two strictly smaller than n (n > 1)."""
+    return 1 << ((n - 1).bit_length() - 1)
+
+
+def verify_inclusion(leaf: bytes, index: int, tree_size: int,
+                     path: List[bytes], root: bytes) -> bool:
+    """Check an audit path (RFC 9162 section 2.1.3.2). `leaf` is the leaf hash."""
+    if index >= tree_size:
+        return False
+    fn, sn, r = index, tree_size - 1, leaf
+    for p in path:
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            r = node_hash(p, r)
+            if not fn & 1:
+                while fn and not fn & 1:
+                    fn >>= 1
+                    sn >>= 1
+        else:
+            r = node_hash(r, p)
+        fn >>= 1
+        sn >>= 1
+    return sn == 0 and r == root
+
+
+def seal_hash(date: str, merkle_root: str, entries_count: int, previous_hash: str) -> str:
+    """Hash of one hash_chain row; the next row stores it as previous_hash."""
+    return hashlib.sha256(f"{date}|{merkle_root}|{entries_count}|{previous_hash}".encode()).hexdigest()
+
+
+class MerkleLog:
+    """
+    Incremental RFC 6962 Merkle tree persisted in the ledger database.
+
+    `merkle_leaves` holds one leaf per entry (the hash of its JSONL line),
+    `merkle_nodes` every complete subtree as (level, index) -> hash. Those
+    nodes never change once written, so an append only touches the
+    O(log n) frontier, and roots and audit paths for any past tree size
+    are assembled from stored nodes.
+
+    The first append of a new UTC day seals the previous day's root into
+    `hash_chain`; each sealed row links to the hash of the row before it.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self._init_tables()
+
+    def _init_tables(self):
+        with self.db.writer() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS merkle_leaves (
+                    leaf_index INTEGER PRIMARY KEY,
+                    submission_id TEXT UNIQUE NOT NULL,
+                    leaf_hash TEXT NOT NULL,
+                    day TEXT NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS merkle_nodes (
+                    level INTEGER NOT NULL,
+                    idx INTEGER NOT NULL,
+                    hash TEXT NOT NULL,
+                    PRIMARY KEY (level, idx)
+                ) WITHOUT ROWID
+            """)
+            # Same layout as create_ledger.py; entries_count is the tree size the root covers
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS hash_chain (
+                    day_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    date TEXT NOT NULL UNIQUE,
+                    merkle_root TEXT NOT NULL,
+                    entries_count INTEGER,
+                    previous_hash TEXT
+                )
+            """)
+
+    # ---------- appending (inside the caller's write transaction) ----------
+
+    def size(self, conn) -> int:
+        # Leaves are dense from 0 and leaf_index is the rowid: one B-tree seek, not a scan
+        return conn.execute("SELECT IFNULL(MAX(leaf_index) + 1, 0) FROM merkle_leaves").fetchone()[0]
+
+    def append(self, conn, records: List[Tuple[str, bytes]]) -> List[int]:
+        """Add leaves for (submission_id, jsonl_line) pairs; returns their leaf indexes."""
+        if not records:
+            return []
+        today = datetime.now(timezone.utc).date().isoformat()
+        n = self.size(conn)
+        if n:
+            last_day = conn.execute(
+                "SELECT day FROM merkle_leaves WHERE leaf_index = ?", (n - 1,)
+            ).fetchone()[0]
+            if last_day < today:
+                self._seal(conn, last_day, n)
+
+        leaves, nodes, placed = [], [], []
+        written: Dict[Tuple[int, int], bytes] = {}
+        for submission_id, data in records:
+            h = leaf_hash(data)
+            leaves.append((n, submission_id, h.hex(), today))
+            placed.append(n)
+
+            # Climb while the new node is a right child, completing subtrees
+            level, idx = 0, n
+            written[(0, idx)] = h
+            nodes.append((0, idx, h.hex()))
+            while idx & 1:
+                left = written.get((level, idx - 1)) or self._node(conn, level, idx - 1)
+                h = node_hash(left, h)
+                level, idx = level + 1, idx >> 1
+                written[(level, idx)] = h
+                nodes.append((level, idx, h.hex()))
+            n += 1
+
+        conn.executemany(
+            "INSERT INTO merkle_leaves (leaf_index, submission_id, leaf_hash, day) VALUES (?, ?, ?, ?)",
+            leaves
+        )
+        conn.executemany("INSERT INTO merkle_nodes (level, idx, hash) VALUES (?, ?, ?)", nodes)
+        return placed
+
+    def seal_through(self, conn, today: Optional[str] = None) -> int:
+        """Seal the last day with entries if it is over. Returns rows written (0 or 1)."""
+        today = today or datetime.now(timezone.utc).date().isoformat()
+        n = self.size(conn)
+        if not n:
+            return 0
+        last_day = conn.execute("SELECT day FROM merkle_leaves WHERE leaf_index = ?", (n - 1,)).fetchone()[0]
+        if last_day >= today:
+            return 0
+        return self._seal(conn, last_day, n)
+
+    def _seal(self, conn, day: str, tree_size: int) -> int:
+        if conn.execute("SELECT 1 FROM hash_chain WHERE date = ?", (day,)).fetchone():
+            return 0
+        prev = conn.execute(
+            "SELECT date, merkle_root, entries_count, previous_hash FROM hash_chain ORDER BY day_id DESC LIMIT 1"
+        ).fetchone()
+        previous_hash = seal_hash(*prev) if prev else GENESIS_HASH
+        root = self._root(conn, tree_size).hex()
+        conn.execute(
+            "INSERT INTO hash_chain (date, merkle_root, entries_count, previous_hash) VALUES (?, ?, ?, ?)",
+            (day, root, tree_size, previous_hash)
+        )
+        logger.info(f"🔒 Sealed Merkle root for {day}: {root[:16]}… ({tree_size} entries)")
+        return 1
+
+    # ---------- reading ----------
+
+    def _node(self, conn, level: int, idx: int) -> bytes:
+        row = conn.execute("SELECT hash FROM merkle_nodes WHERE level = ? AND idx = ?", (level, idx)).fetchone()
+        if row is None:
+            raise ValueError(f"Missing Merkle node ({level}, {idx})")
+        return bytes.fromhex(row[0])
+
+    def _subtree(self, conn, start: int, size: int) -> bytes:
+        """MTH of leaves [start, start + size)."""
+        if size & (size - 1) == 0 and start % size == 0:
+            level = size.bit_length() - 1
+            return self._node(conn, level, start >> level)
+        k = _split(size)
+        return node_hash(self._subtree(conn, start, k), self._subtree(conn, start + k, size - k))
+
+    def _root(self, conn, tree_size: int) -> bytes:
+        if tree_size == 0:
+            return hashlib.sha256(b"").digest()
+        return self._subtree(conn, 0, tree_size)
+
+    def _path(self, conn, m: int, start: int, size: int) -> List[bytes]:
+        if size == 1:
+            return []
+        k = _split(size)
+        if m < k:
+            return self._path(conn, m, start, k) + [self._subtree(conn, start + k, size - k)]
+        return self._path(conn, m - k, start + k, size - k) + [self._subtree(conn, start, k)]
+
+    def root(self) -> Dict:
+        with self.db.reader() as conn:
+            n = self.size(conn)
+            return {"tree_size": n, "root": self._root(conn, n).hex()}
+
+    def inclusion_proof(self, submission_id: str, tree_size: Optional[int] = None) -> Optional[Dict]:
+        """Audit path for one entry against the root of `tree_size` (default: current)."""
+        with self.db.reader() as conn:
+            row = conn.execute(
+                "SELECT leaf_index, leaf_hash, day FROM merkle_leaves WHERE submission_id = ?",
+                (submission_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            n = self.size(conn)
+            tree_size = n if tree_size is None else tree_size
+            if not row["leaf_index"] < tree_size <= n:
+                raise ValueError(f"tree_size must be in ({row['leaf_index']}, {n}]")
+            path = self._path(conn, row["leaf_index"], 0, tree_size)
+            return {
+                "submission_id": submission_id,
+                "leaf_index": row["leaf_index"],
+                "leaf_hash": row["leaf_hash"],
+                "day": row["day"],
+                "tree_size": tree_size,
+                "root": self._root(conn, tree_size).hex(),
+                "audit_path": [p.hex() for p in path]
+            }
+
+    def hash_chain(self, limit: int = 100) -> List[Dict]:
+        with self.db.reader() as conn:
+            rows = conn.execute(
+                "SELECT day_id, date, merkle_root, entries_count, previous_hash FROM hash_chain ORDER BY day_id DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+            return [dict(r) for r in rows]
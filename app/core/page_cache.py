@@ -0,0 +1,137 @@
+# app/core/page_cache.py - Rendered-page cache keyed by route and ledger version
+import gzip
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse
+
+logger = logging.getLogger("vow")
+
+
+class CachedPage:
+    __slots__ = ("version", "etag", "body", "gzip_body", "media_type")
+
+    def __init__(self, version: int, etag: str, body: bytes, gzip_body: Optional[bytes], media_type: str):
+        self.version = version
+        self.etag = etag
+        self.body = body
+        self.gzip_body = gzip_body
+        self.media_type = media_type
+
+
+class PageCache:
+    """
+    LRU of rendered pages. An entry is only served while the ledger version
+    it was rendered at is still current, so any write to `submissions`
+    (which bumps the version) invalidates every page at once. ETags are
+    derived from build + version + key, so clients revalidate with
+    If-None-Match and get a 304 without the page being rendered or sent,
+    and a deploy that changes templates (a new `build`) invalidates them.
+    """
+
+    def __init__(self, max_entries: int = 256, compress: bool = True, compress_min_bytes: int = 1024,
+                 build: str = ""):
+        self.max_entries = max(max_entries, 1)
+        self.build = build
+        self.compress = compress
+        self.compress_min_bytes = compress_min_bytes
+        self._pages: "OrderedDict[str, CachedPage]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def etag_for(self, key: str, version: int) -> str:
+        return f'W/"{self.build}-{version}-{hashlib.sha1(key.encode()).hexdigest()[:12]}"'
+
+    def _key(self, key: str) -> str:
+        return f"{self.build}|{key}"
+
+    def get(self, key: str, version: int) -> Optional[CachedPage]:
+        key = self._key(key)
+        page = self._pages.get(key)
+        if page is None or page.version != version:
+            return None
+        self._pages.move_to_end(key)
+        return page
+
+    def put(self, key: str, version: int, body: bytes, media_type: str) -> CachedPage:
+        gzip_body = None
+        if self.compress and len(body) >= self.compress_min_bytes:
+            gzip_body = gzip.compress(body, compresslevel=6)
+        page = CachedPage(version, self.etag_for(key, version), body, gzip_body, media_type)
+        key = self._key(key)
+        self._pages[key] = page
+        self._pages.move_to_end(key)
+        while len(self._pages) > self.max_entries:
+            self._pages.popitem(last=False)
+        return page
+
+    @staticmethod
+    def _headers(etag: str):
+        return {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+
+    def _not_modified(self, request: Request, etag: str) -> Optional[Response]:
+        if_none_match = request.headers.get("if-none-match", "")
+        if etag in (tag.strip() for tag in if_none_match.split(",")) or if_none_match.strip() == "*":
+            self.not_modified += 1
+            return Response(status_code=304, headers=self._headers(etag))
+        return None
+
+    def respond(self, request: Request, page: CachedPage) -> Response:
+        headers = self._headers(page.etag)
+        not_modified = self._not_modified(request, page.etag)
+        if not_modified is not None:
+            return not_modified
+        if page.gzip_body is not None and "gzip" in request.headers.get("accept-encoding", ""):
+            headers["Content-Encoding"] = "gzip"
+            return Response(page.gzip_body, media_type=page.media_type, headers=headers)
+        return Response(page.body, media_type=page.media_type, headers=headers)
+
+    async def _tee(self, key: str, version: int, response: StreamingResponse) -> AsyncIterator[bytes]:
+        """Pass a streamed body through, caching it once it has been sent completely."""
+        chunks = []
+        async for chunk in response.body_iterator:
+            if not isinstance(chunk, bytes):
+                chunk = chunk.encode(response.charset)
+            chunks.append(chunk)
+            yield chunk
+        self.put(key, version, b"".join(chunks), response.media_type)
+
+    async def serve(self, request: Request, key: str, version: int,
+                    build: Callable[[], Awaitable[Response]]) -> Response:
+        """
+        Serve `key` from cache, or render it with `build()` and cache 200
+        responses. Streamed responses are passed through as they render and
+        cached when complete (a client that disconnects early caches nothing).
+        """
+        page = self.get(key, version)
+        if page is not None:
+            self.hits += 1
+            return self.respond(request, page)
+
+        # The ETag only depends on build, key and version, so revalidation never needs a render
+        etag = self.etag_for(key, version)
+        not_modified = self._not_modified(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        self.misses += 1
+        response = await build()
+        if response.status_code != 200:
+            return response
+        if isinstance(response, StreamingResponse):
+            return StreamingResponse(self._tee(key, version, response), media_type=response.media_type,
+                                     headers=self._headers(etag))
+        page = self.put(key, version, bytes(response.body), response.media_type)
+        return self.respond(request, page)
+
+    def stats(self):
+        return {
+            "entries": len(self._pages),
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified
+        }
@@ -0,0 +1,80 @@
+# app/core/pages.py - Template contexts for the public pages, shared by main.py and build-static
+from datetime import datetime
+from typing import Dict, Optional
+
+
+async def home_context(ledger) -> Dict:
+    """index.html: per-entity approved totals, most harmful first."""
+    entities_list = []
+    for data in await ledger.entity_summaries(status="APPROVED"):
+        entities_list.append({
+            "entity_id": data["entity_id"],
+            "entity_name": data["entity_name"],
+            "lifetime": {
+                "outstanding_ly": data["total_harm_ly"],
+                "outstanding_ecy": data["total_harm_ecy"]
+            },
+            "total_entries": data["total_entries"],
+            "measurement_date": str(data["last_entry"])[:10] if data["last_entry"] else datetime.now().strftime("%Y-%m-%d"),
+            "has_systemic": False
+        })
+
+    # Sort by harm (most harmful first)
+    entities_list.sort(key=lambda x: x["lifetime"]["outstanding_ly"], reverse=True)
+    return {"entities": entities_list, "current_date": datetime.now().strftime("%B %d, %Y")}
+
+
+def entry_summary(sub: Dict) -> Dict:
+    """One testimony as listed on the entity page."""
+    return {
+        "entry_id": sub.get('submission_id', ''),
+        "year": sub.get('incident_year', 0),
+        "description": sub.get('description', ''),
+        "harm_ly": sub.get('life_loss', 0),
+        "harm_ecy": sub.get('financial_loss', 0.0),
+        "intent_type": "NEGLIGENCE",
+        "confidence": "MEDIUM",
+        "evidence_hashes": []
+    }
+
+
+async def entity_context(ledger, entity_id: str, cursor: Optional[str], page_size: int) -> Optional[Dict]:
+    """
+    entity.html for one page of testimonies (newest year first), with totals
+    from entity_aggregates. None when the entity has no approved entries.
+    The caller adds `first_url` / `next_url` for its own URL scheme; `rows`
+    are the page's full submission rows.
+    """
+    summary = await ledger.entity_summary(entity_id)
+    if not summary:
+        return None
+
+    page = await ledger.query_submissions(status="APPROVED", entity_id=entity_id, sort="year",
+                                          cursor=cursor, limit=page_size)
+    return {
+        "entity": {
+            "entity_id": entity_id,
+            "entity_name": summary["entity_name"] or 'Unknown',
+            "entity_state": "ACTIVE",
+            "measurement_date": datetime.now().strftime("%Y-%m-%d"),
+            "total_entries": summary["total_entries"],
+            "total_harm_ly": summary["total_harm_ly"],
+            "total_harm_ecy": summary["total_harm_ecy"],
+            "entries": [entry_summary(sub) for sub in page["items"]],
+            "aggregated_entries": [],
+            "first_url": None,
+            "next_url": None
+        },
+        "rows": page["items"],
+        "next_cursor": page["next_cursor"]
+    }
+
+
+def entry_context(submission: Dict) -> Dict:
+    """entry_view.html for one approved submission."""
+    entry_data = dict(entry_summary(submission), external_links=[])
+    entity_data = {
+        "entity_id": submission.get('entity_id', ''),
+        "entity_name": submission.get('entity_name', 'Unknown')
+    }
+    return {"entry": entry_data, "entity": entity_data}
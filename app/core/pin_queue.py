@@ -0,0 +1,194 @@
+# app/core/pin_queue.py - Background, deduplicating IPFS pin queue
+import time
+import random
+import hashlib
+import threading
+import logging
+from collections import deque
+from pathlib import Path
+from typing import Dict, Optional
+
+import httpx
+
+logger = logging.getLogger("vow")
+
+
+class PinQueue:
+    """
+    Pins entity files to IPFS off the request path.
+
+    Pins are keyed by entity: asking to pin an entity that is already
+    waiting just replaces it, so a burst of writes to one file becomes a
+    single pin of its latest version. A fixed number of worker threads
+    talk to the IPFS HTTP API (`/api/v0/add`), retrying failures with
+    exponential backoff. Each successful pin is recorded in `ipfs_pins`
+    as (entity_id, content sha256) -> CID, and versions that are already
+    recorded are never uploaded again.
+    """
+
+    def __init__(self, api_url: str, db, concurrency: int = 2, retries: int = 5,
+                 backoff_ms: int = 500, timeout: float = 60.0, client: Optional[httpx.Client] = None):
+        self.api_url = api_url.rstrip("/")
+        self.db = db
+        self.retries = max(retries, 0)
+        self.backoff = backoff_ms / 1000.0
+        self.client = client or httpx.Client(base_url=self.api_url, timeout=timeout)
+
+        self._cond = threading.Condition()
+        self._pending: Dict[str, Path] = {}
+        self._order: deque = deque()
+        self._in_flight = set()
+        self._closed = False
+
+        self.pinned = 0
+        self.skipped = 0
+        self.failed = 0
+
+        self._init_table()
+        self._workers = [
+            threading.Thread(target=self._run, name=f"ipfs-pin-{i}", daemon=True)
+            for i in range(max(concurrency, 1))
+        ]
+        for w in self._workers:
+            w.start()
+
+    def _init_table(self):
+        with self.db.writer() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS ipfs_pins (
+                    entity_id TEXT NOT NULL,
+                    content_sha256 TEXT NOT NULL,
+                    byte_length INTEGER NOT NULL,
+                    cid TEXT NOT NULL,
+                    pinned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (entity_id, content_sha256)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_ipfs_pins_entity ON ipfs_pins(entity_id, pinned_at)")
+
+    # ---------- producer side ----------
+
+    def enqueue(self, entity_id: str, path: Path):
+        with self._cond:
+            if self._closed:
+                return
+            if entity_id not in self._pending:
+                self._order.append(entity_id)
+            self._pending[entity_id] = path
+            self._cond.notify()
+
+    def enqueue_all(self, entities_dir: Path):
+        """Queue every entity file; versions already pinned are skipped cheaply."""
+        for path in sorted(entities_dir.glob("*.json")):
+            self.enqueue(path.stem, path)
+
+    def latest_cid(self, entity_id: str) -> Optional[str]:
+        with self.db.reader() as conn:
+            row = conn.execute(
+                "SELECT cid FROM ipfs_pins WHERE entity_id = ? ORDER BY pinned_at DESC, rowid DESC LIMIT 1",
+                (entity_id,)
+            ).fetchone()
+            return row["cid"] if row else None
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return {
+                "queued": len(self._pending),
+                "in_flight": len(self._in_flight),
+                "pinned": self.pinned,
+                "skipped": self.skipped,
+                "failed": self.failed
+            }
+
+    # ---------- worker side ----------
+
+    def _next(self):
+        """Pop the oldest waiting entity that no other worker is pinning."""
+        with self._cond:
+            while True:
+                if self._closed:
+                    return None
+                for _ in range(len(self._order)):
+                    entity_id = self._order.popleft()
+                    if entity_id in self._in_flight:
+                        self._order.append(entity_id)
+                        continue
+                    path = self._pending.pop(entity_id)
+                    self._in_flight.add(entity_id)
+                    return entity_id, path
+                self._cond.wait()
+
+    def _run(self):
+        while True:
+            job = self._next()
+            if job is None:
+                return
+            entity_id, path = job
+            try:
+                self._pin(entity_id, path)
+            finally:
+                with self._cond:
+                    self._in_flight.discard(entity_id)
+                    if entity_id in self._pending:
+                        self._cond.notify()
+
+    def _pin(self, entity_id: str, path: Path):
+        for attempt in range(self.retries + 1):
+            try:
+                # Re-read on every attempt so a retry pins the newest version
+                content = path.read_bytes()
+                digest = hashlib.sha256(content).hexdigest()
+                if self._already_pinned(entity_id, digest):
+                    self._count("skipped")
+                    return
+
+                response = self.client.post(
+                    "/api/v0/add",
+                    params={"pin": "true"},
+                    files={"file": (path.name, content)}
+                )
+                response.raise_for_status()
+                cid = response.json()["Hash"]
+
+                with self.db.writer() as conn:
+                    conn.execute("""
+                        INSERT OR REPLACE INTO ipfs_pins (entity_id, content_sha256, byte_length, cid)
+                        VALUES (?, ?, ?, ?)
+                    """, (entity_id, digest, len(content), cid))
+                self._count("pinned")
+                return
+            except Exception as e:
+                if attempt >= self.retries or self._closed:
+                    self._count("failed")
+                    logger.warning(f"⚠️ IPFS pin failed for {entity_id} after {attempt + 1} attempts: {e}")
+                    return
+                delay = self.backoff * (2 ** attempt) * (0.5 + random.random())
+                time.sleep(delay)
+
+    def _count(self, counter: str):
+        with self._cond:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _already_pinned(self, entity_id: str, digest: str) -> bool:
+        with self.db.reader() as conn:
+            return conn.execute(
+                "SELECT 1 FROM ipfs_pins WHERE entity_id = ? AND content_sha256 = ?",
+                (entity_id, digest)
+            ).fetchone() is not None
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        for w in self._workers:
+            w.join(timeout=5)
+        self.client.close()
+
+
+def probe_ipfs(api_url: str, timeout: float = 2.0) -> bool:
+    """True if an IPFS HTTP API answers at `api_url`."""
+    try:
+        response = httpx.post(f"{api_url.rstrip('/')}/api/v0/version", timeout=timeout)
+        return response.status_code == 200
+    except Exception:
+        return False
@@ -0,0 +1,65 @@
+# app/core/readiness.py - Per-backend startup state and startup timings
+import time
+import threading
+import logging
+from typing import Dict, Optional
+
+logger = logging.getLogger("vow")
+
+# Set when this module is first imported, i.e. early in `import main`
+PROCESS_IMPORT_STARTED = time.perf_counter()
+
+STARTING = "starting"
+READY = "ready"
+UNAVAILABLE = "unavailable"
+FAILED = "failed"
+
+
+class Readiness:
+    """
+    State of each ledger backend ("sqlite", "git", "merkle", "ipfs", ...).
+    Only `required` backends gate readiness; optional ones are reported so
+    operators can see what is still connecting.
+    """
+
+    def __init__(self, required=("sqlite",)):
+        self.required = tuple(required)
+        self._lock = threading.Lock()
+        self._backends: Dict[str, Dict] = {}
+        self._events: Dict[str, threading.Event] = {}
+        self.timings: Dict[str, Optional[float]] = {"first_byte_ms": None}
+
+    def _event(self, name: str) -> threading.Event:
+        with self._lock:
+            return self._events.setdefault(name, threading.Event())
+
+    def set(self, name: str, state: str, detail: Optional[str] = None):
+        since_import = round((time.perf_counter() - PROCESS_IMPORT_STARTED) * 1000, 1)
+        with self._lock:
+            self._backends[name] = {"state": state, "since_import_ms": since_import, "detail": detail}
+        if state == READY:
+            self._event(name).set()
+        if state in (READY, FAILED):
+            logger.info(f"{'✅' if state == READY else '❌'} {name} {state} after {since_import} ms"
+                        + (f": {detail}" if detail else ""))
+
+    def state(self, name: str) -> Optional[str]:
+        with self._lock:
+            backend = self._backends.get(name)
+            return backend["state"] if backend else None
+
+    def wait(self, name: str, timeout: Optional[float] = None) -> bool:
+        return self._event(name).wait(timeout)
+
+    def is_ready(self) -> bool:
+        return all(self.state(name) == READY for name in self.required)
+
+    def mark_first_byte(self):
+        if self.timings["first_byte_ms"] is None:
+            self.timings["first_byte_ms"] = round((time.perf_counter() - PROCESS_IMPORT_STARTED) * 1000, 1)
+            logger.info(f"⏱️ Import to first byte: {self.timings['first_byte_ms']} ms")
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            backends = {name: dict(b) for name, b in self._backends.items()}
+        return {"ready": self.is_ready(), "backends": backends, "timings": dict(self.timings)}
@@ -0,0 +1,317 @@
+# app/core/rebuild.py - Rebuild ledger.db from the entity JSONL files
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.core.aggregates import init_aggregates
+from app.core.database import (_INSERT_SUBMISSION, _submission_row, create_submissions_table,
+                               create_submission_indexes, create_version_counter,
+                               create_change_log)
+from app.core.merkle import MerkleLog, leaf_hash
+from app.core.search import init_search
+from app.core.sqlite_db import LedgerDB
+
+logger = logging.getLogger("vow")
+
+# Tables that cannot be derived from the entity files; carried over when the old db is readable
+_CARRIED_TABLES = ("merkle_leaves", "merkle_nodes", "hash_chain", "ipfs_pins")
+
+
+def parse_entity_file(path: str) -> Dict:
+    """
+    Parse one entity file (runs in a worker process). Returns its submission
+    records in file order, jury events, RFC 6962 leaf hashes of the record
+    lines and the sha256 of the bytes that were read.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    records, events, leaves, bad = [], [], {}, 0
+    for raw in data.splitlines(keepends=True):
+        if not raw.endswith(b"\n"):
+            bad += 1            # torn final line
+            continue
+        try:
+            record = json.loads(raw)
+        except ValueError:
+            bad += 1
+            continue
+        if not isinstance(record, dict) or not record.get("submission_id"):
+            bad += 1
+        elif "event" in record:
+            events.append(record)
+        else:
+            records.append(record)
+            leaves.setdefault(record["submission_id"], leaf_hash(raw).hex())
+    return {
+        "path": path,
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "records": records,
+        "events": events,
+        "leaves": leaves,
+        "bad_lines": bad
+    }
+
+
+def _file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _remove_db(path: Path):
+    for p in (path, path.with_name(path.name + "-wal"), path.with_name(path.name + "-shm")):
+        if p.exists():
+            p.unlink()
+
+
+def _carry_over(old_path: Path, db: LedgerDB) -> Dict[str, int]:
+    """Copy non-derivable tables from the old ledger.db if it can still be read."""
+    copied = {}
+    if not old_path.exists():
+        return copied
+    try:
+        old = sqlite3.connect(f"file:{old_path}?mode=ro", uri=True)
+        old.row_factory = sqlite3.Row
+        old_tables = {r[0] for r in old.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    except sqlite3.Error as e:
+        logger.warning(f"⚠️ Old ledger.db unreadable, Merkle history not carried over: {e}")
+        return copied
+    try:
+        with db.reader() as conn:
+            new_tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        with db.writer() as conn:
+            for table in _CARRIED_TABLES:
+                if table not in old_tables or table not in new_tables:
+                    continue
+                try:
+                    rows = old.execute(f"SELECT * FROM {table}").fetchall()
+                except sqlite3.Error as e:
+                    logger.warning(f"⚠️ Could not read {table} from old ledger.db: {e}")
+                    continue
+                if rows:
+                    cols = rows[0].keys()
+                    conn.executemany(
+                        f"INSERT OR IGNORE INTO {table} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})",
+                        [tuple(r) for r in rows]
+                    )
+                copied[table] = len(rows)
+    finally:
+        old.close()
+    return copied
+
+
+# Jury outcome per row; entity files only carry it for decisions made since jury events were logged
+_REVIEW_COLUMNS = ("status", "intent_type", "life_loss", "financial_loss")
+
+
+def _old_reviews(old_path: Path) -> Optional[Dict[str, Dict]]:
+    """
+    {submission_id: {status, intent_type, life_loss, financial_loss}} from
+    the old ledger.db, or None if there is none or it cannot be read.
+    """
+    if not old_path.exists():
+        return None
+    try:
+        old = sqlite3.connect(f"file:{old_path}?mode=ro", uri=True)
+        old.row_factory = sqlite3.Row
+        try:
+            columns = {r["name"] for r in old.execute("PRAGMA table_info(submissions)")}
+            intent = "intent_type" if "intent_type" in columns else "'NEGLIGENCE' AS intent_type"
+            return {
+                r["submission_id"]: {c: r[c] for c in _REVIEW_COLUMNS}
+                for r in old.execute(f"SELECT submission_id, status, {intent}, life_loss, financial_loss FROM submissions")
+            }
+        finally:
+            old.close()
+    except sqlite3.Error as e:
+        logger.warning(f"⚠️ Old ledger.db unreadable, cannot check the rebuild against it: {e}")
+        return None
+
+
+def _listed(ids: List[str]) -> str:
+    return ", ".join(ids[:20]) + (f" (+{len(ids) - 20} more)" if len(ids) > 20 else "")
+
+
+def rebuild_ledger_db(data_dir: Path, workers: Optional[int] = None, swap: bool = True,
+                      allow_pending: bool = False) -> Dict:
+    """
+    Recreate ledger.db from `entities/*.json`:
+
+    1. parse the files in a process pool,
+    2. replay jury events and bulk-load every row in one transaction,
+       creating the secondary indexes, aggregates and FTS index afterwards.
+       Rows without a jury event (decided before events were logged) take
+       their status and reviewed values from the old db,
+    3. carry over Merkle/hash_chain/pin history from the old db if readable,
+    4. verify row counts, submission hashes, that no file changed meanwhile,
+       that carried Merkle leaves match the lines and that every submission
+       in the old db is still there with the same status and reviewed values,
+    5. swap the result in place (old db kept as ledger.db.bak-<timestamp>).
+
+    Without a readable old db, rows with no jury event cannot be told apart
+    from approvals that predate event logging, so they block the swap
+    unless `allow_pending` accepts them as PENDING_JURY.
+
+    The app should be stopped while this runs.
+    """
+    started = time.perf_counter()
+    data_dir = Path(data_dir)
+    db_path = data_dir / "ledger.db"
+    new_path = data_dir / "ledger.db.rebuild"
+    files = sorted(str(p) for p in (data_dir / "entities").glob("*.json"))
+
+    # 1. Parse
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parsed = list(pool.map(parse_entity_file, files, chunksize=max(1, len(files) // 64)))
+    parsed_at = time.perf_counter()
+
+    # 2. Merge in file order; first occurrence of an id or hash wins
+    old = _old_reviews(db_path)
+    decided = set()
+    rows: Dict[str, Dict] = {}
+    hashes, leaves = set(), {}
+    per_entity: Dict[str, int] = {}
+    duplicates = 0
+    for result in parsed:
+        for record in result["records"]:
+            sid, shash = record["submission_id"], record.get("submission_hash")
+            if sid in rows or shash in hashes:
+                duplicates += 1
+                continue
+            rows[sid] = {"entry": record, "status": "PENDING_JURY", "intent_type": "NEGLIGENCE"}
+            hashes.add(shash)
+            leaves[sid] = result["leaves"][sid]
+            per_entity[record["entity_id"]] = per_entity.get(record["entity_id"], 0) + 1
+        for event in result["events"]:
+            row = rows.get(event["submission_id"])
+            if row is None or row["status"] != "PENDING_JURY":
+                continue
+            decided.add(event["submission_id"])
+            if event["event"] == "APPROVED":
+                row["status"] = "APPROVED"
+                row["intent_type"] = event.get("intent_type", "NEGLIGENCE")
+                row["entry"] = dict(row["entry"], life_loss=event.get("life_loss", 0),
+                                    financial_loss=event.get("financial_loss", 0.0))
+            elif event["event"] == "REJECTED":
+                row["status"] = "REJECTED"
+
+    undecided = [sid for sid in rows if sid not in decided]
+    restored = 0
+    for sid in undecided:
+        review = (old or {}).get(sid)
+        if review is None or review["status"] == "PENDING_JURY":
+            continue
+        row = rows[sid]
+        row["status"] = review["status"]
+        row["intent_type"] = review["intent_type"] or "NEGLIGENCE"
+        row["entry"] = dict(row["entry"], life_loss=review["life_loss"], financial_loss=review["financial_loss"])
+        restored += 1
+
+    _remove_db(new_path)
+    db = LedgerDB(new_path, readers=1)
+    try:
+        with db.writer() as conn:
+            create_submissions_table(conn)
+            conn.executemany(_INSERT_SUBMISSION, (
+                _submission_row(dict(r["entry"], recorded_at=r["entry"].get("recorded_at") or r["entry"].get("created_at")),
+                                status=r["status"], intent_type=r["intent_type"])
+                for r in rows.values()
+            ))
+            create_submission_indexes(conn)
+            create_version_counter(conn)
+            create_change_log(conn)
+            init_aggregates(conn)
+            init_search(conn)
+        loaded_at = time.perf_counter()
+
+        # 3. History the files cannot reproduce
+        MerkleLog(db)
+        carried = _carry_over(db_path, db)
+
+        # 4. Verify
+        problems: List[str] = []
+        with db.reader() as conn:
+            total = conn.execute("SELECT COUNT(*) FROM submissions").fetchone()[0]
+            if total != len(rows):
+                problems.append(f"row count {total} != {len(rows)} parsed records")
+            for r in conn.execute("SELECT entity_id, COUNT(*) AS n FROM submissions GROUP BY entity_id"):
+                if per_entity.get(r["entity_id"]) != r["n"]:
+                    problems.append(f"{r['entity_id']}: {r['n']} rows != {per_entity.get(r['entity_id'])} records")
+            stored = {r[0]: r[1] for r in conn.execute("SELECT submission_id, submission_hash FROM submissions")}
+            bad_hashes = sum(1 for sid, r in rows.items() if stored.get(sid) != r["entry"].get("submission_hash"))
+            if bad_hashes:
+                problems.append(f"{bad_hashes} submission hashes differ from the entity files")
+            # Rows only the old db knows about would be lost by the swap
+            missing = sorted(old.keys() - stored.keys()) if old is not None else []
+            if missing:
+                problems.append(f"{len(missing)} of {len(old)} submissions in the old ledger.db "
+                                f"are not in the entity files: {_listed(missing)}")
+            # Jury outcomes must survive: same status and reviewed values as before
+            if old is not None:
+                differ = sorted(
+                    r["submission_id"] for r in conn.execute(
+                        "SELECT submission_id, status, intent_type, life_loss, financial_loss FROM submissions"
+                    )
+                    if r["submission_id"] in old and any(
+                        r[c] != old[r["submission_id"]][c] for c in _REVIEW_COLUMNS
+                        if c != "intent_type" or r["status"] == "APPROVED"
+                    )
+                )
+                if differ:
+                    problems.append(f"{len(differ)} submissions differ from the old ledger.db in status "
+                                    f"or reviewed values: {_listed(differ)}")
+            elif undecided and not allow_pending:
+                problems.append(f"{len(undecided)} submissions have no jury event and there is no readable "
+                                f"old ledger.db to take their status from (approvals made before events "
+                                f"were logged would be lost); allow_pending rebuilds them as PENDING_JURY")
+            leaf_mismatch = sum(
+                1 for r in conn.execute("SELECT submission_id, leaf_hash FROM merkle_leaves")
+                if r[0] in leaves and leaves[r[0]] != r[1]
+            )
+            if leaf_mismatch:
+                problems.append(f"{leaf_mismatch} Merkle leaves do not match their entity file lines")
+        changed = [r["path"] for r in parsed if _file_sha256(r["path"]) != r["sha256"]]
+        if changed:
+            problems.append(f"{len(changed)} entity files changed during the rebuild (is the app running?)")
+    finally:
+        db.close()
+
+    report = {
+        "files": len(files),
+        "rows": len(rows),
+        "events": sum(len(r["events"]) for r in parsed),
+        "duplicates": duplicates,
+        "bad_lines": sum(r["bad_lines"] for r in parsed),
+        "carried_over": carried,
+        "old_rows": None if old is None else len(old),
+        "missing": missing,
+        "restored_reviews": restored,
+        "problems": problems,
+        "parse_seconds": round(parsed_at - started, 3),
+        "load_seconds": round(loaded_at - parsed_at, 3),
+        "total_seconds": round(time.perf_counter() - started, 3),
+        "path": str(new_path),
+        "swapped": False
+    }
+
+    # 5. Swap in
+    if swap and not problems:
+        if db_path.exists():
+            backup = data_dir / f"ledger.db.bak-{time.strftime('%Y%m%d%H%M%S')}"
+            for suffix in ("", "-wal", "-shm"):
+                src = db_path.with_name(db_path.name + suffix)
+                if src.exists():
+                    os.replace(src, backup.with_name(backup.name + suffix))
+            report["backup"] = str(backup)
+        os.replace(new_path, db_path)
+        report["path"] = str(db_path)
+        report["swapped"] = True
+    return report
@@ -0,0 +1,161 @@
+# app/core/search.py - FTS5 full-text index over submissions
+import re
+import html
+import logging
+from typing import Dict, List, Optional
+
+logger = logging.getLogger("vow")
+
+# bm25 column weights: title, description, entity_name
+_WEIGHTS = (4.0, 1.0, 2.0)
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+# Private-use code points mark hits inside snippet(); the text is escaped
+# before they become <mark> tags, so submitted markup is never live
+_HIT_OPEN, _HIT_CLOSE = "\ue000", "\ue001"
+
+# External-content table: the text lives once, in submissions. Triggers
+# keep the index in the same transaction as every insert/update/delete.
+_TRIGGERS = {
+    "trg_fts_insert": """
+        CREATE TRIGGER trg_fts_insert AFTER INSERT ON submissions BEGIN
+            INSERT INTO submissions_fts (rowid, title, description, entity_name)
+            VALUES (NEW.rowid, NEW.title, NEW.description, NEW.entity_name);
+        END
+    """,
+    "trg_fts_delete": """
+        CREATE TRIGGER trg_fts_delete AFTER DELETE ON submissions BEGIN
+            INSERT INTO submissions_fts (submissions_fts, rowid, title, description, entity_name)
+            VALUES ('delete', OLD.rowid, OLD.title, OLD.description, OLD.entity_name);
+        END
+    """,
+    "trg_fts_update": """
+        CREATE TRIGGER trg_fts_update AFTER UPDATE OF title, description, entity_name ON submissions BEGIN
+            INSERT INTO submissions_fts (submissions_fts, rowid, title, description, entity_name)
+            VALUES ('delete', OLD.rowid, OLD.title, OLD.description, OLD.entity_name);
+            INSERT INTO submissions_fts (rowid, title, description, entity_name)
+            VALUES (NEW.rowid, NEW.title, NEW.description, NEW.entity_name);
+        END
+    """,
+}
+
+
+def init_search(conn):
+    """Create submissions_fts and its triggers; (re)build the index when they are new."""
+    created = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'submissions_fts'"
+    ).fetchone() is None
+    conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS submissions_fts USING fts5(
+            title, description, entity_name,
+            content='submissions', content_rowid='rowid',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+    """)
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+    missing = [name for name in _TRIGGERS if name not in existing]
+    for name in missing:
+        conn.execute(_TRIGGERS[name])
+    if created or missing:
+        conn.execute("INSERT INTO submissions_fts (submissions_fts) VALUES ('rebuild')")
+        logger.info("✅ Built full-text index over submissions")
+
+
+def fts_query(text: str, prefix: bool = True) -> Optional[str]:
+    """
+    Turn free text into a safe FTS5 query: every word must match, the last
+    one as a prefix so search-as-you-type works. None if there are no words.
+    """
+    tokens = _TOKEN.findall(text or "")
+    if not tokens:
+        return None
+    terms = [f'"{t}"' for t in tokens]
+    if prefix:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+def highlight(snippet: Optional[str]) -> str:
+    """HTML-safe snippet: escape the submitted text, then turn the hit markers into <mark>."""
+    if not snippet:
+        return ""
+    escaped = html.escape(snippet)
+    # Markers typed into a submission must not open or close tags of their own
+    opened, out = False, []
+    for part in re.split(f"([{_HIT_OPEN}{_HIT_CLOSE}])", escaped):
+        if part == _HIT_OPEN and not opened:
+            out.append("<mark>")
+            opened = True
+        elif part == _HIT_CLOSE and opened:
+            out.append("</mark>")
+            opened = False
+        elif part not in (_HIT_OPEN, _HIT_CLOSE):
+            out.append(part)
+    if opened:
+        out.append("</mark>")
+    return "".join(out)
+
+
+def search(conn, text: str, status: Optional[str] = None, entity_id: Optional[str] = None,
+           after: Optional[List] = None, limit: int = 20) -> List[Dict]:
+    """
+    Best matches first (lowest bm25). `after` is the (score, rowid) of the last
+    row of the previous page. Returns limit + 1 rows so callers can tell if
+    there is a next page. `snippet` is HTML-escaped with hits in <mark>.
+    """
+    query = fts_query(text)
+    if query is None:
+        return []
+
+    where, params = ["submissions_fts MATCH ?"], [query]
+    if status:
+        where.append("s.status = ?")
+        params.append(status)
+    if entity_id:
+        where.append("s.entity_id = ?")
+        params.append(entity_id)
+
+    outer, outer_params = "", []
+    if after:
+        outer = "WHERE (score, rid) > (?, ?)"
+        outer_params = list(after)
+
+    rows = conn.execute(f"""
+        SELECT * FROM (
+            SELECT s.rowid AS rid, s.submission_id, s.entity_id, s.entity_name, s.title,
+                   s.incident_year, s.status, s.created_at,
+                   bm25(submissions_fts, {", ".join(map(str, _WEIGHTS))}) AS score,
+                   snippet(submissions_fts, 1, ?, ?, '…', 16) AS snippet
+            FROM submissions_fts
+            JOIN submissions s ON s.rowid = submissions_fts.rowid
+            WHERE {" AND ".join(where)}
+        )
+        {outer}
+        ORDER BY score, rid
+        LIMIT ?
+    """, [_HIT_OPEN, _HIT_CLOSE] + params + outer_params + [limit + 1])
+    results = []
+    for r in rows:
+        row = dict(r)
+        row["snippet"] = highlight(row["snippet"])
+        results.append(row)
+    return results
+
+
+def find_duplicate(conn, entity_id: str, year: int, description: str, words: int = 8) -> Optional[str]:
+    """
+    submission_id of an existing entry for the same entity and year whose
+    description contains the opening words of `description`, found through
+    the FTS index. Replaces the legacy `description LIKE '%...%'` scan.
+    """
+    tokens = _TOKEN.findall(description or "")[:words]
+    if not tokens:
+        return None
+    phrase = '"' + " ".join(tokens) + '"'
+    row = conn.execute("""
+        SELECT s.submission_id FROM submissions_fts
+        JOIN submissions s ON s.rowid = submissions_fts.rowid
+        WHERE submissions_fts MATCH ? AND s.entity_id = ? AND s.incident_year = ?
+        LIMIT 1
+    """, (f"description : {phrase}", entity_id, year)).fetchone()
+    return row[0] if row else None
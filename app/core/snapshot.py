@@ -0,0 +1,246 @@
+# app/core/snapshot.py - Columnar NumPy snapshots of the ledger for analytics
+import os
+import json
+import uuid
+import shutil
+import zipfile
+import logging
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:     # Windows: single-process dev server, nothing to coordinate with
+    fcntl = None
+
+logger = logging.getLogger("vow")
+
+FORMAT_VERSION = 1
+
+# (column, kind). "dict" columns are stored as int32 codes plus a
+# `<column>.dict.npy` array of the distinct strings, "str" as fixed-width
+# unicode, "date" as datetime64[s] (NaT when unparseable).
+SUBMISSION_COLUMNS: List[Tuple[str, str]] = [
+    ("submission_id", "str"),
+    ("entity_id", "dict"),
+    ("entity_name", "dict"),
+    ("incident_country", "dict"),
+    ("incident_year", "int32"),
+    ("life_loss", "int64"),
+    ("financial_loss", "float64"),
+    ("status", "dict"),
+    ("intent_type", "dict"),
+    ("created_at", "date"),
+]
+
+ENTRY_COLUMNS: List[Tuple[str, str]] = [
+    ("entry_id", "str"),
+    ("entity_id", "dict"),
+    ("date_logged", "date"),
+    ("year", "int32"),
+    ("harm_ly", "float64"),
+    ("surplus_ly", "float64"),
+    ("harm_ecy", "float64"),
+    ("surplus_ecy", "float64"),
+    ("harm_type", "dict"),
+    ("incident_type", "dict"),
+    ("confidence", "dict"),
+    ("num_affected", "int64"),
+    ("avg_age_at_harm", "float64"),
+    ("response_to_entry_id", "dict"),
+]
+
+
+@contextmanager
+def snapshot_lock(snapshot_dir: Path):
+    """
+    Exclusive lock on `snapshot_dir/.lock`, held across export and pack, so
+    worker processes (and manage.py) never rebuild the same snapshot at once.
+    """
+    snapshot_dir = Path(snapshot_dir)
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+    with open(snapshot_dir / ".lock", "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _unique(path: Path, suffix: str) -> Path:
+    return path.with_name(f".{path.name}.{os.getpid()}-{uuid.uuid4().hex[:8]}{suffix}")
+
+
+def _parse_date(value) -> np.datetime64:
+    if not value:
+        return np.datetime64("NaT", "s")
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return np.datetime64("NaT", "s")
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return np.datetime64(parsed, "s")
+
+
+def _encode(values: List, kind: str) -> Dict[str, np.ndarray]:
+    """Arrays to write for one column: {"": data} and, for dict columns, {".dict": strings}."""
+    if kind == "dict":
+        strings = np.array(["" if v is None else str(v) for v in values], dtype=str)
+        if len(strings) == 0:
+            return {"": np.zeros(0, dtype=np.int32), ".dict": np.zeros(0, dtype="<U1")}
+        uniques, codes = np.unique(strings, return_inverse=True)
+        return {"": codes.astype(np.int32), ".dict": uniques}
+    if kind == "str":
+        return {"": np.array(["" if v is None else str(v) for v in values], dtype=str)}
+    if kind == "date":
+        return {"": np.array([_parse_date(v) for v in values], dtype="datetime64[s]")}
+    fill = np.nan if kind == "float64" else 0
+    return {"": np.array([fill if v is None or v == "" else v for v in values], dtype=kind)}
+
+
+def _write_table(out_dir: Path, table: str, columns: List[Tuple[str, str]],
+                 rows: Iterable[Dict]) -> Dict:
+    values: Dict[str, List] = {name: [] for name, _ in columns}
+    for row in rows:
+        for name, _ in columns:
+            values[name].append(row.get(name))
+
+    table_dir = out_dir / table
+    table_dir.mkdir(parents=True, exist_ok=True)
+    meta = {"rows": len(values[columns[0][0]]), "columns": {}}
+    for name, kind in columns:
+        arrays = _encode(values[name], kind)
+        for suffix, array in arrays.items():
+            np.save(table_dir / f"{name}{suffix}.npy", array, allow_pickle=False)
+        meta["columns"][name] = {
+            "kind": kind,
+            "dtype": arrays[""].dtype.str,
+            "file": f"{table}/{name}.npy",
+            **({"dict": f"{table}/{name}.dict.npy"} if kind == "dict" else {})
+        }
+    return meta
+
+
+def _submission_rows(conn, statuses: Optional[Tuple[str, ...]]) -> Iterable[Dict]:
+    names = ", ".join(name for name, _ in SUBMISSION_COLUMNS)
+    if statuses is None:
+        cursor = conn.execute(f"SELECT {names} FROM submissions ORDER BY rowid")
+    else:
+        marks = ",".join("?" * len(statuses))
+        cursor = conn.execute(f"SELECT {names} FROM submissions WHERE status IN ({marks}) ORDER BY rowid", statuses)
+    while True:
+        chunk = cursor.fetchmany(10000)
+        if not chunk:
+            return
+        for row in chunk:
+            yield dict(row)
+
+
+def _entry_rows(legacy_dir: Path) -> Iterable[Dict]:
+    for path in sorted(legacy_dir.glob("*.json")):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Skipping {path.name} in snapshot: {e}")
+            continue
+        if not isinstance(data, dict):
+            continue
+        entity_id = data.get("entity_id", path.stem)
+        for entry in data.get("entries", []):
+            yield {"entity_id": entity_id, **entry}
+
+
+def export_snapshot(conn, out_dir: Path, legacy_dir: Optional[Path] = None,
+                    statuses: Optional[Tuple[str, ...]] = ("APPROVED",)) -> Dict:
+    """
+    Write `submissions/` (from SQLite, read in one transaction) and, when
+    `legacy_dir` exists, `entries/` (from Data/*.json) as .npy columns plus
+    manifest.json. The directory is replaced atomically. Returns the manifest.
+
+    Only `statuses` rows are exported - approved ones by default, as the
+    public snapshot must not leak unreviewed submissions. None exports all.
+    """
+    out_dir = Path(out_dir)
+    out_dir.parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(dir=out_dir.parent, prefix=f".{out_dir.name}.", suffix=".tmp"))
+
+    manifest = {
+        "format": FORMAT_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "statuses": None if statuses is None else list(statuses),
+        "tables": {}
+    }
+    conn.execute("BEGIN")
+    try:
+        manifest["tables"]["submissions"] = _write_table(tmp, "submissions", SUBMISSION_COLUMNS, _submission_rows(conn, statuses))
+    finally:
+        conn.execute("ROLLBACK")
+    if legacy_dir is not None and Path(legacy_dir).is_dir():
+        manifest["tables"]["entries"] = _write_table(tmp, "entries", ENTRY_COLUMNS, _entry_rows(Path(legacy_dir)))
+
+    with open(tmp / "manifest.json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    old = _unique(out_dir, ".old")
+    try:
+        os.replace(out_dir, old)
+    except FileNotFoundError:
+        pass
+    os.replace(tmp, out_dir)
+    shutil.rmtree(old, ignore_errors=True)
+    rows = {t: m["rows"] for t, m in manifest["tables"].items()}
+    logger.info(f"✅ Exported columnar snapshot to {out_dir} {rows}")
+    return manifest
+
+
+def pack_npz(snapshot_dir: Path, dest: Path) -> Path:
+    """
+    Bundle a snapshot directory into one .npz (members `table/column.npy`
+    plus manifest.json). Members are stored uncompressed, so np.load reads
+    each column without inflating the archive.
+    """
+    snapshot_dir, dest = Path(snapshot_dir), Path(dest)
+    tmp = _unique(dest, ".tmp")
+    with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_STORED) as zf:
+        for path in sorted(snapshot_dir.rglob("*")):
+            if path.is_file():
+                zf.write(path, path.relative_to(snapshot_dir).as_posix())
+    os.replace(tmp, dest)
+    return dest
+
+
+def load_snapshot(snapshot_dir: Path, mmap: bool = True) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    {table: {column: array}} for a snapshot directory; dictionary strings are
+    under `<column>.dict`. With mmap the arrays are read-only views of the files.
+    """
+    snapshot_dir = Path(snapshot_dir)
+    with open(snapshot_dir / "manifest.json", "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot format {manifest.get('format')}")
+
+    mode = "r" if mmap else None
+    tables = {}
+    for table, meta in manifest["tables"].items():
+        columns = {}
+        for name, col in meta["columns"].items():
+            columns[name] = np.load(snapshot_dir / col["file"], mmap_mode=mode, allow_pickle=False)
+            if "dict" in col:
+                columns[f"{name}.dict"] = np.load(snapshot_dir / col["dict"], allow_pickle=False)
+        tables[table] = columns
+    return tables
+
+
+def decode(table: Dict[str, np.ndarray], column: str) -> np.ndarray:
+    """Strings for a dictionary-encoded column."""
+    return table[f"{column}.dict"][table[column]]
@@ -0,0 +1,116 @@
+# app/core/sqlite_db.py - Managed SQLite connections for the ledger index
+import queue
+import sqlite3
+import threading
+import logging
+from contextlib import contextmanager
+from pathlib import Path
+
+logger = logging.getLogger("vow")
+
+
+class LedgerDB:
+    """
+    One writer connection plus a small pool of read connections over
+    ledger.db. WAL journaling lets readers keep going while the writer
+    commits, and every connection is opened once and reused.
+    """
+
+    def __init__(self, db_path: Path, readers: int = 4, mmap_mb: int = 256, cache_mb: int = 64):
+        self.db_path = Path(db_path)
+        self.max_readers = max(readers, 1)
+        self.mmap_bytes = mmap_mb * 1024 * 1024
+        self.cache_kib = cache_mb * 1024
+
+        self._writer_lock = threading.RLock()
+        self._writer = self._connect()
+        self._writer.execute("PRAGMA journal_mode=WAL")
+
+        self._readers: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._readers_lock = threading.Lock()
+        self._readers_open = 0
+        self._dedicated = []
+        self._closed = False
+
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            str(self.db_path),
+            timeout=30,
+            isolation_level=None,       # we issue BEGIN/COMMIT ourselves
+            check_same_thread=False     # connections move between worker threads
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA mmap_size={self.mmap_bytes}")
+        conn.execute(f"PRAGMA cache_size=-{self.cache_kib}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA busy_timeout=30000")
+        # INSERT OR REPLACE must fire DELETE triggers so derived tables stay exact
+        conn.execute("PRAGMA recursive_triggers=ON")
+        if read_only:
+            conn.execute("PRAGMA query_only=ON")
+        return conn
+
+    @contextmanager
+    def writer(self):
+        """Serialised write transaction; commits on success, rolls back on error."""
+        with self._writer_lock:
+            conn = self._writer
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            else:
+                conn.execute("COMMIT")
+
+    @contextmanager
+    def reader(self):
+        """Borrow a pooled read connection."""
+        conn = self._acquire_reader()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            self._readers.put(conn)
+
+    def _acquire_reader(self) -> sqlite3.Connection:
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+        with self._readers_lock:
+            if self._readers_open < self.max_readers:
+                self._readers_open += 1
+                return self._connect(read_only=True)
+        return self._readers.get()
+
+    def dedicated_reader(self) -> sqlite3.Connection:
+        """
+        A read connection outside the pool, for tiny queries issued from the
+        event loop itself, where waiting on a busy pool would block it.
+        """
+        conn = self._connect(read_only=True)
+        self._dedicated.append(conn)
+        return conn
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+        for conn in self._dedicated:
+            conn.close()
+        with self._writer_lock:
+            try:
+                self._writer.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                pass
+            self._writer.close()
+        logger.info("🛑 Ledger index connections closed")
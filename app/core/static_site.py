@@ -0,0 +1,178 @@
+# app/core/static_site.py - Render the public pages into a directory of static files
+import os
+import re
+import json
+import shutil
+import hashlib
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+
+from jinja2 import Environment
+
+from app.core.pages import entity_context, entry_context, entry_summary, home_context
+from app.core.templates import stream_template, templates_fingerprint
+
+logger = logging.getLogger("vow")
+
+FORMAT_VERSION = 1
+MANIFEST_NAME = ".build-manifest.json"
+INFO_PAGES = {"info": "info.html", "methodology": "methodology.html"}
+
+_SAFE_NAME = re.compile(r"[A-Za-z0-9_\-~][A-Za-z0-9_.\-~]*")
+
+
+def _safe(name: str) -> Optional[str]:
+    """Ids become path segments; anything that could escape the output dir is skipped."""
+    return name if name and _SAFE_NAME.fullmatch(name) and ".." not in name else None
+
+
+def _write_atomic(path: Path, chunks):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+    os.replace(tmp, path)
+
+
+def _render(env: Environment, template: str, path: Path, **context):
+    context["request"] = None
+    _write_atomic(path, stream_template(env, template, context))
+
+
+def _templates_hash(env: Environment) -> str:
+    return hashlib.sha256(f"{FORMAT_VERSION}\0{templates_fingerprint(env)}".encode()).hexdigest()
+
+
+def _swap_dir(tmp: Path, final: Path):
+    old = final.with_name(final.name + ".old")
+    shutil.rmtree(old, ignore_errors=True)
+    if final.exists():
+        os.replace(final, old)
+    os.replace(tmp, final)
+    shutil.rmtree(old, ignore_errors=True)
+
+
+async def _build_entity(ledger, env: Environment, entity_id: str, entity_dir: Path, page_size: int) -> int:
+    """
+    entity/<id>/index.html, page/<n>/index.html, entry/<sid>/index.html and
+    index.json (summary plus every approved entry). Returns pages written.
+    """
+    tmp = entity_dir.with_name(f".{entity_dir.name}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    written, cursor, number = 0, None, 1
+    summary = await ledger.entity_summary(entity_id)
+
+    with open(tmp / "index.json", "w", encoding="utf-8") as index:
+        index.write('{"entity": ' + json.dumps(summary, default=str) + ', "entries": [')
+        first = True
+        while True:
+            context = await entity_context(ledger, entity_id, cursor, page_size)
+            if context is None:
+                break
+            entity = context["entity"]
+            if number > 1:
+                entity["first_url"] = f"/entity/{entity_id}/"
+            if context["next_cursor"]:
+                entity["next_url"] = f"/entity/{entity_id}/page/{number + 1}/"
+            page_dir = tmp if number == 1 else tmp / "page" / str(number)
+            _render(env, "entity.html", page_dir / "index.html", entity=entity)
+            written += 1
+
+            for submission in context["rows"]:
+                sid = _safe(submission["submission_id"])
+                if sid is None:
+                    logger.warning(f"⚠️ Skipping entry with unsafe id {submission['submission_id']!r}")
+                    continue
+                _render(env, "entry_view.html", tmp / "entry" / sid / "index.html", **entry_context(submission))
+                index.write(("" if first else ",") + json.dumps(entry_summary(submission), default=str))
+                first = False
+                written += 1
+
+            cursor, number = context["next_cursor"], number + 1
+            if not cursor:
+                break
+        index.write("]}")
+
+    _swap_dir(tmp, entity_dir)
+    return written
+
+
+async def build_static(ledger, env: Environment, out_dir: Path, page_size: int = 100,
+                       full: bool = False) -> Dict:
+    """
+    Render `/`, `/info`, `/methodology` and every approved entity (paged
+    entity pages plus one page per entry) into `out_dir` as
+    `<path>/index.html`, with `entities.json` and `entity/<id>/index.json`
+    beside them. Serve it with `try_files $uri $uri/index.html`.
+
+    Incremental: nothing is done when the ledger version and templates are
+    unchanged since the last build. Otherwise only entities whose approved
+    rows changed are re-rendered, and entities that lost all approved
+    entries are removed. Template changes or `full` rebuild everything.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = out_dir / MANIFEST_NAME
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    if manifest.get("format") != FORMAT_VERSION:
+        manifest = {}
+
+    version = ledger.current_version()
+    templates = _templates_hash(env)
+    templates_changed = manifest.get("templates") != templates
+    report = {"version": version, "out_dir": str(out_dir), "entities_built": 0, "entities_removed": 0,
+              "entities_unchanged": 0, "pages_written": 0, "skipped": False}
+    if not full and not templates_changed and manifest.get("version") == version:
+        report["skipped"] = True
+        report["entities_unchanged"] = len(manifest.get("entities", {}))
+        return report
+
+    fingerprints = await ledger.entity_fingerprints()
+    previous = {} if (full or templates_changed) else manifest.get("entities", {})
+    built = {}
+    for entity_id, fingerprint in fingerprints.items():
+        safe_id = _safe(entity_id)
+        if safe_id is None:
+            logger.warning(f"⚠️ Skipping entity with unsafe id {entity_id!r}")
+            continue
+        if previous.get(entity_id) == fingerprint and (out_dir / "entity" / safe_id).is_dir():
+            report["entities_unchanged"] += 1
+        else:
+            report["pages_written"] += await _build_entity(ledger, env, entity_id, out_dir / "entity" / safe_id, page_size)
+            report["entities_built"] += 1
+        built[entity_id] = fingerprint
+
+    for entity_id in manifest.get("entities", {}):
+        if entity_id not in built and _safe(entity_id):
+            shutil.rmtree(out_dir / "entity" / entity_id, ignore_errors=True)
+            report["entities_removed"] += 1
+
+    # Home page and the entity list reflect every entity; always cheap to redo
+    _render(env, "index.html", out_dir / "index.html", **await home_context(ledger))
+    summaries = await ledger.entity_summaries(status="APPROVED")
+    _write_atomic(out_dir / "entities.json", [json.dumps(summaries, default=str).encode("utf-8")])
+    report["pages_written"] += 1
+    for name, template in INFO_PAGES.items():
+        if templates_changed or full or not (out_dir / name / "index.html").exists():
+            _render(env, template, out_dir / name / "index.html")
+            report["pages_written"] += 1
+
+    manifest = {
+        "format": FORMAT_VERSION,
+        "version": version,
+        "templates": templates,
+        "entities": built,
+        "built_at": datetime.now(timezone.utc).isoformat()
+    }
+    _write_atomic(manifest_path, [json.dumps(manifest, indent=1).encode("utf-8")])
+    logger.info(f"✅ Static site: {report['entities_built']} entities rebuilt, "
+                f"{report['entities_unchanged']} unchanged, {report['entities_removed']} removed")
+    return report
@@ -0,0 +1,105 @@
+# app/core/templates.py - Jinja environment for the HTML pages
+import os
+import time
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+
+logger = logging.getLogger("vow")
+
+TEMPLATE_DIR = "templates"
+STREAM_CHUNK_BYTES = 16 * 1024
+
+
+def comma_format(x):
+    return f"{int(x):,}" if x else "0"
+
+
+def is_production() -> bool:
+    return os.getenv("ENVIRONMENT", "development") == "production"
+
+
+def create_environment(directory: str = TEMPLATE_DIR, production: Optional[bool] = None,
+                       bytecode_dir: Optional[str] = None) -> Environment:
+    """
+    Development: templates are re-checked on every render so edits show up
+    immediately. Production: compiled templates are kept for the life of the
+    process (no mtime checks) and, when `bytecode_dir` / TEMPLATE_BYTECODE_DIR
+    is set, their bytecode is shared through that directory so a new worker
+    skips parsing altogether.
+    """
+    if production is None:
+        production = is_production()
+    if bytecode_dir is None:
+        bytecode_dir = os.getenv("TEMPLATE_BYTECODE_DIR") or None
+
+    bytecode_cache = None
+    if production and bytecode_dir:
+        Path(bytecode_dir).mkdir(parents=True, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(bytecode_dir)
+
+    env = Environment(
+        loader=FileSystemLoader(directory),
+        autoescape=select_autoescape(["html", "xml"]),
+        cache_size=-1 if production else 0,
+        auto_reload=not production,
+        bytecode_cache=bytecode_cache
+    )
+    env.filters['comma_format'] = comma_format
+    return env
+
+
+def stream_template(env: Environment, name: str, context: Dict,
+                    chunk_bytes: int = STREAM_CHUNK_BYTES) -> Iterator[bytes]:
+    """
+    Render with Template.generate(), yielding UTF-8 chunks of about
+    `chunk_bytes` instead of one string holding the whole page. Jinja yields
+    many tiny fragments, so they are batched to keep the number of writes sane.
+    """
+    template = env.get_template(name)
+    buffer, size = [], 0
+    for fragment in template.generate(**context):
+        data = fragment.encode("utf-8")
+        buffer.append(data)
+        size += len(data)
+        if size >= chunk_bytes:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def templates_fingerprint(env: Environment) -> str:
+    """sha256 over every template's name and source; changes with any template edit."""
+    h = hashlib.sha256()
+    for name in sorted(env.list_templates()):
+        source, _, _ = env.loader.get_source(env, name)
+        h.update(name.encode() + b"\0" + source.encode("utf-8") + b"\0")
+    return h.hexdigest()
+
+
+def build_fingerprint(env: Environment) -> str:
+    """
+    Short id of what renders the pages: the templates plus APP_BUILD (set it
+    per deploy, e.g. to the git commit, so code-only changes count too).
+    Computed once at startup; the same in every worker.
+    """
+    h = hashlib.sha256(templates_fingerprint(env).encode() + b"\0" + os.getenv("APP_BUILD", "").encode())
+    return h.hexdigest()[:12]
+
+
+def precompile(env: Environment) -> int:
+    """Load every template once so no request pays for compiling one. Returns the count."""
+    started = time.perf_counter()
+    loaded = 0
+    for name in env.list_templates(extensions=["html", "xml"]):
+        try:
+            env.get_template(name)
+            loaded += 1
+        except Exception as e:
+            logger.warning(f"⚠️ Template {name} failed to compile: {e}")
+    logger.info(f"✅ Precompiled {loaded} templates in {round((time.perf_counter() - started) * 1000, 1)} ms")
+    return loaded
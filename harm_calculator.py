@@ -1,6 +1,10 @@
+import os
+import json
 from dataclasses import dataclass
 from enum import Enum
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
 
 # =========================
 # ENUMS
@@ -112,6 +116,13 @@ class AnnualView:
     outstanding_ecy: float
     status: Status
 
+@dataclass
+class AnnualSeries:
+    """Every year with entries, oldest first, with running balances"""
+    views: List[AnnualView]
+    cumulative_outstanding_ly: List[float]   # Sum of outstanding_ly up to and including each year
+    cumulative_outstanding_ecy: List[float]
+
 @dataclass
 class LifetimeView:
     """Entire institutional history"""
@@ -124,6 +135,120 @@ class LifetimeView:
     status: Status
     years_to_repair: Optional[float] = None  # At current surplus rate
 
+# =========================
+# ENTRY TABLE (COLUMNAR)
+# =========================
+
+ENTRY_COLUMNS = {
+    "year": np.int64,
+    "harm_ly": np.float64,
+    "harm_ecy": np.float64,
+    "surplus_ly": np.float64,
+    "surplus_ecy": np.float64,
+    "intent": np.int32,         # index into EntryTable.intent_labels
+}
+
+def _intent_multiplier(harm_type: str) -> float:
+    try:
+        return HarmType[harm_type].value
+    except KeyError:
+        return 1.0
+
+def _group_sums(groups: np.ndarray, values: np.ndarray, size: int, integral: bool = False) -> np.ndarray:
+    """
+    Per-group sums, added left to right in entry order. Integer sums when
+    the column came from ints, as sum() over the entries would give.
+    """
+    sums = np.bincount(groups, weights=values, minlength=size)
+    return sums.astype(np.int64) if integral else sums
+
+def _year_groups(years: np.ndarray):
+    """
+    (distinct years ascending, group index per entry) in linear time when
+    the span of years is dense, as it is for real ledgers.
+    """
+    if not len(years):
+        return years[:0], np.zeros(0, dtype=np.intp)
+    low, high = int(years.min()), int(years.max())
+    if high - low > 4 * len(years) + 1024:
+        return np.unique(years, return_inverse=True)
+    offsets = years - low
+    present = np.flatnonzero(np.bincount(offsets))
+    lookup = np.zeros(high - low + 1, dtype=np.intp)
+    lookup[present] = np.arange(len(present))
+    return present + low, lookup[offsets]
+
+def _latest(years: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of sorted(range(n), key=year, reverse=True)[:k] without a full
+    sort: everything above the cut-off year, then the earliest entries at it.
+    """
+    if len(years) <= k:
+        return np.argsort(-years, kind="stable")
+    low = years.min()
+    counts = np.bincount(years - low)
+    from_top = np.cumsum(counts[::-1])
+    cut = low + len(counts) - 1 - int(np.searchsorted(from_top, k))
+    above = np.flatnonzero(years > cut)
+    at_cut = np.flatnonzero(years == cut)[:k - len(above)]
+    picked = np.concatenate([above, at_cut])
+    return picked[np.argsort(-years[picked], kind="stable")]
+
+def _total(values: np.ndarray, integral: bool = False):
+    """Sum of a column: 0 when empty, an int for integer columns, else a float."""
+    if not len(values):
+        return 0
+    return _group_sums(np.zeros(len(values), dtype=np.intp), values, 1, integral).tolist()[0]
+
+class EntryTable:
+    """
+    The numeric fields of a list of LedgerEntry as typed NumPy columns
+    (ENTRY_COLUMNS), one row per entry in ledger order. harm_type strings
+    are dictionary encoded: `intent` indexes `intent_labels`, each with its
+    multiplier. `integral` names the columns built from ints only, whose
+    sums stay ints as they did over LedgerEntry fields. Columns are separate contiguous arrays rather than one
+    record array, so reductions never walk strided memory.
+    Build once per entity; LedgerCalculator views over it are vectorised.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], intent_labels: Sequence[str]):
+        self.integral = set()
+        for name, dtype in ENTRY_COLUMNS.items():
+            values = columns[name]
+            if np.asarray(values).dtype.kind in "iub":
+                self.integral.add(name)
+            setattr(self, name, np.ascontiguousarray(values, dtype=dtype))
+        self.intent_labels = list(intent_labels)
+        self.multipliers = np.array([_intent_multiplier(l) for l in self.intent_labels], dtype=np.float64)
+        self._amplified = None
+
+    @classmethod
+    def from_entries(cls, entries: Sequence[LedgerEntry]) -> "EntryTable":
+        labels: Dict[str, int] = {}
+        columns = {
+            "year": [e.year for e in entries],
+            "harm_ly": [e.harm_ly for e in entries],
+            "harm_ecy": [e.harm_ecy for e in entries],
+            "surplus_ly": [e.surplus_ly for e in entries],
+            "surplus_ecy": [e.surplus_ecy for e in entries],
+            "intent": [labels.setdefault(e.harm_type, len(labels)) for e in entries]
+        }
+        return cls(columns, list(labels))
+
+    @classmethod
+    def of(cls, entries: Union["EntryTable", Sequence[LedgerEntry]]) -> "EntryTable":
+        return entries if isinstance(entries, EntryTable) else cls.from_entries(entries)
+
+    def __len__(self) -> int:
+        return len(self.year)
+
+    def amplified(self):
+        """(harm_ly, harm_ecy) with intent multipliers applied, per entry."""
+        if self._amplified is None:
+            mult = self.multipliers[self.intent]
+            self._amplified = (self.harm_ly * mult, self.harm_ecy * mult)
+        return self._amplified
+
 # =========================
 # CALCULATOR (READ-ONLY)
 # =========================
@@ -132,18 +257,58 @@ class LedgerCalculator:
     """
     This calculator NEVER modifies data.
     It only reads and summarizes the ledger.
+
+    Views accept a list of LedgerEntry or a prebuilt EntryTable (faster
+    when computing several views of the same entity).
     """
 
     @staticmethod
-    def calculate_annual_view(entries: List[LedgerEntry], year: int) -> AnnualView:
+    def calculate_annual_view(entries: Union[List[LedgerEntry], EntryTable], year: int) -> AnnualView:
         """Calculate one year's balance"""
-        relevant = [e for e in entries if e.year == year]
+        table = EntryTable.of(entries)
+        relevant = table.year == year
+        amp_ly, amp_ecy = table.amplified()
+
+        return LedgerCalculator._annual_view(
+            year,
+            _total(amp_ly[relevant]),
+            _total(amp_ecy[relevant]),
+            _total(table.surplus_ly[relevant], "surplus_ly" in table.integral),
+            _total(table.surplus_ecy[relevant], "surplus_ecy" in table.integral)
+        )
 
-        harm_ly = sum(e.amplified_harm()["harm_ly"] for e in relevant)
-        harm_ecy = sum(e.amplified_harm()["harm_ecy"] for e in relevant)
-        surplus_ly = sum(e.surplus_ly for e in relevant)
-        surplus_ecy = sum(e.surplus_ecy for e in relevant)
-        
+    @staticmethod
+    def calculate_annual_series(entries: Union[List[LedgerEntry], EntryTable]) -> AnnualSeries:
+        """
+        Every year's balance in one grouped pass, O(entries) rather than
+        one calculate_annual_view scan per year. Each view is identical to
+        calculate_annual_view for that year.
+        """
+        table = EntryTable.of(entries)
+        years, groups = _year_groups(table.year)
+        amp_ly, amp_ecy = table.amplified()
+        size = len(years)
+
+        views = [
+            LedgerCalculator._annual_view(year, harm_ly, harm_ecy, surplus_ly, surplus_ecy)
+            for year, harm_ly, harm_ecy, surplus_ly, surplus_ecy in zip(
+                years.tolist(),
+                _group_sums(groups, amp_ly, size).tolist(),
+                _group_sums(groups, amp_ecy, size).tolist(),
+                _group_sums(groups, table.surplus_ly, size, "surplus_ly" in table.integral).tolist(),
+                _group_sums(groups, table.surplus_ecy, size, "surplus_ecy" in table.integral).tolist()
+            )
+        ]
+        # cumsum adds left to right, like a running total over the views
+        return AnnualSeries(
+            views=views,
+            cumulative_outstanding_ly=np.cumsum([v.outstanding_ly for v in views], dtype=np.float64).tolist(),
+            cumulative_outstanding_ecy=np.cumsum([v.outstanding_ecy for v in views], dtype=np.float64).tolist()
+        )
+
+    @staticmethod
+    def _annual_view(year: int, harm_ly: float, harm_ecy: float,
+                     surplus_ly: float, surplus_ecy: float) -> AnnualView:
         outstanding_ly = harm_ly + surplus_ly
         outstanding_ecy = harm_ecy + surplus_ecy
 
@@ -167,13 +332,29 @@ class LedgerCalculator:
         )
 
     @staticmethod
-    def calculate_lifetime_view(entries: List[LedgerEntry]) -> LifetimeView:
+    def calculate_lifetime_view(entries: Union[List[LedgerEntry], EntryTable]) -> LifetimeView:
         """Calculate entire institutional history"""
-        harm_ly = sum(e.amplified_harm()["harm_ly"] for e in entries)
-        harm_ecy = sum(e.amplified_harm()["harm_ecy"] for e in entries)
-        surplus_ly = sum(e.surplus_ly for e in entries)
-        surplus_ecy = sum(e.surplus_ecy for e in entries)
+        table = EntryTable.of(entries)
+        amp_ly, amp_ecy = table.amplified()
+
+        def recent_rate():
+            # The 100 latest-year entries, ties kept in ledger order as sorted() does
+            recent = _latest(table.year, 100)
+            recent_surplus_ly = table.surplus_ly[recent]
+            return sum(recent_surplus_ly[recent_surplus_ly > 0].tolist()), len(np.unique(table.year[recent]))
+
+        return LedgerCalculator._lifetime_view(
+            _total(amp_ly),
+            _total(amp_ecy),
+            _total(table.surplus_ly, "surplus_ly" in table.integral),
+            _total(table.surplus_ecy, "surplus_ecy" in table.integral),
+            recent_rate
+        )
 
+    @staticmethod
+    def _lifetime_view(harm_ly: float, harm_ecy: float, surplus_ly: float, surplus_ecy: float,
+                       recent_rate: Callable[[], Tuple[float, int]]) -> LifetimeView:
+        """recent_rate() -> (positive surplus_ly, distinct years) of the 100 latest entries."""
         outstanding_ly = harm_ly + surplus_ly
         outstanding_ecy = harm_ecy + surplus_ecy
 
@@ -189,9 +370,7 @@ class LedgerCalculator:
         years_to_repair = None
         if outstanding_ly < 0 and surplus_ly > 0:
             # Get recent surplus rate (last 5 years average)
-            recent_entries = sorted(entries, key=lambda e: e.year, reverse=True)[:100]
-            recent_surplus = sum(e.surplus_ly for e in recent_entries if e.surplus_ly > 0)
-            recent_years = len(set(e.year for e in recent_entries))
+            recent_surplus, recent_years = recent_rate()
             if recent_years > 0 and recent_surplus > 0:
                 avg_annual_surplus = recent_surplus / recent_years
                 years_to_repair = abs(outstanding_ly) / avg_annual_surplus
@@ -208,22 +387,28 @@ class LedgerCalculator:
         )
 
     @staticmethod
-    def harm_breakdown(entries: List[LedgerEntry]) -> Dict[str, Dict[str, float]]:
+    def harm_breakdown(entries: Union[List[LedgerEntry], EntryTable]) -> Dict[str, Dict[str, float]]:
         """Break down harm by type (NEGLIGENCE, DELIBERATE, COVER_UP, etc.)"""
-        breakdown: Dict[str, Dict[str, float]] = {}
+        table = EntryTable.of(entries)
+        harmful = (table.harm_ly < 0) | (table.harm_ecy < 0)
+        intents = table.intent[harmful]
+        amp_ly, amp_ecy = table.amplified()
+        size = len(table.intent_labels)
         
-        for e in entries:
-            if e.harm_ly < 0 or e.harm_ecy < 0:
-                mult = e.intent_multiplier()
-                key = e.harm_type
-                
-                if key not in breakdown:
-                    breakdown[key] = {"ly": 0.0, "ecy": 0.0, "count": 0}
-                
-                breakdown[key]["ly"] += e.harm_ly * mult
-                breakdown[key]["ecy"] += e.harm_ecy * mult
-                breakdown[key]["count"] += 1
+        ly = _group_sums(intents, amp_ly[harmful], size)
+        ecy = _group_sums(intents, amp_ecy[harmful], size)
+        counts = np.bincount(intents, minlength=size)
         
+        # Keys in order of first harmful appearance, as the dict was filled
+        present = np.flatnonzero(counts)
+        first = [int(np.argmax(intents == code)) for code in present.tolist()]
+        breakdown: Dict[str, Dict[str, float]] = {}
+        for code in present[np.argsort(first)].tolist():
+            breakdown[table.intent_labels[code]] = {
+                "ly": float(ly[code]),
+                "ecy": float(ecy[code]),
+                "count": int(counts[code])
+            }
         return breakdown
 
     @staticmethod
@@ -231,6 +416,136 @@ class LedgerCalculator:
         """Track institutional responses to a specific harm"""
         return [e for e in entries if e.response_to_entry_id == original_entry_id]
 
+# =========================
+# LIFETIME ACCUMULATOR (INCREMENTAL)
+# =========================
+
+RECENT_WINDOW = 100     # Entries behind the years_to_repair surplus rate
+
+class LifetimeAccumulator:
+    """
+    Running lifetime totals for one entity. The ledger is append-only, so
+    each new entry is folded in with add() in O(1) and view() costs the
+    same whatever the entity's size: no rescan, no re-sort.
+
+    Totals are added in ledger order, exactly as sum() does over the list
+    (before Python 3.12), so view() and harm_breakdown() equal
+    LedgerCalculator's results for the same entries. Per year it keeps the
+    entry count and the first RECENT_WINDOW surplus_ly values, which is
+    all the years_to_repair window can ever reach.
+
+    to_dict()/from_dict() and save()/load() checkpoint it as JSON; resume
+    by adding the entries after `last_entry_id`.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, entity_id: str):
+        self.entity_id = entity_id
+        self.entries = 0
+        self.last_entry_id: Optional[str] = None
+        self.harm_ly = 0
+        self.harm_ecy = 0
+        self.surplus_ly = 0
+        self.surplus_ecy = 0
+        self.breakdown: Dict[str, Dict[str, float]] = {}
+        self.years: Dict[int, Dict] = {}     # year -> {"count": n, "surplus_ly": [first values]}
+
+    def add(self, entry: LedgerEntry):
+        """Fold in the next entry of this entity, in ledger order."""
+        if entry.entity_id != self.entity_id:
+            raise ValueError(f"Entry {entry.entry_id} belongs to {entry.entity_id}, not {self.entity_id}")
+        mult = entry.intent_multiplier()
+        harm_ly = entry.harm_ly * mult
+        harm_ecy = entry.harm_ecy * mult
+
+        self.harm_ly += harm_ly
+        self.harm_ecy += harm_ecy
+        self.surplus_ly += entry.surplus_ly
+        self.surplus_ecy += entry.surplus_ecy
+
+        if entry.harm_ly < 0 or entry.harm_ecy < 0:
+            totals = self.breakdown.setdefault(entry.harm_type, {"ly": 0.0, "ecy": 0.0, "count": 0})
+            totals["ly"] += harm_ly
+            totals["ecy"] += harm_ecy
+            totals["count"] += 1
+
+        bucket = self.years.setdefault(entry.year, {"count": 0, "surplus_ly": []})
+        bucket["count"] += 1
+        if len(bucket["surplus_ly"]) < RECENT_WINDOW:
+            bucket["surplus_ly"].append(entry.surplus_ly)
+
+        self.entries += 1
+        self.last_entry_id = entry.entry_id
+
+    def extend(self, entries: Sequence[LedgerEntry]):
+        for entry in entries:
+            self.add(entry)
+
+    def _recent_rate(self) -> Tuple[float, int]:
+        # Newest years first; a year above the cut-off has < RECENT_WINDOW
+        # entries, so its stored values are complete
+        values: List[float] = []
+        years = 0
+        for year in sorted(self.years, reverse=True):
+            if len(values) >= RECENT_WINDOW:
+                break
+            values.extend(self.years[year]["surplus_ly"][:RECENT_WINDOW - len(values)])
+            years += 1
+        return sum(v for v in values if v > 0), years
+
+    def view(self) -> LifetimeView:
+        """Same LifetimeView as calculate_lifetime_view over every entry added."""
+        return LedgerCalculator._lifetime_view(
+            self.harm_ly, self.harm_ecy, self.surplus_ly, self.surplus_ecy, self._recent_rate
+        )
+
+    def harm_breakdown(self) -> Dict[str, Dict[str, float]]:
+        return {key: dict(totals) for key, totals in self.breakdown.items()}
+
+    def to_dict(self) -> Dict:
+        return {
+            "format": self.FORMAT_VERSION,
+            "entity_id": self.entity_id,
+            "entries": self.entries,
+            "last_entry_id": self.last_entry_id,
+            "harm_ly": self.harm_ly,
+            "harm_ecy": self.harm_ecy,
+            "surplus_ly": self.surplus_ly,
+            "surplus_ecy": self.surplus_ecy,
+            "breakdown": self.harm_breakdown(),
+            "years": {str(year): {"count": b["count"], "surplus_ly": list(b["surplus_ly"])}
+                      for year, b in self.years.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "LifetimeAccumulator":
+        if data.get("format") != cls.FORMAT_VERSION:
+            raise ValueError(f"Unsupported accumulator format: {data.get('format')}")
+        acc = cls(data["entity_id"])
+        acc.entries = data["entries"]
+        acc.last_entry_id = data["last_entry_id"]
+        acc.harm_ly = data["harm_ly"]
+        acc.harm_ecy = data["harm_ecy"]
+        acc.surplus_ly = data["surplus_ly"]
+        acc.surplus_ecy = data["surplus_ecy"]
+        acc.breakdown = {key: dict(totals) for key, totals in data["breakdown"].items()}
+        acc.years = {int(year): {"count": b["count"], "surplus_ly": list(b["surplus_ly"])}
+                     for year, b in data["years"].items()}
+        return acc
+
+    def save(self, path: str):
+        """Checkpoint atomically (JSON floats round-trip exactly)."""
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "LifetimeAccumulator":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
 # =========================
 # FORMATTERS
 # =========================
@@ -355,3 +670,8 @@ if __name__ == "__main__":
     print(f"\nHarm Breakdown:")
     for harm_type, values in breakdown.items():
         print(f"  {harm_type}: {format_ly(values['ly'])} ({values['count']} entries)")
+    
+    series = calc.calculate_annual_series(entries)
+    print("\nTimeline:")
+    for view, running in zip(series.views, series.cumulative_outstanding_ly):
+        print(f"  {view.year}: {format_ly(view.outstanding_ly)} ({view.status.value}), running {format_ly(running)}")
@@ -1,17 +1,23 @@
 import os
-from fastapi import FastAPI, Request, HTTPException
+from app.core import readiness  # noqa: F401 - first import, for its side effect: starts the import-to-first-byte clock
+from fastapi import FastAPI, Header, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, JSONResponse
-from jinja2 import Environment, FileSystemLoader, select_autoescape
-from app.core.database import lifespan, get_ledger
-from app.api import health, submissions, entities, aggregation, evidence, jury, admin
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, StreamingResponse
+from app.core.database import lifespan, get_ledger, default_data_dir
+from app.core.github_import import GitHubDataSource
+from app.core.local_import import MANIFEST_NAME, sync_data_dir
+from app.core.import_preview import preview_import
+from app.core.page_cache import PageCache
+from app.core.pages import entity_context, entry_context, home_context
+from app.core.templates import build_fingerprint, create_environment, is_production, precompile, stream_template
+from app.core.legacy import is_empty_entry, legacy_submission
+from app.api import health, submissions, entities, aggregation, evidence, jury, admin, search, export, events, ledger as ledger_api
 from datetime import datetime
 import json
 import hashlib
 import uuid
 import httpx
-from pathlib import Path
 
 os.makedirs("static", exist_ok=True)
 os.makedirs("templates", exist_ok=True)
@@ -26,19 +32,39 @@ app = FastAPI(
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
 # ==================== RAW JINJA2 (NO STARLETTE CACHE) ====================
-jinja_env = Environment(
-    loader=FileSystemLoader("templates"),
-    autoescape=select_autoescape(["html", "xml"]),
-    cache_size=0,
-    auto_reload=True
-)
-jinja_env.filters['comma_format'] = lambda x: f"{int(x):,}" if x else "0"
+# ENVIRONMENT=production: compiled once at startup, never re-checked
+jinja_env = create_environment()
+if is_production():
+    precompile(jinja_env)
 
 def render(template_name: str, request: Request, **context):
     template = jinja_env.get_template(template_name)
     context["request"] = request
     return HTMLResponse(template.render(**context))
 
+def render_stream(template_name: str, request: Request, **context):
+    """Like render(), but the page is sent in chunks while it renders."""
+    context["request"] = request
+    return StreamingResponse(stream_template(jinja_env, template_name, context), media_type="text/html")
+
+# Testimonies per entity page
+ENTITY_PAGE_SIZE = int(os.getenv("ENTITY_PAGE_SIZE", "100"))
+
+# Rendered public pages, valid until the ledger version moves or a deploy changes the templates
+page_cache = PageCache(
+    max_entries=int(os.getenv("PAGE_CACHE_SIZE", "256")),
+    compress=os.getenv("PAGE_CACHE_GZIP", "1") == "1",
+    build=build_fingerprint(jinja_env)
+)
+
+def cached_page(request: Request, build):
+    """
+    Serve a public page through page_cache. The key includes today's date
+    because the pages print it.
+    """
+    key = f"{request.url.path}?{request.url.query}|{datetime.now().strftime('%Y-%m-%d')}"
+    return page_cache.serve(request, key, get_ledger().current_version(), build)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"] if os.getenv("ENVIRONMENT", "development") != "production" else [],
@@ -50,7 +76,15 @@ app.add_middleware(
 # Helper to check if ledger is ready
 def is_ledger_ready():
     ledger = get_ledger()
-    return ledger is not None
+    return ledger is not None and ledger.readiness.is_ready()
+
+@app.middleware("http")
+async def first_byte_timer(request: Request, call_next):
+    response = await call_next(request)
+    ledger = get_ledger()
+    if ledger is not None and ledger.readiness.timings["first_byte_ms"] is None:
+        ledger.readiness.mark_first_byte()
+    return response
 
 app.include_router(health.router)
 app.include_router(submissions.router)
@@ -59,13 +93,44 @@ app.include_router(aggregation.router)
 app.include_router(evidence.router)
 app.include_router(jury.router)
 app.include_router(admin.router)
+app.include_router(ledger_api.router)
+app.include_router(search.router)
+app.include_router(export.router)
+app.include_router(events.router)
+
+# Blob-SHA cache for the GitHub Data/ folder, shared by the import routes
+_github_source = None
+
+def get_github_source() -> GitHubDataSource:
+    global _github_source
+    if _github_source is None:
+        _github_source = GitHubDataSource(
+            default_data_dir() / "import_cache",
+            concurrency=int(os.getenv("IMPORT_CONCURRENCY", "8"))
+        )
+    return _github_source
+
+def github_error(e: httpx.HTTPStatusError) -> JSONResponse:
+    return JSONResponse(
+        status_code=e.response.status_code,
+        content={
+            "error": f"GitHub API error: {e.response.status_code}",
+            "details": e.response.text[:200] if e.response.text else "No details"
+        }
+    )
+
+async def publish_import(ledger, source: str, imported: int, **details):
+    """One `imported` event per import run that added anything, not one per entry."""
+    if imported:
+        await ledger.publish_event("imported", dict(source=source, imported=imported, **details))
 
 # ==================== PREVIEW IMPORT (DRY RUN, NO WRITES) ====================
 @app.get("/admin/import-preview")
-async def import_preview():
+async def import_preview(limit: int = 1000):
     """
     Dry run: fetch everything from GitHub, diff it against what's already
-    in the DB, and report what WOULD happen. Does not write anything —
+    in the DB (one pass: adds, changes, unchanged), and report what WOULD
+    happen. `limit` caps the rows listed per category. Does not write anything —
     no file writes, no git commits, no SQLite inserts. Use this to sanity
     check the pipeline before calling /admin/import-data for real.
     """
@@ -74,87 +139,28 @@ async def import_preview():
         if not ledger:
             return JSONResponse(status_code=503, content={"error": "Ledger not ready"})
 
-        headers = {
-            "User-Agent": "VowLedger-App/1.0",
-            "Accept": "application/vnd.github.v3+json"
-        }
-        api_url = "https://api.github.com/repos/Carrier0001/TheFirstCandle/contents/Data"
-
-        existing_ids = await ledger.get_existing_submission_ids()
+        try:
+            fetched = await get_github_source().fetch()
+        except httpx.HTTPStatusError as e:
+            return github_error(e)
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(api_url, timeout=30.0, headers=headers)
-            if response.status_code != 200:
-                return JSONResponse(
-                    status_code=response.status_code,
-                    content={"error": f"GitHub API error: {response.status_code}"}
-                )
-
-            files_data = response.json()
-            json_files = [f["name"] for f in files_data if f["name"].endswith(".json")]
-
-            to_add = []
-            already_exists = []
-            skipped_empty = []
-            file_errors = []
-
-            for filename in json_files:
-                try:
-                    raw_url = f"https://raw.githubusercontent.com/Carrier0001/TheFirstCandle/main/Data/{filename}"
-                    file_response = await client.get(raw_url, timeout=30.0, headers=headers)
-                    if file_response.status_code != 200:
-                        file_errors.append({"file": filename, "reason": f"HTTP {file_response.status_code}"})
-                        continue
-
-                    data = file_response.json()
-                    if "entity_id" not in data or "entries" not in data:
-                        file_errors.append({"file": filename, "reason": "missing entity_id/entries"})
-                        continue
-
-                    entity_id = data["entity_id"]
-                    entity_name = data.get("entity_name", entity_id.replace('_', ' ').title())
-
-                    for entry in data["entries"]:
-                        entry_id = entry.get("entry_id")
-
-                        if (entry.get("harm_ly", 0) == 0 and
-                            entry.get("surplus_ly", 0) == 0 and
-                            not entry.get("description")):
-                            skipped_empty.append(entry_id)
-                            continue
-
-                        if entry_id and entry_id in existing_ids:
-                            already_exists.append(entry_id)
-                        else:
-                            to_add.append({
-                                "entry_id": entry_id,
-                                "entity_id": entity_id,
-                                "entity_name": entity_name,
-                                "year": entry.get("year"),
-                                "description_preview": (entry.get("description", "") or "")[:120]
-                            })
-
-                except Exception as e:
-                    file_errors.append({"file": filename, "reason": str(e)})
-
-        return JSONResponse(content={
-            "files_checked": len(json_files),
-            "would_add": len(to_add),
-            "already_in_db": len(already_exists),
-            "skipped_empty": len(skipped_empty),
-            "file_errors": len(file_errors),
-            "to_add": to_add,
-            "already_in_db_ids": already_exists,
-            "file_error_details": file_errors
-        })
+        report = await preview_import(ledger, fetched["files"], detail_limit=max(0, limit))
+        report["files_checked"] = fetched["listed"]
+        report["downloads"] = fetched["downloads"]
+        report["file_errors"] += len(fetched["errors"])
+        report["file_error_details"] = fetched["errors"] + report["file_error_details"]
+        return JSONResponse(content=report)
 
     except Exception as e:
         return JSONResponse(status_code=500, content={"error": str(e)})
 
 # ==================== IMPORT DATA FROM GITHUB ====================
 @app.get("/admin/import-data")
-async def import_data_from_github():
-    """Import all JSON data from GitHub into the ledger"""
+async def import_data_from_github(full: bool = False):
+    """
+    Import JSON data from GitHub into the ledger. Files whose git blob SHA
+    is unchanged since the last import are skipped unless `full` is set.
+    """
     try:
         ledger = get_ledger()
         
@@ -164,108 +170,66 @@ async def import_data_from_github():
                 content={"error": "Ledger not ready"}
             )
         
-        # GitHub API headers to avoid rate limiting
-        headers = {
-            "User-Agent": "VowLedger-App/1.0",
-            "Accept": "application/vnd.github.v3+json"
-        }
+        source = get_github_source()
+        try:
+            fetched = await source.fetch(changed_only=not full)
+        except httpx.HTTPStatusError as e:
+            return github_error(e)
         
-        # GitHub API to get all JSON files
-        api_url = "https://api.github.com/repos/Carrier0001/TheFirstCandle/contents/Data"
+        if not fetched["listed"]:
+            return JSONResponse(
+                status_code=404,
+                content={"error": "No JSON files found in Data folder"}
+            )
         
-        async with httpx.AsyncClient() as client:
-            # Get list of files with proper headers
-            response = await client.get(api_url, timeout=30.0, headers=headers)
-            
-            if response.status_code != 200:
-                return JSONResponse(
-                    status_code=response.status_code,
-                    content={
-                        "error": f"GitHub API error: {response.status_code}",
-                        "details": response.text[:200] if response.text else "No details"
-                    }
-                )
-            
-            files_data = response.json()
-            json_files = [f["name"] for f in files_data if f["name"].endswith(".json")]
-            
-            if not json_files:
-                return JSONResponse(
-                    status_code=404,
-                    content={"error": "No JSON files found in Data folder"}
-                )
-            
-            imported = 0
-            skipped = 0
-            errors = 0
-            entities_imported = set()
+        imported = 0
+        skipped = 0
+        errors = len(fetched["errors"])
+        entities_imported = set()
+        batch = []
+        done = []
+        
+        for f in fetched["files"]:
+            data = f["data"]
             
-            for filename in json_files:
-                try:
-                    raw_url = f"https://raw.githubusercontent.com/Carrier0001/TheFirstCandle/main/Data/{filename}"
-                    file_response = await client.get(raw_url, timeout=30.0, headers=headers)
-                    
-                    if file_response.status_code != 200:
-                        errors += 1
+            if isinstance(data, dict) and "entity_id" in data and "entries" in data:
+                entity_id = data["entity_id"]
+                entity_name = data.get("entity_name", entity_id.replace('_', ' ').title())
+                entities_imported.add(entity_name)
+                
+                for entry in data["entries"]:
+                    # Skip entries with no harm/surplus
+                    if is_empty_entry(entry):
+                        skipped += 1
                         continue
                     
-                    data = file_response.json()
-                    
-                    if "entity_id" in data and "entries" in data:
-                        entity_id = data["entity_id"]
-                        entity_name = data.get("entity_name", entity_id.replace('_', ' ').title())
-                        entities_imported.add(entity_name)
-                        
-                        for entry in data["entries"]:
-                            # Skip entries with no harm/surplus
-                            if (entry.get("harm_ly", 0) == 0 and 
-                                entry.get("surplus_ly", 0) == 0 and 
-                                not entry.get("description")):
-                                skipped += 1
-                                continue
-                            
-                            submission = {
-                                "submission_id": entry.get("entry_id", str(uuid.uuid4())),
-                                "submission_hash": hashlib.sha256(
-                                    f"{entity_id}{entry.get('description', '')}{datetime.now()}".encode()
-                                ).hexdigest(),
-                                "entity_id": entity_id,
-                                "entity_name": entity_name,
-                                "title": f"{entity_name} - {entry.get('incident_type', 'Incident')}",
-                                "description": entry.get("description", ""),
-                                "incident_country": "Global",
-                                "incident_year": entry.get("year", 2025),
-                                "life_loss": abs(entry.get("harm_ly", 0)),
-                                "financial_loss": abs(entry.get("harm_ecy", 0)),
-                                "submitter_pubkey_hash": "web_import",
-                                "status": "APPROVED",
-                                "created_at": entry.get("date_logged", datetime.now().isoformat())
-                            }
-                            
-                            try:
-                                await ledger.submit_entry(submission)
-                                imported += 1
-                            except Exception as e:
-                                errors += 1
-                                
-                    else:
-                        errors += 1
-                        
-                except Exception as e:
-                    errors += 1
-            
-            # Get final count
-            all_submissions = await ledger.get_submissions()
-            
-            return JSONResponse(content={
-                "message": "Import completed successfully",
-                "imported": imported,
-                "skipped": skipped,
-                "errors": errors,
-                "files_processed": len(json_files),
-                "entities_imported": list(entities_imported),
-                "total_submissions": len(all_submissions)
-            })
+                    batch.append(legacy_submission(entity_id, entity_name, entry))
+                done.append(f)
+            else:
+                errors += 1
+        
+        # One bulk write: one commit, one pin per touched entity file
+        receipts = await ledger.submit_entries(batch)
+        duplicates = sum(1 for r in receipts if r["status"] == "DUPLICATE")
+        imported = len(receipts) - duplicates
+        source.mark_imported(done)
+        await publish_import(ledger, "github", imported, entities=len(entities_imported))
+        
+        # Get final count
+        counts = await ledger.count_submissions()
+        
+        return JSONResponse(content={
+            "message": "Import completed successfully",
+            "imported": imported,
+            "skipped": skipped,
+            "duplicates": duplicates,
+            "errors": errors,
+            "files_processed": len(fetched["files"]),
+            "files_unchanged": len(fetched["unchanged"]),
+            "downloads": fetched["downloads"],
+            "entities_imported": list(entities_imported),
+            "total_submissions": counts["total"]
+        })
             
     except Exception as e:
         return JSONResponse(
@@ -273,6 +237,28 @@ async def import_data_from_github():
             content={"error": str(e)}
         )
 
+# ==================== INCREMENTAL IMPORT FROM LOCAL Data/ ====================
+@app.get("/admin/import-local")
+async def import_local(dry_run: bool = False):
+    """
+    Import only what changed in the local Data/ folder (LEGACY_DATA_DIR)
+    since the last run, as recorded in the import manifest. No network.
+    """
+    try:
+        ledger = get_ledger()
+        if not ledger:
+            return JSONResponse(status_code=503, content={"error": "Ledger not ready"})
+        if not ledger.legacy_dir.is_dir():
+            return JSONResponse(status_code=404, content={"error": f"Data folder not found: {ledger.legacy_dir}"})
+        
+        report = await sync_data_dir(ledger, ledger.legacy_dir, ledger.data_dir / MANIFEST_NAME, dry_run=dry_run)
+        if not dry_run:
+            await publish_import(ledger, "local", report["submitted"], files_changed=report["files_changed"])
+        return JSONResponse(content=report)
+    
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
 # ==================== IMPORT SINGLE FILE (GROK AI) ====================
 @app.get("/admin/import-grok")
 async def import_grok():
@@ -299,31 +285,14 @@ async def import_grok():
                 entity_id = data["entity_id"]
                 entity_name = data["entity_name"]
                 
-                for entry in data["entries"]:
-                    if (entry.get("harm_ly", 0) == 0 and 
-                        entry.get("surplus_ly", 0) == 0 and 
-                        not entry.get("description")):
-                        continue
-                    
-                    submission = {
-                        "submission_id": entry.get("entry_id", str(uuid.uuid4())),
-                        "submission_hash": hashlib.sha256(
-                            f"{entity_id}{entry.get('description', '')}{datetime.now()}".encode()
-                        ).hexdigest(),
-                        "entity_id": entity_id,
-                        "entity_name": entity_name,
-                        "title": f"{entity_name} - {entry.get('incident_type', 'Incident')}",
-                        "description": entry.get("description", ""),
-                        "incident_country": "Global",
-                        "incident_year": entry.get("year", 2025),
-                        "life_loss": abs(entry.get("harm_ly", 0)),
-                        "financial_loss": abs(entry.get("harm_ecy", 0)),
-                        "submitter_pubkey_hash": "web_import",
-                        "status": "APPROVED",
-                        "created_at": entry.get("date_logged", datetime.now().isoformat())
-                    }
-                    await ledger.submit_entry(submission)
-                    imported += 1
+                batch = [
+                    legacy_submission(entity_id, entity_name, entry)
+                    for entry in data["entries"]
+                    if not is_empty_entry(entry)
+                ]
+                receipts = await ledger.submit_entries(batch)
+                imported = sum(1 for r in receipts if r["status"] != "DUPLICATE")
+                await publish_import(ledger, "github", imported, entities=1)
             
             return JSONResponse(content={
                 "message": f"✅ Imported {imported} entries for {entity_name}",
@@ -350,16 +319,18 @@ async def ledger_status():
                 content={"error": "Ledger not ready"}
             )
         
-        submissions = await ledger.get_submissions()
-        entities = set()
-        for sub in submissions:
-            entities.add(sub.get('entity_id'))
+        counts = await ledger.count_submissions()
+        entities = await ledger.list_entity_ids(limit=10)
         
         return JSONResponse(content={
             "ledger_ready": True,
-            "total_submissions": len(submissions),
-            "unique_entities": len(entities),
-            "entities": list(entities)[:10]  # Show first 10
+            "total_submissions": counts["total"],
+            "unique_entities": counts["entities"],
+            "entities": entities,  # Show first 10
+            "executor": ledger.executor.stats(),
+            "ipfs_pins": ledger.pins.stats() if ledger.pins else None,
+            "page_cache": page_cache.stats(),
+            "events": ledger.events.stats()
         })
         
     except Exception as e:
@@ -368,6 +339,28 @@ async def ledger_status():
             content={"error": str(e)}
         )
 
+# ==================== INTEGRITY SPOT-CHECK ====================
+@app.get("/admin/integrity")
+async def integrity_check(sample: int = 20):
+    """Compare random SQLite rows with their records in the entity files"""
+    try:
+        ledger = get_ledger()
+        
+        if not ledger:
+            return JSONResponse(
+                status_code=503,
+                content={"error": "Ledger not ready"}
+            )
+        
+        result = await ledger.spot_check(sample=min(max(sample, 1), 1000))
+        return JSONResponse(content=result)
+        
+    except Exception as e:
+        return JSONResponse(
+            status_code=500,
+            content={"error": str(e)}
+        )
+
 # ==================== TEST ROUTE ====================
 @app.get("/test")
 async def test_page(request: Request):
@@ -375,8 +368,8 @@ async def test_page(request: Request):
         return HTMLResponse("Ledger not ready", status_code=503)
     
     ledger = get_ledger()
-    submissions_list = await ledger.get_submissions()
-    return render("minimal.html", request, entity_count=len(submissions_list))
+    counts = await ledger.count_submissions()
+    return render("minimal.html", request, entity_count=counts["total"])
 
 # ==================== PUBLIC LEDGER (HOME) ====================
 @app.get("/", include_in_schema=False)
@@ -385,54 +378,16 @@ async def root(request: Request):
         return render("index.html", request, entities=[], current_date=datetime.now().strftime("%B %d, %Y"))
     
     ledger = get_ledger()
-    submissions_list = await ledger.get_submissions()
-    
-    # Aggregate submissions by entity
-    entity_aggregates = {}
-    for sub in submissions_list:
-        if sub.get('status') == 'APPROVED':
-            entity_id = sub.get('entity_id')
-            if not entity_id:
-                continue
-            if entity_id not in entity_aggregates:
-                entity_aggregates[entity_id] = {
-                    "entity_id": entity_id,
-                    "entity_name": sub.get('entity_name', 'Unknown'),
-                    "total_entries": 0,
-                    "total_harm_ly": 0,
-                    "total_harm_ecy": 0,
-                    "last_entry": None
-                }
-            
-            entity_aggregates[entity_id]["total_entries"] += 1
-            entity_aggregates[entity_id]["total_harm_ly"] += abs(sub.get('life_loss', 0))
-            entity_aggregates[entity_id]["total_harm_ecy"] += abs(sub.get('financial_loss', 0))
-            created_at = sub.get('created_at')
-            if created_at and (entity_aggregates[entity_id]["last_entry"] is None or created_at > entity_aggregates[entity_id]["last_entry"]):
-                entity_aggregates[entity_id]["last_entry"] = created_at
-    
-    entities_list = []
-    for entity_id, data in entity_aggregates.items():
-        entities_list.append({
-            "entity_id": data["entity_id"],
-            "entity_name": data["entity_name"],
-            "lifetime": {
-                "outstanding_ly": data["total_harm_ly"],
-                "outstanding_ecy": data["total_harm_ecy"]
-            },
-            "total_entries": data["total_entries"],
-            "measurement_date": data["last_entry"].strftime("%Y-%m-%d") if data["last_entry"] else datetime.now().strftime("%Y-%m-%d"),
-            "has_systemic": False
-        })
     
-    # Sort by harm (most harmful first)
-    entities_list.sort(key=lambda x: x["lifetime"]["outstanding_ly"], reverse=True)
+    async def build():
+        # Per-entity totals over approved submissions, aggregated in SQL
+        return render_stream("index.html", request, **await home_context(ledger))
     
-    return render("index.html", request, entities=entities_list, current_date=datetime.now().strftime("%B %d, %Y"))
+    return await cached_page(request, build)
 
 # ==================== ENTITY DETAIL PAGE ====================
 @app.get("/entity/{entity_id}", include_in_schema=False)
-async def entity_page(request: Request, entity_id: str):
+async def entity_page(request: Request, entity_id: str, cursor: str = None):
     if not is_ledger_ready():
         return render("entity.html", request, entity={
             "entity_id": entity_id,
@@ -444,39 +399,27 @@ async def entity_page(request: Request, entity_id: str):
         })
     
     ledger = get_ledger()
-    submissions_list = await ledger.get_submissions(entity_id)
-    
-    if not submissions_list:
-        raise HTTPException(status_code=404, detail="Entity not found")
-    
-    # Filter only approved submissions
-    approved_submissions = [s for s in submissions_list if s.get('status') == 'APPROVED']
-    
-    if not approved_submissions:
-        raise HTTPException(status_code=404, detail="No approved submissions found for this entity")
     
-    entity_data = {
-        "entity_id": entity_id,
-        "entity_name": approved_submissions[0].get('entity_name', 'Unknown'),
-        "entity_state": "ACTIVE",
-        "measurement_date": datetime.now().strftime("%Y-%m-%d"),
-        "entries": [],
-        "aggregated_entries": []
-    }
-    
-    for sub in approved_submissions:
-        entity_data["entries"].append({
-            "entry_id": sub.get('submission_id', ''),
-            "year": sub.get('incident_year', 0),
-            "description": sub.get('description', ''),
-            "harm_ly": sub.get('life_loss', 0),
-            "harm_ecy": sub.get('financial_loss', 0.0),
-            "intent_type": "NEGLIGENCE",
-            "confidence": "MEDIUM",
-            "evidence_hashes": []
-        })
+    async def build():
+        # Totals come from entity_aggregates; only one page of testimonies is loaded
+        try:
+            context = await entity_context(ledger, entity_id, cursor, ENTITY_PAGE_SIZE)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if context is None:
+            counts = await ledger.count_submissions(entity_id=entity_id)
+            if not counts["total"]:
+                raise HTTPException(status_code=404, detail="Entity not found")
+            raise HTTPException(status_code=404, detail="No approved submissions found for this entity")
+        
+        entity_data = context["entity"]
+        if cursor:
+            entity_data["first_url"] = f"/entity/{entity_id}"
+        if context["next_cursor"]:
+            entity_data["next_url"] = f"/entity/{entity_id}?cursor={context['next_cursor']}"
+        return render_stream("entity.html", request, entity=entity_data)
     
-    return render("entity.html", request, entity=entity_data)
+    return await cached_page(request, build)
 
 # ==================== INDIVIDUAL ENTRY PAGE ====================
 @app.get("/entity/{entity_id}/entry/{entry_id}", include_in_schema=False)
@@ -485,29 +428,16 @@ async def entry_page(request: Request, entity_id: str, entry_id: str):
         raise HTTPException(status_code=503, detail="Ledger initializing, please refresh")
     
     ledger = get_ledger()
-    submission = await ledger.get_submission(entry_id)
-    
-    if not submission or submission.get('entity_id') != entity_id or submission.get('status') != 'APPROVED':
-        raise HTTPException(status_code=404, detail="Entry not found")
-    
-    entry_data = {
-        "entry_id": submission.get('submission_id', ''),
-        "year": submission.get('incident_year', 0),
-        "description": submission.get('description', ''),
-        "harm_ly": submission.get('life_loss', 0),
-        "harm_ecy": submission.get('financial_loss', 0.0),
-        "intent_type": "NEGLIGENCE",
-        "confidence": "MEDIUM",
-        "evidence_hashes": [],
-        "external_links": []
-    }
     
-    entity_data = {
-        "entity_id": submission.get('entity_id', ''),
-        "entity_name": submission.get('entity_name', 'Unknown')
-    }
+    async def build():
+        submission = await ledger.get_submission(entry_id)
+        
+        if not submission or submission.get('entity_id') != entity_id or submission.get('status') != 'APPROVED':
+            raise HTTPException(status_code=404, detail="Entry not found")
+        
+        return render("entry_view.html", request, **entry_context(submission))
     
-    return render("entry.html", request, entry=entry_data, entity=entity_data)
+    return await cached_page(request, build)
 
 # ==================== INFO PAGES ====================
 @app.get("/info", include_in_schema=False)
@@ -531,8 +461,44 @@ async def success(request: Request, submission_id: str = None, entity_name: str
 # Your admin secret (use environment variable)
 ADMIN_SECRET = os.getenv("ADMIN_SECRET", "admin123")
 
+@app.get("/admin/{secret}/search")
+async def admin_search(secret: str, q: str, status: str = "PENDING_JURY", entity_id: str = None,
+                       cursor: str = None, limit: int = 20):
+    """Full-text search over any status, for reviewers (public /api/v1/search is APPROVED only)"""
+    if secret != ADMIN_SECRET:
+        raise HTTPException(status_code=403, detail="Invalid admin secret")
+    if status not in ("APPROVED", "PENDING_JURY", "REJECTED"):
+        raise HTTPException(status_code=400, detail="status must be APPROVED, PENDING_JURY or REJECTED")
+    ledger = get_ledger()
+    if not ledger:
+        raise HTTPException(status_code=503, detail="Ledger not ready")
+    try:
+        return await ledger.search_submissions(q, status=status, entity_id=entity_id,
+                                               cursor=cursor, limit=max(1, min(limit, 100)))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/admin/{secret}/snapshot.npz")
+async def admin_snapshot(secret: str):
+    """Columnar snapshot of every submission, pending and rejected included"""
+    if secret != ADMIN_SECRET:
+        raise HTTPException(status_code=403, detail="Invalid admin secret")
+    ledger = get_ledger()
+    if not ledger:
+        raise HTTPException(status_code=503, detail="Ledger not ready")
+    path = await ledger.snapshot_npz(full=True)
+    return FileResponse(path, media_type="application/octet-stream", filename="ledger-full.npz")
+
+@app.get("/admin/{secret}/events")
+async def admin_events(request: Request, secret: str, types: str = None, last_event_id: int = None,
+                       last_event_id_header: str = Header(None, alias="Last-Event-ID")):
+    """The /api/v1/events feed plus submitted and rejected events"""
+    if secret != ADMIN_SECRET:
+        raise HTTPException(status_code=403, detail="Invalid admin secret")
+    return events.event_stream(request, events.EVENT_TYPES, types, last_event_id, last_event_id_header)
+
 @app.get("/admin/{secret}/pending")
-async def admin_pending(request: Request, secret: str):
+async def admin_pending(request: Request, secret: str, cursor: str = None):
     """View pending submissions (admin UI)"""
     
     # Security check
@@ -543,11 +509,13 @@ async def admin_pending(request: Request, secret: str):
     if not ledger:
         return render("error.html", request, error="Ledger not ready")
     
-    # Get all submissions
-    all_submissions = await ledger.get_submissions()
-    
-    # Filter pending ones
-    pending = [s for s in all_submissions if s.get('status') == 'PENDING_JURY']
+    # One page of pending submissions, newest first
+    try:
+        page = await ledger.query_submissions(status="PENDING_JURY", cursor=cursor, limit=50)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    pending = page["items"]
+    total_pending = (await ledger.count_submissions(status="PENDING_JURY"))["total"]
     
     # Format for the template - matches exactly what your template expects
     formatted_submissions = []
@@ -588,6 +556,8 @@ async def admin_pending(request: Request, secret: str):
     
     return render("admin_pending.html", request, 
                   submissions=formatted_submissions,
+                  total_pending=total_pending,
+                  next_cursor=page["next_cursor"],
                   secret=secret)
 
 @app.get("/admin/{secret}/review/{submission_id}")
@@ -679,16 +649,6 @@ async def admin_approve(request: Request, secret: str, submission_id: str):
     if submission.get('status') != 'PENDING_JURY':
         raise HTTPException(status_code=400, detail="Submission is not pending")
     
-    # Update with form data
-    import sqlite3
-    db_path = Path("./ledger/ledger.db")
-    
-    if not db_path.exists():
-        return render("error.html", request, error="Database not found")
-    
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
     # Get updated values from form
     life_loss = int(form.get("life", submission.get('life_loss', 0)) or 0)
     financial_loss = float(form.get("financial", submission.get('financial_loss', 0)) or 0)
@@ -697,17 +657,8 @@ async def admin_approve(request: Request, secret: str, submission_id: str):
     flag_spam = "flag_spam" in form
     
     # Update the submission
-    cursor.execute("""
-        UPDATE submissions 
-        SET life_loss = ?,
-            financial_loss = ?,
-            intent_type = ?,
-            status = 'APPROVED'
-        WHERE submission_id = ?
-    """, (life_loss, financial_loss, intent_type, submission_id))
-    
-    conn.commit()
-    conn.close()
+    if not await ledger.approve_submission(submission_id, life_loss, financial_loss, intent_type):
+        raise HTTPException(status_code=400, detail="Submission is not pending")
     
     # Get updated submission
     updated = await ledger.get_submission(submission_id)
@@ -757,23 +708,8 @@ async def admin_reject(request: Request, secret: str, submission_id: str):
         raise HTTPException(status_code=400, detail="Submission is not pending")
     
     # Update status to REJECTED
-    import sqlite3
-    db_path = Path("./ledger/ledger.db")
-    
-    if not db_path.exists():
-        return render("error.html", request, error="Database not found")
-    
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        UPDATE submissions 
-        SET status = 'REJECTED'
-        WHERE submission_id = ?
-    """, (submission_id,))
-    
-    conn.commit()
-    conn.close()
+    if not await ledger.reject_submission(submission_id):
+        raise HTTPException(status_code=400, detail="Submission is not pending")
     
     return HTMLResponse(f"""
     <!DOCTYPE html>
@@ -826,7 +762,7 @@ async def create_test_pending(request: Request, secret: str):
         "created_at": datetime.now().isoformat()
     }
     
-    await ledger.submit_entry(test_submission)
+    await ledger.submit_entries([test_submission])
     
     return HTMLResponse(f"""
     <!DOCTYPE html>
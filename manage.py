@@ -0,0 +1,221 @@
+# manage.py - Maintenance commands for the ledger
+import sys
+import json
+import asyncio
+import argparse
+from pathlib import Path
+
+from app.core.aggregates import aggregate_schema_problems, init_aggregates, rebuild_aggregates, verify_aggregates
+from app.core.database import DistributedLedger, default_data_dir
+from app.core.local_import import MANIFEST_NAME, sync_data_dir
+from app.core.rebuild import rebuild_ledger_db
+from app.core.snapshot import export_snapshot, pack_npz, snapshot_lock
+from app.core.static_site import build_static
+from app.core.sqlite_db import LedgerDB
+from app.core.templates import TEMPLATE_DIR, create_environment, precompile
+
+
+def open_db(args) -> LedgerDB:
+    db_path = Path(args.data_dir) / "ledger.db"
+    if not db_path.exists():
+        print(f"❌ Database not found at {db_path}. Run the app once first.")
+        sys.exit(2)
+    return LedgerDB(db_path, readers=1)
+
+
+def cmd_verify_aggregates(args) -> int:
+    """Recompute entity_aggregates from submissions and report drift."""
+    db = open_db(args)
+    try:
+        # Check the db as it is; only --fix may create, repair or rebuild anything
+        with db.reader() as conn:
+            schema = aggregate_schema_problems(conn)
+            drift = [] if "entity_aggregates table missing" in schema else verify_aggregates(conn)
+        if (schema or drift) and args.fix:
+            with db.writer() as conn:
+                init_aggregates(conn)
+                rebuild_aggregates(conn)
+
+        if not schema and not drift:
+            print("✅ entity_aggregates matches submissions")
+            return 0
+
+        for problem in schema:
+            print(f"⚠️ {problem}")
+        if drift:
+            print(f"⚠️ {len(drift)} entities drifted:")
+        for d in drift:
+            print(f"  {d['entity_id']}: {d['problem']}")
+            for field, values in d.get("fields", {}).items():
+                print(f"    {field}: stored={values['stored']!r} expected={values['expected']!r}")
+        if args.json:
+            print(json.dumps({"schema": schema, "drift": drift}, indent=2, default=str))
+        if args.fix:
+            print("🔧 Rebuilt entity_aggregates from scratch")
+            return 0
+        return 1
+    finally:
+        db.close()
+
+
+def cmd_export_snapshot(args) -> int:
+    """Write a columnar NumPy snapshot (.npy columns, optional .npz)."""
+    db = open_db(args)
+    out = Path(args.out or Path(args.data_dir) / "snapshots" / "latest")
+    try:
+        # Same lock as the app's snapshot endpoint, which may be writing next to it
+        with snapshot_lock(out.parent), db.reader() as conn:
+            manifest = export_snapshot(conn, out, Path(args.legacy_dir),
+                                       statuses=None if args.all_statuses else ("APPROVED",))
+            npz = pack_npz(out, Path(args.npz)) if args.npz else None
+    finally:
+        db.close()
+    for table, meta in manifest["tables"].items():
+        print(f"✅ {table}: {meta['rows']} rows, {len(meta['columns'])} columns")
+    if npz:
+        print(f"📦 {npz}")
+    print(f"📁 {out}")
+    return 0
+
+
+def cmd_rebuild_index(args) -> int:
+    """Rebuild ledger.db from entities/*.json (stop the app first)."""
+    entities = Path(args.data_dir) / "entities"
+    if not entities.is_dir():
+        print(f"❌ No entity files at {entities}")
+        return 2
+    print(f"🔄 Rebuilding {Path(args.data_dir) / 'ledger.db'} from {entities} ...")
+    report = rebuild_ledger_db(Path(args.data_dir), workers=args.workers, swap=not args.dry_run,
+                               allow_pending=args.allow_pending)
+
+    print(f"📁 {report['files']} files -> {report['rows']} rows, {report['events']} jury events "
+          f"({report['duplicates']} duplicates, {report['bad_lines']} unreadable lines)")
+    for table, n in report["carried_over"].items():
+        print(f"  ↪ carried over {n} rows of {table}")
+    if report["old_rows"] is not None:
+        print(f"🔎 old ledger.db had {report['old_rows']} rows, {len(report['missing'])} missing from the rebuild, "
+              f"{report['restored_reviews']} jury decisions restored from it")
+    print(f"⏱️ parse {report['parse_seconds']}s, load {report['load_seconds']}s, total {report['total_seconds']}s")
+    if report["problems"]:
+        print("❌ Verification failed; the live ledger.db was not replaced:")
+        for problem in report["problems"]:
+            print(f"  - {problem}")
+        print(f"  rebuilt copy left at {report['path']}")
+        return 1
+    if report["swapped"]:
+        print(f"✅ Verified and swapped in {report['path']}" +
+              (f" (previous db kept at {report['backup']})" if report.get("backup") else ""))
+    else:
+        print(f"✅ Verified; rebuilt copy at {report['path']} (dry run, not swapped in)")
+    return 0
+
+
+def cmd_import_local(args) -> int:
+    """Import what changed in the local Data/ folder since the last run (stop the app first)."""
+    data = Path(args.data)
+    if not data.is_dir():
+        print(f"❌ Data folder not found: {data}")
+        return 2
+
+    async def run():
+        ledger = DistributedLedger(Path(args.data_dir))
+        try:
+            return await sync_data_dir(ledger, data, Path(args.data_dir) / MANIFEST_NAME, dry_run=args.dry_run)
+        finally:
+            ledger.close()
+
+    report = asyncio.run(run())
+    print(f"📁 {report['files_changed']} files changed, {report['files_unchanged']} unchanged")
+    print(f"  ➕ {report['added']} added, ✏️ {report['changed']} changed, ➖ {report['removed']} removed")
+    for error in report["errors"]:
+        print(f"  ❌ {error['file']}: {error['reason']}")
+    if args.dry_run:
+        for op in report["preview"]:
+            print(f"    {op['op']:8} {op['file']} {op['key']}")
+        print("✅ Dry run, nothing written")
+    else:
+        print(f"✅ {report['submitted']} submitted, {report['duplicates']} already in the ledger, "
+              f"{report['withdrawn']} withdrawn, {report['kept_reviewed']} already reviewed and kept")
+    return 1 if report["errors"] else 0
+
+
+def cmd_compile_templates(args) -> int:
+    """Compile every template into a bytecode cache (for TEMPLATE_BYTECODE_DIR)."""
+    env = create_environment(args.templates, production=True, bytecode_dir=args.out)
+    loaded = precompile(env)
+    total = len(env.list_templates(extensions=["html", "xml"]))
+    print(f"{'✅' if loaded == total else '⚠️'} Compiled {loaded}/{total} templates into {args.out}")
+    return 0 if loaded == total else 1
+
+
+def cmd_build_static(args) -> int:
+    """Render the public pages into static HTML/JSON; only changed entities are rebuilt."""
+    out = Path(args.out) if args.out else Path(args.data_dir) / "site"
+    env = create_environment(args.templates, production=True)
+
+    async def run():
+        ledger = DistributedLedger(Path(args.data_dir))
+        try:
+            return await build_static(ledger, env, out, page_size=args.page_size, full=args.full)
+        finally:
+            ledger.close()
+
+    report = asyncio.run(run())
+    if report["skipped"]:
+        print(f"✅ {out} is current (ledger version {report['version']}), nothing to do")
+        return 0
+    print(f"🏗️ {report['entities_built']} entities rebuilt, {report['entities_unchanged']} unchanged, "
+          f"{report['entities_removed']} removed")
+    print(f"✅ {report['pages_written']} pages written to {out}")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Ledger maintenance commands")
+    parser.add_argument("--data-dir", default=str(default_data_dir()),
+                        help="Ledger directory holding ledger.db (default: %(default)s)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    verify = commands.add_parser("verify-aggregates", help=cmd_verify_aggregates.__doc__)
+    verify.add_argument("--fix", action="store_true", help="Rebuild the table when drift is found")
+    verify.add_argument("--json", action="store_true", help="Also print the drift report as JSON")
+    verify.set_defaults(func=cmd_verify_aggregates)
+
+    export = commands.add_parser("export-snapshot", help=cmd_export_snapshot.__doc__)
+    export.add_argument("--out", help="Snapshot directory (default: <data-dir>/snapshots/latest)")
+    export.add_argument("--legacy-dir", default="Data", help="Legacy entity JSON folder (default: %(default)s)")
+    export.add_argument("--npz", help="Also bundle the snapshot into this .npz file")
+    export.add_argument("--all-statuses", action="store_true",
+                        help="Include pending and rejected submissions (not for publishing)")
+    export.set_defaults(func=cmd_export_snapshot)
+
+    rebuild = commands.add_parser("rebuild-index", help=cmd_rebuild_index.__doc__)
+    rebuild.add_argument("--workers", type=int, default=None, help="Parser processes (default: CPU count)")
+    rebuild.add_argument("--dry-run", action="store_true", help="Build and verify ledger.db.rebuild without swapping it in")
+    rebuild.add_argument("--allow-pending", action="store_true",
+                         help="Without a readable old ledger.db, accept rows with no jury event as PENDING_JURY")
+    rebuild.set_defaults(func=cmd_rebuild_index)
+
+    local = commands.add_parser("import-local", help=cmd_import_local.__doc__)
+    local.add_argument("--data", default="Data", help="Legacy entity JSON folder (default: %(default)s)")
+    local.add_argument("--dry-run", action="store_true", help="Only report the diff")
+    local.set_defaults(func=cmd_import_local)
+
+    compile_templates = commands.add_parser("compile-templates", help=cmd_compile_templates.__doc__)
+    compile_templates.add_argument("--templates", default=TEMPLATE_DIR, help="Template folder (default: %(default)s)")
+    compile_templates.add_argument("--out", required=True, help="Bytecode cache directory")
+    compile_templates.set_defaults(func=cmd_compile_templates)
+
+    static = commands.add_parser("build-static", help=cmd_build_static.__doc__)
+    static.add_argument("--out", help="Site directory (default: <data-dir>/site)")
+    static.add_argument("--templates", default=TEMPLATE_DIR, help="Template folder (default: %(default)s)")
+    static.add_argument("--page-size", type=int, default=100, help="Testimonies per entity page (default: %(default)s)")
+    static.add_argument("--full", action="store_true", help="Rebuild every page, ignoring the build manifest")
+    static.set_defaults(func=cmd_build_static)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
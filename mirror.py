@@ -6,6 +6,8 @@ from datetime import datetime
 
 REPO = "Carrier0001/TheFirstCandle"
 FOLDER = os.path.dirname(__file__) or "."
+# Static copy for the content mirrors (Arweave/IPFS/torrent): `python manage.py build-static --out site`
+SITE = os.getenv("MIRROR_SITE_DIR", ".")
 
 print("THE LEDGER — ONE-CLICK MIRROR PACK")
 print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
@@ -20,7 +22,7 @@ print("   → Pushed to github.com/%s" % REPO)
 # 2. Arweave (permanent, pay-once-forever)
 print("2 → Arweave (permanent storage)")
 try:
-    result = subprocess.check_output("arweave deploy-dir . --wallet ~/.arweave_wallet.json", shell=True)
+    result = subprocess.check_output("arweave deploy-dir %s --wallet ~/.arweave_wallet.json" % SITE, shell=True)
     tx = result.decode().split("https://arweave.net/")[1].split()[0]
     print(f"   → https://arweave.net/{tx}")
 except:
@@ -29,7 +31,7 @@ except:
 # 3. IPFS + Pinata (free permanent pinning)
 print("3 → IPFS + Pinata")
 try:
-    os.system("ipfs-add . > ipfs.txt")
+    os.system("ipfs-add %s > ipfs.txt" % SITE)
     cid = open("ipfs.txt").read().strip()
     print(f"   → ipfs://{cid}")
     print(f"   → https://gateway.pinata.cloud/ipfs/{cid}")
@@ -38,7 +40,7 @@ except:
 
 # 4. Torrent
 print("4 → Torrent")
-os.system("transmission-create -o TheLedger.torrent -t udp://tracker.opentrackr.org:1337 .")
+os.system("transmission-create -o TheLedger.torrent -t udp://tracker.opentrackr.org:1337 %s" % SITE)
 print("   → TheLedger.torrent created — seed it!")
 
 # 5. GitLab Mirror (auto-mirror)
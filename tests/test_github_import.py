@@ -0,0 +1,153 @@
+# tests/test_github_import.py - GitHubDataSource against a stub GitHub
+import asyncio
+import hashlib
+import json
+
+import httpx
+import pytest
+
+from app.core.github_import import GitHubDataSource, git_blob_sha
+
+API = "https://api.github.test"
+RAW = "https://raw.github.test"
+
+
+class StubGitHub:
+    """Contents API listing plus raw files, both honouring If-None-Match."""
+
+    def __init__(self, files):
+        self.files = dict(files)
+        self.no_sha = set()         # listed without a blob SHA
+        self.broken = set()         # raw download answers 500
+        self.requests = []
+
+    def listing(self):
+        return [
+            {"name": name, "sha": None if name in self.no_sha else git_blob_sha(data),
+             "download_url": f"{RAW}/owner/repo/main/Data/{name}"}
+            for name, data in sorted(self.files.items())
+        ] + [{"name": "README.md", "sha": "0" * 40, "download_url": f"{RAW}/owner/repo/main/Data/README.md"}]
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        match = request.headers.get("if-none-match")
+        if request.url.host == "api.github.test":
+            body = json.dumps(self.listing()).encode()
+            etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+            status = 304 if match == etag else 200
+            self.requests.append(("list", status))
+            return httpx.Response(status, content=b"" if status == 304 else body, headers={"ETag": etag})
+        name = request.url.path.rsplit("/", 1)[1]
+        if name in self.broken:
+            self.requests.append((name, 500))
+            return httpx.Response(500)
+        data = self.files[name]
+        etag = f'"{git_blob_sha(data)[:16]}"'
+        status = 304 if match == etag else 200
+        self.requests.append((name, status))
+        return httpx.Response(status, content=b"" if status == 304 else data, headers={"ETag": etag})
+
+    def take(self):
+        requests, self.requests = self.requests, []
+        return requests
+
+
+def entity(entity_id, entries=1):
+    return json.dumps({"entity_id": entity_id, "entries": [{"entry_id": f"{entity_id}-{i}"} for i in range(entries)]}).encode()
+
+
+@pytest.fixture
+def github():
+    return StubGitHub({"a.json": entity("a"), "b.json": entity("b"), "c.json": entity("c")})
+
+
+def fetch(source, github, **kwargs):
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(github)) as client:
+            return await source.fetch(client=client, **kwargs)
+    return asyncio.run(run())
+
+
+def make_source(tmp_path):
+    return GitHubDataSource(tmp_path / "cache", repo="owner/repo", branch="main",
+                            api_url=API, raw_url=RAW, token="")
+
+
+def test_listing_etag_and_blob_cache(tmp_path, github):
+    source = make_source(tmp_path)
+    first = fetch(source, github)
+    assert sorted(f["name"] for f in first["files"]) == ["a.json", "b.json", "c.json"]
+    assert first["files"][0]["data"]["entity_id"] == "a"
+    assert (first["listed"], first["downloads"], first["cache_hits"]) == (3, 3, 0)
+    assert sorted(github.take()) == [("a.json", 200), ("b.json", 200), ("c.json", 200), ("list", 200)]
+
+    # Same listing: 304, and every body comes from the blob cache without a request
+    second = make_source(tmp_path)
+    again = fetch(second, github)
+    assert github.take() == [("list", 304)]
+    assert (again["downloads"], again["cache_hits"]) == (0, 3)
+    assert [f["data"] for f in again["files"]] == [f["data"] for f in first["files"]]
+
+    # One file changed: new listing, only that file is downloaded
+    github.files["b.json"] = entity("b", entries=2)
+    changed = fetch(second, github)
+    assert sorted(github.take()) == [("b.json", 200), ("list", 200)]
+    assert (changed["downloads"], changed["cache_hits"]) == (1, 2)
+    assert sorted(p.stem for p in (tmp_path / "cache" / "blobs").glob("*.json")) == sorted(
+        git_blob_sha(data) for data in github.files.values()
+    )
+
+
+def test_raw_etag_when_listing_has_no_sha(tmp_path, github):
+    github.no_sha.add("a.json")
+    source = make_source(tmp_path)
+    fetch(source, github)
+    github.take()
+    github.files["c.json"] = entity("c", entries=3)     # new listing ETag, a.json still without a SHA
+    result = fetch(source, github)
+    assert ("a.json", 304) in github.take()
+    assert result["not_modified"] == 1
+    assert next(f for f in result["files"] if f["name"] == "a.json")["data"]["entity_id"] == "a"
+
+
+def test_changed_only_skips_imported_files(tmp_path, github):
+    source = make_source(tmp_path)
+    source.mark_imported(fetch(source, github)["files"])
+    github.take()
+
+    nothing = fetch(make_source(tmp_path), github, changed_only=True)
+    assert nothing["files"] == []
+    assert sorted(nothing["unchanged"]) == ["a.json", "b.json", "c.json"]
+    assert github.take() == [("list", 304)]
+
+    github.files["c.json"] = entity("c", entries=2)
+    result = fetch(source, github, changed_only=True)
+    assert [f["name"] for f in result["files"]] == ["c.json"]
+    assert sorted(result["unchanged"]) == ["a.json", "b.json"]
+
+    # Without changed_only everything is returned again, from the cache
+    everything = fetch(source, github)
+    assert len(everything["files"]) == 3 and everything["downloads"] == 0
+
+
+def test_per_file_errors_do_not_fail_the_fetch(tmp_path, github):
+    github.files["bad.json"] = b"{not json"
+    github.broken.add("b.json")
+    result = fetch(make_source(tmp_path), github)
+    assert sorted(f["name"] for f in result["files"]) == ["a.json", "c.json"]
+    errors = {e["file"]: e["reason"] for e in result["errors"]}
+    assert errors["b.json"] == "HTTP 500"
+    assert errors["bad.json"].startswith("invalid JSON")
+
+    # The failed file is retried on the next run
+    github.broken.clear()
+    retry = fetch(make_source(tmp_path), github)
+    assert sorted(f["name"] for f in retry["files"]) == ["a.json", "b.json", "c.json"]
+    assert ("b.json", 200) in github.take()
+
+
+def test_listing_failure_raises(tmp_path):
+    def unavailable(request):
+        return httpx.Response(403, json={"message": "rate limited"})
+    source = make_source(tmp_path)
+    with pytest.raises(httpx.HTTPStatusError):
+        fetch(source, unavailable)
@@ -0,0 +1,37 @@
+# tests/test_harm_calculator.py - Vectorised views agree with summing the entries one by one
+import math
+import random
+
+from harm_calculator import EntryTable, LedgerCalculator, LedgerEntry
+
+
+def entries(n, ints):
+    r = random.Random(n)
+    return [
+        LedgerEntry(entry_id=str(i), entity_id="E", year=r.randint(1990, 2025), date_logged="",
+                    harm_ly=-r.random() * 1e3, harm_ecy=-r.random(),
+                    surplus_ly=r.randint(0, 50) if ints else r.random() * 3.3,
+                    surplus_ecy=r.randint(0, 5) if ints else r.random(),
+                    harm_type=r.choice(["NEGLIGENCE", "COVER_UP", "bogus"]))
+        for i in range(n)
+    ]
+
+
+def test_sums_match_entry_sums():
+    es = entries(5000, ints=False)
+    view = LedgerCalculator.calculate_lifetime_view(es)
+    assert math.isclose(view.harm_ly, sum(e.amplified_harm()["harm_ly"] for e in es), rel_tol=1e-12)
+    assert math.isclose(view.surplus_ly, sum(e.surplus_ly for e in es), rel_tol=1e-12)
+    for v in LedgerCalculator.calculate_annual_series(es).views:
+        assert math.isclose(v.surplus_ecy, sum(e.surplus_ecy for e in es if e.year == v.year), rel_tol=1e-12)
+
+
+def test_integer_surplus_sums_stay_ints():
+    es = entries(500, ints=True)
+    table = EntryTable.from_entries(es)
+    view = LedgerCalculator.calculate_lifetime_view(table)
+    assert view.surplus_ly == sum(e.surplus_ly for e in es) and type(view.surplus_ly) is int
+    series = LedgerCalculator.calculate_annual_series(table)
+    assert all(type(v.surplus_ecy) is int for v in series.views)
+    assert type(LedgerCalculator.calculate_annual_view(table, 1900).surplus_ly) is int
+    assert type(LedgerCalculator.calculate_lifetime_view(entries(50, ints=False)).surplus_ly) is float
@@ -0,0 +1,41 @@
+# tests/test_import_preview.py - The preview classifies entries the way the import treats them
+import asyncio
+import sqlite3
+
+import pytest
+
+from app.core.database import DistributedLedger
+from app.core.import_preview import preview_import
+from app.core.legacy import legacy_submission
+
+
+def legacy_file(entries):
+    return [{"name": "acme.json", "data": {"entity_id": "acme", "entity_name": "Acme", "entries": entries}}]
+
+
+def entry(i, harm=-2.0):
+    return {"entry_id": f"e{i}", "year": 2001, "description": f"incident {i}",
+            "incident_type": "NEGLIGENCE", "harm_ly": harm, "harm_ecy": -0.5, "date_logged": "2020-01-01"}
+
+
+@pytest.fixture
+def ledger(tmp_path, monkeypatch):
+    monkeypatch.setenv("LEDGER_GIT_BATCH_MS", "10")
+    monkeypatch.setenv("IPFS_API_URL", "http://127.0.0.1:9")
+    ledger = DistributedLedger(tmp_path, background=False)
+    yield ledger
+    ledger.close()
+
+
+def test_rows_with_pre_deterministic_hashes(ledger, tmp_path):
+    async def run():
+        await ledger.submit_entries([legacy_submission("acme", "Acme", entry(i)) for i in range(3)])
+        # As imported before submission_hash was derived from the content
+        with sqlite3.connect(tmp_path / "ledger.db") as conn:
+            conn.execute("UPDATE submissions SET submission_hash = 'random-' || submission_id")
+        return await preview_import(ledger, legacy_file([entry(0), entry(1, harm=-9.0), entry(3)]))
+
+    report = asyncio.run(run())
+    assert report["already_in_db_ids"] == ["e0"]
+    assert [r["entry_id"] for r in report["to_change"]] == ["e1"]
+    assert [r["entry_id"] for r in report["to_add"]] == ["e3"]
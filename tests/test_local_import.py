@@ -0,0 +1,45 @@
+# tests/test_local_import.py - The manifest and the ledger agree on what an entry's content is
+import asyncio
+import json
+import sqlite3
+
+from app.core.database import DistributedLedger
+from app.core.local_import import load_manifest, sync_data_dir
+
+
+def write(data_dir, entries):
+    (data_dir / "acme.json").write_text(json.dumps({"entity_id": "acme", "entity_name": "Acme", "entries": entries}))
+
+
+def entry(i, **fields):
+    return dict({"entry_id": f"e{i}", "year": 2001, "description": f"incident {i}", "incident_type": "NEGLIGENCE",
+                 "harm_ly": -2.0, "surplus_ly": 0}, **fields)
+
+
+def test_manifest_hashes_are_submission_hashes(tmp_path, monkeypatch):
+    monkeypatch.setenv("LEDGER_GIT_BATCH_MS", "10")
+    monkeypatch.setenv("IPFS_API_URL", "http://127.0.0.1:9")
+    data, ledger_dir = tmp_path / "Data", tmp_path / "ledger"
+    data.mkdir()
+    manifest_path = ledger_dir / "manifest.json"
+
+    async def sync():
+        ledger = DistributedLedger(ledger_dir, background=False)
+        try:
+            return await sync_data_dir(ledger, data, manifest_path)
+        finally:
+            ledger.close()
+
+    write(data, [entry(0), entry(1)])
+    assert asyncio.run(sync())["submitted"] == 2
+
+    # A field the submission is not built from is not a change for either side
+    write(data, [entry(0, surplus_ly=5), entry(1, harm_ly=-3.0)])
+    report = asyncio.run(sync())
+    assert (report["changed"], report["submitted"], report["duplicates"]) == (1, 1, 0)
+
+    with sqlite3.connect(ledger_dir / "ledger.db") as conn:
+        stored = dict(conn.execute("SELECT submission_id, submission_hash FROM submissions"))
+    entries = load_manifest(manifest_path)["files"]["acme.json"]["entries"]
+    assert {e["submission_id"]: e["hash"] for e in entries.values()}.items() <= stored.items()
+    assert len(stored) == 3
@@ -0,0 +1,55 @@
+# tests/test_merkle_backfill.py - Workers sharing one data dir backfill the Merkle tree once
+import asyncio
+import sqlite3
+import threading
+
+from app.core.database import DistributedLedger
+from app.core.readiness import READY
+
+
+def entry(i):
+    return dict(submission_id=f"s{i:04d}", submission_hash=f"h{i}", entity_id=f"ent{i % 7}", entity_name="Ent",
+                title="t", description="d", incident_country="G", incident_year=2000, life_loss=i,
+                submitter_pubkey_hash="x")
+
+
+def test_concurrent_startup_backfill(tmp_path, monkeypatch):
+    monkeypatch.setenv("LEDGER_GIT_BATCH_MS", "10")
+    monkeypatch.setenv("IPFS_API_URL", "http://127.0.0.1:9")
+
+    async def fill():
+        ledger = DistributedLedger(tmp_path, background=False)
+        try:
+            await ledger.submit_entries([entry(i) for i in range(300)])
+        finally:
+            ledger.close()
+    asyncio.run(fill())
+
+    # As if the entries predate the Merkle tree
+    with sqlite3.connect(tmp_path / "ledger.db") as conn:
+        conn.execute("DELETE FROM merkle_leaves")
+        conn.execute("DELETE FROM merkle_nodes")
+
+    start = threading.Barrier(2)
+    ledgers = [None, None]
+
+    def worker(i):
+        start.wait()
+        ledgers[i] = DistributedLedger(tmp_path)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    try:
+        for ledger in ledgers:
+            assert ledger.readiness.wait("merkle", 30)
+            assert ledger.readiness.state("merkle") == READY
+    finally:
+        for ledger in ledgers:
+            ledger.close()
+
+    with sqlite3.connect(tmp_path / "ledger.db") as conn:
+        leaves = conn.execute("SELECT COUNT(*), COUNT(DISTINCT submission_id), MAX(leaf_index) FROM merkle_leaves").fetchone()
+    assert leaves == (300, 300, 299)
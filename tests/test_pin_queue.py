@@ -0,0 +1,148 @@
+# tests/test_pin_queue.py - PinQueue against a stub IPFS HTTP API
+import hashlib
+import re
+import threading
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app.core import pin_queue
+from app.core.pin_queue import PinQueue
+from app.core.sqlite_db import LedgerDB
+
+
+class StubIPFS:
+    """/api/v0/add that records each upload and answers with a CID derived from the bytes."""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.uploads = []
+        self.entered = threading.Event()
+        self.gate = threading.Event()
+        self.gate.set()
+        self.lock = threading.Lock()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/api/v0/add"
+        self.entered.set()
+        self.gate.wait(5)
+        body = request.read()
+        name = re.search(rb'filename="([^"]+)"', body).group(1).decode()
+        content = body.split(b"\r\n\r\n", 1)[1].rsplit(b"\r\n--", 1)[0]
+        with self.lock:
+            self.uploads.append((name, content))
+            if self.failures:
+                self.failures -= 1
+                return httpx.Response(500, text="daemon busy")
+        return httpx.Response(200, json={"Name": name, "Hash": "Qm" + hashlib.sha256(content).hexdigest()[:20]})
+
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out")
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = LedgerDB(tmp_path / "ledger.db", readers=1)
+    yield db
+    db.close()
+
+
+def make_queue(db, stub, **kwargs):
+    client = httpx.Client(base_url="http://ipfs.test", transport=httpx.MockTransport(stub))
+    return PinQueue("http://ipfs.test", db, client=client, **kwargs)
+
+
+def pins(db):
+    with db.reader() as conn:
+        return [tuple(r) for r in conn.execute(
+            "SELECT entity_id, content_sha256, byte_length, cid FROM ipfs_pins ORDER BY entity_id"
+        )]
+
+
+def test_burst_of_writes_coalesces_to_latest_version(db, tmp_path):
+    stub = StubIPFS()
+    queue = make_queue(db, stub, concurrency=1)
+    a, b = tmp_path / "a.json", tmp_path / "b.json"
+    try:
+        a.write_bytes(b"a1\n")
+        stub.gate.clear()                   # hold the worker inside the first upload
+        queue.enqueue("a", a)
+        wait_until(stub.entered.is_set)
+        for version in (b"b1\n", b"b2\n", b"b3\n"):
+            b.write_bytes(version)
+            queue.enqueue("b", b)
+        a.write_bytes(b"a1\na2\n")
+        queue.enqueue("a", a)
+        queue.enqueue("a", a)
+        assert queue.stats()["queued"] == 2
+        stub.gate.set()
+        wait_until(lambda: queue.stats()["pinned"] == 3)
+    finally:
+        queue.close()
+
+    assert stub.uploads == [("a.json", b"a1\n"), ("b.json", b"b3\n"), ("a.json", b"a1\na2\n")]
+    assert queue.stats() == {"queued": 0, "in_flight": 0, "pinned": 3, "skipped": 0, "failed": 0}
+
+
+def test_pins_are_recorded_and_unchanged_files_skipped(db, tmp_path):
+    stub = StubIPFS()
+    queue = make_queue(db, stub)
+    path = tmp_path / "ent.json"
+    path.write_bytes(b'{"submission_id": "s1"}\n')
+    try:
+        queue.enqueue("ent", path)
+        wait_until(lambda: queue.stats()["pinned"] == 1)
+        queue.enqueue_all(tmp_path)
+        wait_until(lambda: queue.stats()["skipped"] == 1)
+    finally:
+        queue.close()
+
+    content = path.read_bytes()
+    cid = "Qm" + hashlib.sha256(content).hexdigest()[:20]
+    assert pins(db) == [("ent", hashlib.sha256(content).hexdigest(), len(content), cid)]
+    assert queue.latest_cid("ent") == cid
+    assert len(stub.uploads) == 1
+
+
+def test_failures_retry_with_exponential_backoff(db, tmp_path, monkeypatch):
+    delays = []
+    monkeypatch.setattr(pin_queue, "time", SimpleNamespace(sleep=delays.append))
+    stub = StubIPFS(failures=2)
+    queue = make_queue(db, stub, concurrency=1, retries=3, backoff_ms=100)
+    path = tmp_path / "ent.json"
+    path.write_bytes(b"line\n")
+    try:
+        queue.enqueue("ent", path)
+        wait_until(lambda: queue.stats()["pinned"] == 1)
+    finally:
+        queue.close()
+
+    assert len(stub.uploads) == 3
+    assert len(delays) == 2
+    for attempt, delay in enumerate(delays):
+        base = 0.1 * 2 ** attempt
+        assert 0.5 * base <= delay <= 1.5 * base
+    assert [p[0] for p in pins(db)] == ["ent"]
+
+
+def test_gives_up_after_retries_without_recording(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(pin_queue, "time", SimpleNamespace(sleep=lambda seconds: None))
+    stub = StubIPFS(failures=100)
+    queue = make_queue(db, stub, concurrency=1, retries=2)
+    path = tmp_path / "ent.json"
+    path.write_bytes(b"line\n")
+    try:
+        queue.enqueue("ent", path)
+        wait_until(lambda: queue.stats()["failed"] == 1)
+    finally:
+        queue.close()
+
+    assert len(stub.uploads) == 3
+    assert pins(db) == []
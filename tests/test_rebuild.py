@@ -0,0 +1,75 @@
+# tests/test_rebuild.py - rebuild_ledger_db keeps jury outcomes the entity files cannot reproduce
+import asyncio
+import sqlite3
+
+import pytest
+
+from app.core.database import DistributedLedger
+from app.core.rebuild import rebuild_ledger_db
+
+
+def entry(i):
+    return dict(submission_id=f"s{i}", submission_hash=f"h{i}", entity_id="ent", entity_name="Ent",
+                title="t", description="d", incident_country="G", incident_year=2000, life_loss=0,
+                submitter_pubkey_hash="x")
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("LEDGER_GIT_BATCH_MS", "10")
+    monkeypatch.setenv("IPFS_API_URL", "http://127.0.0.1:9")
+
+    async def fill():
+        ledger = DistributedLedger(tmp_path, background=False)
+        try:
+            for i in (1, 2, 3, 4):
+                await ledger.submit_entry(entry(i))
+            await ledger.approve_submission("s4", 7, 70.0, "RECKLESS")
+        finally:
+            ledger.close()
+    asyncio.run(fill())
+
+    # Decisions made before jury events were logged exist only in ledger.db
+    with sqlite3.connect(tmp_path / "ledger.db") as conn:
+        conn.execute("UPDATE submissions SET status = 'APPROVED', life_loss = 3, financial_loss = 2.5, "
+                     "intent_type = 'DELIBERATE' WHERE submission_id = 's1'")
+        conn.execute("UPDATE submissions SET status = 'REJECTED' WHERE submission_id = 's2'")
+    return tmp_path
+
+
+def reviews(path):
+    with sqlite3.connect(path) as conn:
+        return {r[0]: r[1:] for r in conn.execute(
+            "SELECT submission_id, status, intent_type, life_loss, financial_loss FROM submissions"
+        )}
+
+
+def test_decisions_without_events_come_from_the_old_db(data_dir):
+    before = reviews(data_dir / "ledger.db")
+    report = rebuild_ledger_db(data_dir, workers=1)
+    assert report["problems"] == []
+    assert report["swapped"] and report["restored_reviews"] == 2
+    assert reviews(data_dir / "ledger.db") == before
+    assert before["s1"] == ("APPROVED", "DELIBERATE", 3, 2.5)
+    assert before["s4"] == ("APPROVED", "RECKLESS", 7, 70.0)
+
+
+def test_value_mismatch_against_old_db_blocks_swap(data_dir):
+    with sqlite3.connect(data_dir / "ledger.db") as conn:
+        conn.execute("UPDATE submissions SET life_loss = 8 WHERE submission_id = 's4'")
+    report = rebuild_ledger_db(data_dir, workers=1)
+    assert not report["swapped"]
+    assert any("s4" in p and "reviewed values" in p for p in report["problems"])
+
+
+def test_without_old_db_undecided_rows_need_allow_pending(data_dir):
+    for suffix in ("", "-wal", "-shm"):
+        (data_dir / f"ledger.db{suffix}").unlink(missing_ok=True)
+    report = rebuild_ledger_db(data_dir, workers=1)
+    assert not report["swapped"]
+    assert any("no jury event" in p for p in report["problems"])
+
+    report = rebuild_ledger_db(data_dir, workers=1, allow_pending=True)
+    assert report["swapped"] and report["problems"] == []
+    statuses = {sid: r[0] for sid, r in reviews(data_dir / "ledger.db").items()}
+    assert statuses == {"s1": "PENDING_JURY", "s2": "PENDING_JURY", "s3": "PENDING_JURY", "s4": "APPROVED"}
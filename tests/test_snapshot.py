@@ -0,0 +1,51 @@
+# tests/test_snapshot.py - Snapshot export shared by several worker processes
+import sqlite3
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from app.core.database import create_submissions_table
+from app.core.snapshot import export_snapshot, pack_npz, snapshot_lock
+
+
+def make_db(path: Path):
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    create_submissions_table(conn)
+    conn.executemany(
+        "INSERT INTO submissions (submission_id, submission_hash, entity_id, entity_name, title, description, "
+        "incident_country, incident_year, life_loss, submitter_pubkey_hash, status) "
+        "VALUES (?, ?, 'ent', 'Ent', 't', 'd', 'G', 2000, ?, 'x', ?)",
+        [(f"s{i}", f"h{i}", i, "APPROVED" if i % 2 else "PENDING_JURY") for i in range(2000)]
+    )
+    conn.commit()
+    conn.close()
+
+
+def export_and_pack(args):
+    db_path, snapshot_dir, rounds = args
+    for _ in range(rounds):
+        conn = sqlite3.connect(db_path, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            with snapshot_lock(snapshot_dir):
+                export_snapshot(conn, snapshot_dir / "approved")
+                pack_npz(snapshot_dir / "approved", snapshot_dir / "ledger-approved.npz")
+        finally:
+            conn.close()
+    return True
+
+
+def test_concurrent_workers_never_corrupt_the_snapshot(tmp_path):
+    db_path, snapshot_dir = tmp_path / "ledger.db", tmp_path / "snapshots"
+    make_db(db_path)
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        assert all(pool.map(export_and_pack, [(db_path, snapshot_dir, 5)] * 4))
+
+    with zipfile.ZipFile(snapshot_dir / "ledger-approved.npz") as zf:
+        assert zf.testzip() is None
+    ids = np.load(snapshot_dir / "ledger-approved.npz")["submissions/submission_id.npy"]
+    assert len(ids) == 1000 and all(int(s[1:]) % 2 for s in ids)
+    assert sorted(p.name for p in snapshot_dir.iterdir()) == [".lock", "approved", "ledger-approved.npz"]